@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 {
     "name": "Product Connect Module",
-    "version": "17.0.3.10",
+    "version": "17.0.3.12",
     "category": "Industries",
     "author": "Chris Busillo",
     "company": "Shiny Computers",
@@ -25,6 +25,8 @@
         "data/motor_stat_data.xml",
         "data/product_condition_data.xml",
         "data/res_config_data.xml",
+        "data/shopify_sync_cron_data.xml",
+        "data/image_derivative_cron_data.xml",
         "report/motor_product_reports.xml",
         "report/motor_reports.xml",
         "report/product_reports.xml",
@@ -1 +1 @@
-from . import download_controllers
+from . import download_controllers, image_controllers, shopify_webhook_controllers
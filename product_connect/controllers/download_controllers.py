@@ -1,8 +1,13 @@
 import base64
+from datetime import datetime
+from pathlib import Path
 
+import odoo
 from odoo import http
 from odoo.http import request, Response, NotFound
 
+from ..utils.zip_stream import stream_zip
+
 
 class SingleDownloadController(http.Controller):
     @http.route("/web/binary/download_single", type="http", auth="user")
@@ -25,3 +30,54 @@ class SingleDownloadController(http.Controller):
                 ("Content-Length", len(file_content)),
             ],
         )
+
+
+class MotorImageZipController(http.Controller):
+    @http.route("/web/binary/download_motor_images", type="http", auth="user")
+    def download_motor_images(self, motor_ids: str, **_kwargs: str) -> Response | NotFound:
+        motors = request.env["motor"].browse(int(motor_id) for motor_id in motor_ids.split(",")).exists()
+        if not motors:
+            return request.not_found()
+        motors.check_access_rights("read")
+        motors.check_access_rule("read")
+
+        # Resolved before streaming, the cursor is closed by the time the response body is sent
+        files = self.get_image_files(motors)
+        timestamp = datetime.now().strftime("%Y-%m-%d %H-%M")
+        filename = f"{motors.motor_number} {timestamp}.zip" if len(motors) == 1 else f"Motor Images {timestamp}.zip"
+        return Response(
+            stream_zip(files),
+            headers=[
+                ("Content-Type", "application/zip"),
+                ("Content-Disposition", f'attachment; filename="{filename}"'),
+            ],
+            direct_passthrough=True,
+        )
+
+    @staticmethod
+    def get_image_files(motors: "odoo.model.motor") -> list[tuple[str, Path | bytes]]:
+        images = motors.images
+        attachments = (
+            request.env["ir.attachment"]
+            .sudo()
+            .search(
+                [
+                    ("res_model", "=", images._name),
+                    ("res_field", "=", "image_1920"),
+                    ("res_id", "in", images.ids),
+                ]
+            )
+        )
+        attachment_by_image_id = {attachment.res_id: attachment for attachment in attachments}
+
+        files = []
+        for image in images:
+            attachment = attachment_by_image_id.get(image.id)
+            if not attachment:
+                continue
+            if attachment.store_fname:
+                source = Path(attachment._full_path(attachment.store_fname))
+            else:
+                source = attachment.raw
+            files.append((f"{image.motor.motor_number} {image.name}.jpg", source))
+        return files
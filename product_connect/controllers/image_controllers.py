@@ -0,0 +1,28 @@
+import re
+
+from odoo import http
+from odoo.http import request, Response, NotFound
+
+
+class ImageDerivativeController(http.Controller):
+    CHECKSUM_PATTERN = re.compile(r"[0-9a-f]{40}")
+
+    @http.route("/image/derivative/<string:checksum>.<string:image_format>", type="http", auth="public")
+    def image_derivative(self, checksum: str, image_format: str, **_kwargs: str) -> Response | NotFound:
+        if not self.CHECKSUM_PATTERN.fullmatch(checksum):
+            return request.not_found()
+        derivative = (
+            request.env["image.derivative"]
+            .sudo()
+            .search(
+                [("checksum", "=", checksum), ("image_format", "=", image_format), ("state", "=", "done")],
+                limit=1,
+            )
+        )
+        if not derivative:
+            return request.not_found()
+
+        # The URL changes with the content, so it can be cached for good
+        stream = request.env["ir.binary"]._get_stream_from(derivative, "data")
+        stream.mimetype = f"image/{image_format}"
+        return stream.get_response(immutable=True)
@@ -0,0 +1,46 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+
+from odoo import http
+from odoo.http import request, Response
+
+_logger = logging.getLogger(__name__)
+
+
+class ShopifyWebhookController(http.Controller):
+    TOPICS = ("products/create", "products/update", "inventory_levels/update")
+
+    @http.route("/shopify/webhook", type="http", auth="public", methods=["POST"], csrf=False, save_session=False)
+    def receive_webhook(self, **_kwargs: str) -> Response:
+        body = request.httprequest.get_data()
+        secret = request.env["ir.config_parameter"].sudo().get_param("shopify.webhook_secret")
+        if not secret or not self.is_valid_hmac(body, secret, request.httprequest.headers.get("X-Shopify-Hmac-Sha256")):
+            _logger.warning("Rejected Shopify webhook with an invalid HMAC")
+            return Response(status=401)
+
+        topic = request.httprequest.headers.get("X-Shopify-Topic", "")
+        webhook_id = request.httprequest.headers.get("X-Shopify-Webhook-Id")
+        if topic not in self.TOPICS or not webhook_id:
+            return Response(status=200)
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+        if not isinstance(payload, dict):
+            _logger.warning("Rejected Shopify webhook %s with a malformed payload", webhook_id)
+            return Response(status=400)
+
+        # Only queued here; Shopify expects an answer within five seconds
+        request.env["shopify.webhook.inbox"].sudo().receive(webhook_id, topic, payload)
+        return Response(status=200)
+
+    @staticmethod
+    def is_valid_hmac(body: bytes, secret: str, received_hmac: str | None) -> bool:
+        if not received_hmac:
+            return False
+        digest = hmac.new(secret.encode(), body, hashlib.sha256).digest()
+        return hmac.compare_digest(base64.b64encode(digest).decode(), received_hmac)
@@ -0,0 +1,13 @@
+import logging
+
+from odoo.sql_db import Cursor
+from odoo.upgrade import util
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr: Cursor, _version: str) -> None:
+    _logger.info("Post-migration: Populating product MPN tokens")
+    env = util.env(cr)
+    env["product.mpn"].rebuild()
+    _logger.info("Post-migration: Populated %d product MPN tokens", env["product.mpn"].search_count([]))
@@ -0,0 +1,25 @@
+import logging
+
+from odoo.sql_db import Cursor
+from odoo.upgrade import util
+
+_logger = logging.getLogger(__name__)
+
+IMAGE_DETAIL_FIELDS = [
+    "attachment",
+    "image_1920_file_size",
+    "image_1920_file_size_kb",
+    "image_1920_width",
+    "image_1920_height",
+    "image_1920_resolution",
+]
+
+
+# noinspection SqlResolve
+def migrate(cr: Cursor, version: str) -> None:
+    _logger.info("Post-migration: update images")
+    model_names = ["product.image", "product.import.image", "motor.image", "motor.product.image"]
+    for model_name in model_names:
+        util.recompute_fields(cr, model_name, IMAGE_DETAIL_FIELDS)
+
+    _logger.info("Post-migration: updated images")
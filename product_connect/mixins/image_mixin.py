@@ -1,9 +1,18 @@
+import base64
+import binascii
+import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Self
 
+import odoo
 from PIL import Image, UnidentifiedImageError
 from odoo import models, fields, api
-from odoo.tools import config
+from odoo.exceptions import UserError
+from odoo.tools import config, image_process
+
+from ..utils.image_header import read_image_size
 
 _logger = logging.getLogger(__name__)
 
@@ -12,6 +21,10 @@ class ImageMixin(models.AbstractModel):
     _description = "Image Mixin"
     _inherit = "image.mixin"
 
+    IMAGE_READ_WORKERS = 8
+    IMAGE_FIELDS = ("image_1920", "image_1024", "image_512", "image_256", "image_128")
+    SHARED_IMAGE_MODELS = ("product.image", "product.import.image", "motor.image", "motor.product.image")
+
     attachment = fields.Many2one("ir.attachment", compute="_compute_attachment", store=True)
     image_1920_file_size = fields.Integer(related="attachment.file_size", store=True)
     image_1920_file_size_kb = fields.Float(string="kB", compute="_compute_file_size_kb", store=True)
@@ -19,18 +32,240 @@ class ImageMixin(models.AbstractModel):
     image_1920_height = fields.Integer(compute="_compute_image_dimensions", store=True)
     image_1920_resolution = fields.Char(compute="_compute_image_dimensions", store=True, string="Image Res")
     index = fields.Integer()
+    image_derivative_urls = fields.Json(compute="_compute_image_derivative_urls")
+
+    @api.model_create_multi
+    def create(self, vals_list: list[dict]) -> Self:
+        vals_list = [dict(vals) for vals in vals_list]
+        shared_attachments_list = self.pop_shared_image_attachments(vals_list)
+        images = super().create(vals_list)
+        self.attach_shared_images(images, shared_attachments_list)
+        self.env["image.derivative"].queue(images)
+        return images
+
+    def write(self, vals: dict) -> bool:
+        shared_attachments = None
+        if self:
+            vals = dict(vals)
+            shared_attachments = self.pop_shared_image_attachments([vals], exclude=self)[0]
+            if shared_attachments:
+                self.remove_image_attachments()
+        result = super().write(vals)
+        if shared_attachments:
+            self.attach_shared_images(self, [shared_attachments] * len(self))
+        if "image_1920" in vals or shared_attachments:
+            self.env["image.derivative"].queue(self)
+        return result
+
+    def process_image_1920(self, vals: dict) -> str | None:
+        """Resize image_1920 in the values the way the field stores it, returning the SHA-1 of the stored bytes.
+
+        Stored attachments hold the resized image, so only this hash can match their checksum.
+        """
+        image_field = self._fields["image_1920"]
+        try:
+            stored_image = image_process(
+                base64.b64decode(vals["image_1920"]),
+                size=(image_field.max_width, image_field.max_height),
+                verify_resolution=image_field.verify_resolution,
+            )
+        except (binascii.Error, TypeError, ValueError, UserError):
+            return None
+        if not stored_image:
+            return None
+        # Already resized, so the field's own processing finds nothing left to do
+        vals["image_1920"] = base64.b64encode(stored_image)
+        return hashlib.sha1(stored_image).hexdigest()
+
+    @api.model
+    def find_image_attachments_by_checksum(
+        self, checksums: set[str], exclude: Self | None = None
+    ) -> dict[str, "odoo.model.ir_attachment"]:
+        """Map image_1920 checksums to an existing image holding those bytes, as its attachments for every size."""
+        if not checksums:
+            return {}
+        self.env["ir.attachment"].flush_model()
+        self.env.cr.execute(
+            """
+            SELECT DISTINCT ON (checksum) checksum, res_model, res_id
+              FROM ir_attachment
+             WHERE res_field = 'image_1920'
+               AND res_model IN %s
+               AND checksum IN %s
+               AND store_fname IS NOT NULL
+               AND res_id IS NOT NULL
+               AND NOT (res_model = %s AND res_id = ANY(%s))
+             ORDER BY checksum, id
+            """,
+            (self.SHARED_IMAGE_MODELS, tuple(checksums), self._name, exclude.ids if exclude else []),
+        )
+        source_by_checksum = {checksum: (res_model, res_id) for checksum, res_model, res_id in self.env.cr.fetchall()}
+        if not source_by_checksum:
+            return {}
+
+        attachments = (
+            self.env["ir.attachment"]
+            .sudo()
+            .search(
+                [
+                    ("res_field", "in", self.IMAGE_FIELDS),
+                    ("res_id", "in", [res_id for _, res_id in source_by_checksum.values()]),
+                    ("res_model", "in", list({res_model for res_model, _ in source_by_checksum.values()})),
+                ]
+            )
+        )
+        attachments_by_source = {}
+        for attachment in attachments:
+            source = (attachment.res_model, attachment.res_id)
+            attachments_by_source[source] = attachments_by_source.get(source, attachment.browse()) | attachment
+        return {
+            checksum: attachments_by_source[source]
+            for checksum, source in source_by_checksum.items()
+            if source in attachments_by_source
+        }
+
+    @api.model
+    def pop_shared_image_attachments(
+        self, vals_list: list[dict], exclude: Self | None = None
+    ) -> list["odoo.model.ir_attachment | None"]:
+        """Take image_1920 out of the values whose bytes are already stored, returning the attachments to share.
+
+        Identical bytes then reuse the stored file and its resized variants instead of being processed again.
+        """
+        if self._name not in self.SHARED_IMAGE_MODELS:
+            return [None] * len(vals_list)
+        checksums = [
+            (
+                self.process_image_1920(vals)
+                if vals.get("image_1920") and not any(field in vals for field in self.IMAGE_FIELDS[1:])
+                else None
+            )
+            for vals in vals_list
+        ]
+        attachments_by_checksum = self.find_image_attachments_by_checksum(set(filter(None, checksums)), exclude)
+        shared_attachments_list = []
+        for vals, checksum in zip(vals_list, checksums):
+            shared_attachments = attachments_by_checksum.get(checksum)
+            if shared_attachments:
+                del vals["image_1920"]
+            shared_attachments_list.append(shared_attachments)
+        return shared_attachments_list
+
+    def remove_image_attachments(self) -> None:
+        self.env["ir.attachment"].sudo().search(
+            [("res_model", "=", self._name), ("res_id", "in", self.ids), ("res_field", "in", self.IMAGE_FIELDS)]
+        ).unlink()
+
+    @api.model
+    def attach_shared_images(
+        self, images: Self, shared_attachments_list: list["odoo.model.ir_attachment | None"]
+    ) -> None:
+        attachment_vals_list = [
+            {
+                "name": attachment.res_field,
+                "res_model": image._name,
+                "res_field": attachment.res_field,
+                "res_id": image.id,
+                "type": "binary",
+                "store_fname": attachment.store_fname,
+                "file_size": attachment.file_size,
+                "checksum": attachment.checksum,
+                "mimetype": attachment.mimetype,
+            }
+            for image, shared_attachments in zip(images, shared_attachments_list)
+            if shared_attachments
+            for attachment in shared_attachments
+        ]
+        if not attachment_vals_list:
+            return
+        self.env["ir.attachment"].sudo().create(attachment_vals_list)
+
+        images.browse(
+            image.id for image, shared_attachments in zip(images, shared_attachments_list) if shared_attachments
+        ).mark_image_attachments_changed()
+
+    def mark_image_attachments_changed(self) -> None:
+        self.invalidate_recordset(self.IMAGE_FIELDS)
+        self.modified(self.IMAGE_FIELDS)
+        # The resized fields come with the attachments, recomputing them from image_1920 would resize again
+        for field_name in self.IMAGE_FIELDS:
+            self.env.remove_to_compute(self._fields[field_name], self)
+
+    def transfer_images(self, target_model: str, vals_list: list[dict]) -> "odoo.model.image_mixin":
+        """Create one target image per image, moving the stored attachments over instead of re-processing them.
+
+        Images missing one of the stored sizes are copied through image_1920 instead.
+        """
+        attachments = (
+            self.env["ir.attachment"]
+            .sudo()
+            .search(
+                [("res_model", "=", self._name), ("res_id", "in", self.ids), ("res_field", "in", self.IMAGE_FIELDS)]
+            )
+        )
+        attachments_by_image_id = {}
+        for attachment in attachments:
+            attachments_by_image_id[attachment.res_id] = (
+                attachments_by_image_id.get(attachment.res_id, attachment.browse()) | attachment
+            )
+        movable_image_ids = {
+            image_id
+            for image_id, image_attachments in attachments_by_image_id.items()
+            if set(image_attachments.mapped("res_field")) == set(self.IMAGE_FIELDS)
+        }
+
+        target_vals_list = [
+            vals if image.id in movable_image_ids else dict(vals, image_1920=image.image_1920)
+            for image, vals in zip(self, vals_list)
+        ]
+        target_images = self.env[target_model].create(target_vals_list)
+
+        derivatives = (
+            self.env["image.derivative"]
+            .sudo()
+            .search([("res_model", "=", self._name), ("res_id", "in", list(movable_image_ids))])
+        )
+        moved_target_images = target_images.browse()
+        target_images_to_queue = target_images.browse()
+        for image, target_image in zip(self, target_images):
+            if image.id not in movable_image_ids:
+                continue
+            attachments_by_image_id[image.id].write({"res_model": target_model, "res_id": target_image.id})
+            moved_target_images |= target_image
+            image_derivatives = derivatives.filtered(lambda d: d.res_id == image.id)
+            if image_derivatives and target_model in image_derivatives.SOURCE_MODELS:
+                image_derivatives.write({"res_model": target_model, "res_id": target_image.id})
+            else:
+                target_images_to_queue |= target_image
+        if moved_target_images:
+            moved_target_images.mark_image_attachments_changed()
+            self.env["image.derivative"].queue(target_images_to_queue)
+        return target_images
+
+    def unlink(self) -> bool:
+        self.env["image.derivative"].remove_for_images(self)
+        return super().unlink()
 
     @api.depends("image_1920")
     def _compute_attachment(self) -> None:
+        saved_images = self.filtered("id")
+        attachments = self.env["ir.attachment"].search(
+            [
+                ("res_model", "=", self._name),
+                ("res_id", "in", saved_images.ids),
+                ("res_field", "=", "image_1920"),
+            ]
+        )
+        attachment_by_image_id = {}
+        for attachment in attachments:
+            attachment_by_image_id.setdefault(attachment.res_id, attachment)
         for image in self:
-            image.attachment = self.env["ir.attachment"].search(
-                [
-                    ("res_model", "=", self._name),
-                    ("res_id", "=", image.id),
-                    ("res_field", "=", "image_1920"),
-                ],
-                limit=1,
-            )
+            image.attachment = attachment_by_image_id.get(image.id, False)
+
+    def _compute_image_derivative_urls(self) -> None:
+        urls_by_image_id = self.env["image.derivative"].get_urls_by_size(self, "webp")
+        for image in self:
+            image.image_derivative_urls = urls_by_image_id.get(image.id, {})
 
     @api.depends("attachment.file_size")
     def _compute_file_size_kb(self) -> None:
@@ -39,31 +274,44 @@ class ImageMixin(models.AbstractModel):
 
     @api.depends("attachment.store_fname")
     def _compute_image_dimensions(self) -> None:
+        filestore_path = Path(config.filestore(self.env.cr.dbname))
+        image_paths = {}
         for image in self:
-            db_name = self.env.cr.dbname
-            filestore_path = Path(config.filestore(db_name))
             if not image.attachment.store_fname:
                 _logger.warning(f"Image: {image} has no store_fname")
                 self._reset_image_details(image)
                 continue
-            image_path = filestore_path / Path(image.attachment.store_fname)
+            image_paths[image] = filestore_path / Path(image.attachment.store_fname)
 
-            try:
-                with Image.open(image_path) as img:
-                    width, height = img.size
+        # Only the file reads run in the pool, the records are written from this thread
+        with ThreadPoolExecutor(max_workers=min(self.IMAGE_READ_WORKERS, len(image_paths) or 1)) as executor:
+            sizes = executor.map(self._read_image_size, image_paths.values())
+            for (image, image_path), (size, error) in zip(image_paths.items(), sizes):
+                if size:
+                    width, height = size
                     image.image_1920_width = width
                     image.image_1920_height = height
                     image.image_1920_resolution = f"{width}x{height}"
-            except FileNotFoundError:
-                _logger.warning(f"Image: {image} file not found\n {image_path}")
-                self._reset_image_details(image)
-            except UnidentifiedImageError as e:
-                if "svg" in image.attachment.mimetype:
+                elif isinstance(error, FileNotFoundError):
+                    _logger.warning(f"Image: {image} file not found\n {image_path}")
+                    self._reset_image_details(image)
+                elif "svg" in (image.attachment.mimetype or ""):
                     _logger.info(f"Image: {image.attachment} is an SVG")
                     self._reset_image_details(image)
                 else:
-                    _logger.warning(f"Image: {image.attachment} unidentified image {e}")
-                    raise e
+                    _logger.warning(f"Image: {image.attachment} unidentified image {error}")
+                    raise error
+
+    @staticmethod
+    def _read_image_size(image_path: Path) -> tuple[tuple[int, int] | None, Exception | None]:
+        try:
+            size = read_image_size(image_path)
+            if not size:
+                with Image.open(image_path) as img:
+                    size = img.size
+            return size, None
+        except (FileNotFoundError, UnidentifiedImageError) as error:
+            return None, error
 
     @staticmethod
     def _reset_image_details(image) -> None:
@@ -1,4 +1,5 @@
 from . import (
+    image_derivative,
     motor,
     motor_part,
     product_base,
@@ -9,8 +10,14 @@ from . import (
     product_color,
     product_import,
     product_manufacturer,
+    product_mpn,
     product_product,
     product_template,
     res_users,
+    shopify_product_sale,
+    shopify_rate_limiter,
     shopify_sync,
+    shopify_sync_job,
+    shopify_sync_run,
+    shopify_webhook_inbox,
 )
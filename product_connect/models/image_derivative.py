@@ -0,0 +1,182 @@
+import base64
+import hashlib
+import logging
+from io import BytesIO
+
+import odoo
+from PIL import Image, ImageOps
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+
+class ImageDerivative(models.Model):
+    _name = "image.derivative"
+    _description = "Image Derivative"
+    _sql_constraints = [
+        (
+            "image_size_format_uniq",
+            "unique (res_model, res_id, size, image_format)",
+            "Image derivative already exists !",
+        ),
+    ]
+
+    SOURCE_MODELS = ("product.image", "product.import.image", "motor.image", "motor.product.image")
+    SIZES = (1920, 1024, 512, 128)
+    FORMAT_OPTIONS = {"webp": {"quality": 80, "method": 4}, "avif": {"quality": 60}}
+    GENERATE_BATCH_SIZE = 200
+
+    res_model = fields.Char(required=True, index=True)
+    res_id = fields.Integer(required=True, index=True)
+    size = fields.Integer(required=True)
+    image_format = fields.Char(required=True)
+    state = fields.Selection(
+        [("pending", "Pending"), ("done", "Done"), ("failed", "Failed")],
+        default="pending",
+        required=True,
+        index=True,
+    )
+    data = fields.Binary(attachment=True)
+    checksum = fields.Char(index=True, help="SHA-1 of the derivative, the same as its filestore name")
+    url = fields.Char(compute="_compute_url")
+
+    @api.depends("checksum", "image_format")
+    def _compute_url(self) -> None:
+        for derivative in self:
+            derivative.url = (
+                f"/image/derivative/{derivative.checksum}.{derivative.image_format}" if derivative.checksum else False
+            )
+
+    @classmethod
+    def get_available_formats(cls) -> list[str]:
+        Image.init()
+        return [image_format for image_format in cls.FORMAT_OPTIONS if image_format.upper() in Image.SAVE]
+
+    @api.model
+    def queue(self, images: "odoo.model.image_mixin") -> None:
+        if images._name not in self.SOURCE_MODELS:
+            return
+        # bin_size reads the attachment sizes instead of decoding every image
+        images_with_data = images.with_context(bin_size=True).filtered("image_1920")
+        self.remove_for_images(images - images_with_data)
+        if not images_with_data:
+            return
+
+        image_formats = self.get_available_formats()
+        self.env.cr.execute(
+            """
+            INSERT INTO image_derivative
+                (res_model, res_id, size, image_format, state, create_uid, create_date, write_uid, write_date)
+            SELECT %(res_model)s, image.id, size.size, image_format.image_format, 'pending',
+                   %(uid)s, now() AT TIME ZONE 'UTC', %(uid)s, now() AT TIME ZONE 'UTC'
+              FROM unnest(%(res_ids)s::integer[]) AS image (id)
+             CROSS JOIN unnest(%(sizes)s::integer[]) AS size (size)
+             CROSS JOIN unnest(%(image_formats)s::varchar[]) AS image_format (image_format)
+            ON CONFLICT (res_model, res_id, size, image_format) DO UPDATE
+               SET state = 'pending', write_date = EXCLUDED.write_date
+            """,
+            {
+                "res_model": images._name,
+                "res_ids": images_with_data.ids,
+                "sizes": list(self.SIZES),
+                "image_formats": image_formats,
+                "uid": self.env.uid,
+            },
+        )
+        self.invalidate_model()
+        generate_cron = self.env.ref("product_connect.ir_cron_image_derivative_generate", raise_if_not_found=False)
+        if generate_cron:
+            generate_cron.sudo()._trigger()
+
+    @api.model
+    def remove_for_images(self, images: "odoo.model.image_mixin") -> None:
+        if images._name in self.SOURCE_MODELS:
+            self.sudo().search([("res_model", "=", images._name), ("res_id", "in", images.ids)]).unlink()
+
+    @api.model
+    def get_urls(self, images: "odoo.model.image_mixin", size: int, image_format: str) -> dict[int, str]:
+        derivatives = self.sudo().search(
+            [
+                ("res_model", "=", images._name),
+                ("res_id", "in", images.ids),
+                ("size", "=", size),
+                ("image_format", "=", image_format),
+                ("state", "=", "done"),
+            ]
+        )
+        return {derivative.res_id: derivative.url for derivative in derivatives}
+
+    @api.model
+    def get_urls_by_size(self, images: "odoo.model.image_mixin", image_format: str) -> dict[int, dict[str, str]]:
+        saved_images = images.filtered("id")
+        if images._name not in self.SOURCE_MODELS or not saved_images:
+            return {}
+        derivatives = self.sudo().search(
+            [
+                ("res_model", "=", images._name),
+                ("res_id", "in", saved_images.ids),
+                ("image_format", "=", image_format),
+                ("state", "=", "done"),
+            ]
+        )
+        urls_by_image_id: dict[int, dict[str, str]] = {}
+        for derivative in derivatives:
+            urls_by_image_id.setdefault(derivative.res_id, {})[str(derivative.size)] = derivative.url
+        return urls_by_image_id
+
+    @api.model
+    def generate_pending(self) -> None:
+        while True:
+            self.env.cr.execute(
+                """
+                SELECT id
+                  FROM image_derivative
+                 WHERE state = 'pending'
+                 ORDER BY res_model, res_id
+                 LIMIT %s
+                   FOR UPDATE SKIP LOCKED
+                """,
+                (self.GENERATE_BATCH_SIZE,),
+            )
+            derivatives = self.browse([row[0] for row in self.env.cr.fetchall()])
+            if not derivatives:
+                break
+
+            for res_model in set(derivatives.mapped("res_model")):
+                model_derivatives = derivatives.filtered(lambda d: d.res_model == res_model)
+                images = self.env[res_model].browse(set(model_derivatives.mapped("res_id"))).exists()
+                (model_derivatives.filtered(lambda d: d.res_id not in images.ids)).unlink()
+                for image in images:
+                    model_derivatives.filtered(lambda d: d.res_id == image.id).generate(image)
+            self.env.cr.commit()
+
+    def generate(self, image: "odoo.model.image_mixin") -> None:
+        if not image.image_1920:
+            self.unlink()
+            return
+
+        try:
+            with Image.open(BytesIO(base64.b64decode(image.image_1920))) as source_image:
+                source_image = ImageOps.exif_transpose(source_image)
+                if source_image.mode not in ("RGB", "RGBA"):
+                    has_alpha = source_image.mode in ("LA", "PA") or "transparency" in source_image.info
+                    source_image = source_image.convert("RGBA" if has_alpha else "RGB")
+
+                for derivative in self.sorted("size", reverse=True):
+                    resized_image = source_image.copy()
+                    resized_image.thumbnail((derivative.size, derivative.size), Image.LANCZOS)
+                    with BytesIO() as output:
+                        resized_image.save(
+                            output, derivative.image_format.upper(), **self.FORMAT_OPTIONS[derivative.image_format]
+                        )
+                        content = output.getvalue()
+                    derivative.write(
+                        {
+                            "state": "done",
+                            "data": base64.b64encode(content),
+                            "checksum": hashlib.sha1(content).hexdigest(),
+                        }
+                    )
+        except (OSError, ValueError, Image.DecompressionBombError) as error:
+            _logger.warning(f"Image: {image} derivatives could not be generated: {error}")
+            self.write({"state": "failed"})
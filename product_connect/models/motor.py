@@ -1,11 +1,6 @@
 import base64
 import re
-import shutil
-import tempfile
-import zipfile
-from datetime import datetime
 from io import BytesIO
-from pathlib import Path
 from typing import Self
 
 import odoo
@@ -136,10 +131,11 @@ class Motor(models.Model):
             if motor.id > 999999:
                 raise ValidationError(_("Motor number cannot exceed 999999."))
             motor.motor_number = f"M-{str(motor.id).zfill(6)}"
-            motor._create_default_images(motor)
-            motor._compute_compression()
-            motor._create_motor_parts()
-            motor._create_motor_tests()
+        # Each child model is created once for the whole batch of motors
+        motors._create_default_images()
+        motors._compute_compression()
+        motors._create_motor_parts()
+        motors._create_motor_tests()
 
         return motors
 
@@ -290,91 +286,97 @@ class Motor(models.Model):
     def _create_motor_tests(self) -> None:
         test_templates = self.env["motor.test.template"].search([])
         test_vals = []
-        for template in test_templates:
-            test_vals.append(
-                {
-                    "motor": self.id,
-                    "template": template.id,
-                }
-            )
+        for motor in self:
+            for template in test_templates:
+                test_vals.append(
+                    {
+                        "motor": motor.id,
+                        "template": template.id,
+                    }
+                )
         if test_vals:
             self.env["motor.test"].create(test_vals)
 
     def _create_motor_parts(self) -> None:
         part_templates = self.env["motor.part.template"].search([])
         part_vals = []
-        for template in part_templates:
-            part_vals.append(
-                {
-                    "motor": self.id,
-                    "template": template.id,
-                }
-            )
+        for motor in self:
+            for template in part_templates:
+                part_vals.append(
+                    {
+                        "motor": motor.id,
+                        "template": template.id,
+                    }
+                )
         if part_vals:
             self.env["motor.part"].create(part_vals)
 
     def create_motor_products(self) -> None:
-        product_templates = self.env["motor.product.template"].search([])
-        current_product_ids = set(self.products.ids)  # Existing product IDs related to this motor
-
-        for product_template in product_templates:
-            if product_template.stroke and self.stroke not in product_template.stroke:
-                continue
-            if product_template.configuration and self.configuration not in product_template.configuration:
-                continue
-            if product_template.manufacturers and self.manufacturer not in product_template.manufacturers:
-                continue
+        applicability_index = self.env["motor.product.template"].get_applicability_index()
+        product_template_model = self.env["motor.product.template"]
+        condition_id = self.env.ref("product_connect.product_condition_used").id
 
-            excluded_parts_ids = product_template.excluded_parts.mapped("id")
-            if set(self.parts.mapped("template.id")) & set(excluded_parts_ids):
-                continue
-
-            excluded_tests_ids = product_template.excluded_tests.mapped("id")
-            if set(self.tests.mapped("template.id")) & set(excluded_tests_ids):
-                continue
-
-            existing_product = self.products.filtered(lambda p: p.template == product_template)
-
-            if existing_product:
-                current_product_ids.discard(existing_product.id)
-            else:
-                condition_id = self.env.ref("product_connect.product_condition_used").id
-                self.products.create(
+        products_to_unlink = self.env["motor.product"]
+        product_vals = []
+        for motor in self:
+            existing_products = {}
+            for product in motor.products:
+                if product.template.id in existing_products:
+                    products_to_unlink |= product
+                else:
+                    existing_products[product.template.id] = product
+
+            applicable_template_ids = applicability_index.applicable_template_ids(
+                motor.stroke.id or None,
+                motor.configuration.id or None,
+                motor.manufacturer.id or None,
+                frozenset(motor.parts.template.ids),
+                frozenset(motor.tests.template.ids),
+            )
+            for product_template in product_template_model.browse(applicable_template_ids):
+                if existing_products.pop(product_template.id, None):
+                    continue
+                product_vals.append(
                     {
-                        "motor": self.id,
+                        "motor": motor.id,
                         "template": product_template.id,
                         "qty_available": product_template.qty_available or 1,
                         "bin": product_template.bin,
                         "weight": product_template.weight,
                         "condition": condition_id,
-                        "manufacturer": self.manufacturer.id,
+                        "manufacturer": motor.manufacturer.id,
                     }
                 )
+            for product in existing_products.values():
+                products_to_unlink |= product
 
-        if current_product_ids:
-            self.products.filtered(lambda p: p.id in current_product_ids).unlink()
+        if product_vals:
+            self.env["motor.product"].reserve_skus(len(product_vals))
+            self.env["motor.product"].create(product_vals)
+        if products_to_unlink:
+            products_to_unlink.unlink()
 
     def _get_cylinder_count(self) -> int:
-        match = re.search(r"\d+", self.configuration.name)
+        match = re.search(r"\d+", self.configuration.name or "")
         if match:
             return int(match.group())
         return 0
 
     def _compute_compression(self) -> None:
+        excessive_cylinders = self.env["motor.cylinder"]
+        cylinder_vals = []
         for motor in self:
 
             desired_cylinders = motor._get_cylinder_count()
             current_cylinders = motor.cylinders.mapped("cylinder_number")
 
-            excessive_cylinders = motor.cylinders.filtered(lambda x: x.cylinder_number > desired_cylinders)
-            if excessive_cylinders:
-                excessive_cylinders.unlink()
+            excessive_cylinders |= motor.cylinders.filtered(lambda x: x.cylinder_number > desired_cylinders)
 
             # Add missing cylinders
             existing_cylinder_numbers = set(current_cylinders)
             for i in range(1, desired_cylinders + 1):
                 if i not in existing_cylinder_numbers:
-                    self.cylinders.create(
+                    cylinder_vals.append(
                         {
                             "motor": motor.id,
                             "cylinder_number": i,
@@ -382,15 +384,16 @@ class Motor(models.Model):
                         }
                     )
 
-    def _create_default_images(self, motor: Self) -> None:
+        if excessive_cylinders:
+            excessive_cylinders.unlink()
+        if cylinder_vals:
+            self.env["motor.cylinder"].create(cylinder_vals)
+
+    def _create_default_images(self) -> None:
         image_names = constants.MOTOR_IMAGE_NAME_AND_ORDER
-        for name in image_names:
-            self.images.create(
-                {
-                    "motor": motor.id,
-                    "name": name,
-                }
-            )
+        image_vals = [{"motor": motor.id, "name": name} for motor in self for name in image_names]
+        if image_vals:
+            self.env["motor.image"].create(image_vals)
 
     def _update_stage(self) -> None:
         stages_with_required_fields = {
@@ -422,38 +425,9 @@ class Motor(models.Model):
                 break
 
     def download_zip_of_images(self) -> dict[str, str]:
-        temp_path = Path(tempfile.mkdtemp())
-        zip_path = temp_path / f"{self.motor_number} {datetime.now().strftime('%Y-%m-%d %H-%M')}.zip"
-        with zipfile.ZipFile(zip_path, "w") as zip_file:
-            for motor in self:
-                for image in motor.images:
-                    if not image.image_1920:
-                        continue
-                    filename = f"{motor.motor_number} {image.name}.jpg"
-                    file_path = temp_path / filename
-                    with open(file_path, "wb") as image_file:
-                        image_file.write(base64.b64decode(image.image_1920))
-                    zip_file.write(file_path, filename)
-                    file_path.unlink()
-
-        with open(zip_path, "rb") as zip_file:
-            zip_data = base64.b64encode(zip_file.read())
-
-        attachment = self.env["ir.attachment"].create(
-            {
-                "name": zip_path.name,
-                "datas": zip_data,
-                "type": "binary",
-                "mimetype": "application/zip",
-            }
-        )
-
-        download_url = f"/web/binary/download_single?attachment_id={attachment.id}"
-        shutil.rmtree(temp_path)
-
         return {
             "type": "ir.actions.act_url",
-            "url": download_url,
+            "url": f"/web/binary/download_motor_images?motor_ids={','.join(map(str, self.ids))}",
             "target": "self",
         }
 
@@ -1,8 +1,9 @@
 import re
+from collections import defaultdict
 from typing import Self
 
 import odoo
-from odoo import api, fields, models
+from odoo import api, fields, models, tools
 
 
 class MotorDismantleResult(models.Model):
@@ -12,11 +13,72 @@ class MotorDismantleResult(models.Model):
     name = fields.Char(required=True)
 
 
+class MotorProductApplicabilityIndex:
+    """Motor product templates bucketed by the motor attributes that restrict them, keyed by record IDs only."""
+
+    ANY = None
+
+    def __init__(self, product_templates: "odoo.model.motor_product_template") -> None:
+        self.template_ids = tuple(product_templates.ids)
+        self.templates_by_stroke: dict[int | None, set[int]] = defaultdict(set)
+        self.templates_by_configuration: dict[int | None, set[int]] = defaultdict(set)
+        self.templates_by_manufacturer: dict[int | None, set[int]] = defaultdict(set)
+        self.excluded_part_template_ids: dict[int, frozenset[int]] = {}
+        self.excluded_test_template_ids: dict[int, frozenset[int]] = {}
+
+        for product_template in product_templates:
+            for bucket, restricting_records in (
+                (self.templates_by_stroke, product_template.stroke),
+                (self.templates_by_configuration, product_template.configuration),
+                (self.templates_by_manufacturer, product_template.manufacturers),
+            ):
+                for record_id in restricting_records.ids or [self.ANY]:
+                    bucket[record_id].add(product_template.id)
+            self.excluded_part_template_ids[product_template.id] = frozenset(product_template.excluded_parts.ids)
+            self.excluded_test_template_ids[product_template.id] = frozenset(product_template.excluded_tests.ids)
+
+        self.templates_by_stroke = {key: frozenset(value) for key, value in self.templates_by_stroke.items()}
+        self.templates_by_configuration = {
+            key: frozenset(value) for key, value in self.templates_by_configuration.items()
+        }
+        self.templates_by_manufacturer = {
+            key: frozenset(value) for key, value in self.templates_by_manufacturer.items()
+        }
+
+    @staticmethod
+    def matching(bucket: dict[int | None, frozenset[int]], record_id: int | None) -> frozenset[int]:
+        empty = frozenset()
+        return bucket.get(MotorProductApplicabilityIndex.ANY, empty) | bucket.get(record_id, empty)
+
+    def applicable_template_ids(
+        self,
+        stroke_id: int | None,
+        configuration_id: int | None,
+        manufacturer_id: int | None,
+        part_template_ids: frozenset[int],
+        test_template_ids: frozenset[int],
+    ) -> list[int]:
+        candidate_ids = (
+            self.matching(self.templates_by_stroke, stroke_id)
+            & self.matching(self.templates_by_configuration, configuration_id)
+            & self.matching(self.templates_by_manufacturer, manufacturer_id)
+        )
+        return [
+            template_id
+            for template_id in self.template_ids
+            if template_id in candidate_ids
+            and not self.excluded_part_template_ids[template_id] & part_template_ids
+            and not self.excluded_test_template_ids[template_id] & test_template_ids
+        ]
+
+
 class MotorProductTemplate(models.Model):
     _name = "motor.product.template"
     _description = "Motor Product Template"
     _order = "sequence, id"
 
+    APPLICABILITY_FIELDS = {"stroke", "configuration", "manufacturers", "excluded_parts", "excluded_tests", "sequence"}
+
     name = fields.Char(required=True)
 
     stroke = fields.Many2many("motor.stroke")
@@ -36,6 +98,43 @@ class MotorProductTemplate(models.Model):
     weight = fields.Float()
     sequence = fields.Integer(default=10, index=True)
     website_description = fields.Html(string="HTML Description")
+    applicability_version = fields.Integer(
+        readonly=True, copy=False, help="Raised on every change to a field the applicability index reads"
+    )
+
+    def write(self, vals: "odoo.values.motor_product_template") -> bool:
+        result = super().write(vals)
+        if self.APPLICABILITY_FIELDS.intersection(vals):
+            self.flush_recordset(["applicability_version"])
+            # noinspection SqlResolve
+            self.env.cr.execute(
+                """
+                UPDATE motor_product_template
+                   SET applicability_version = COALESCE(applicability_version, 0) + 1
+                 WHERE id IN %s
+                """,
+                (tuple(self.ids),),
+            )
+            self.invalidate_recordset(["applicability_version"])
+        return result
+
+    @api.model
+    def get_applicability_version(self) -> tuple[int, int, int]:
+        """Key the cached index by data that changes on every create, unlink or indexed write in any worker."""
+        self.flush_model(["applicability_version"])
+        # noinspection SqlResolve
+        self.env.cr.execute(
+            """
+            SELECT count(*), COALESCE(max(id), 0), COALESCE(sum(applicability_version), 0)
+              FROM motor_product_template
+            """
+        )
+        return self.env.cr.fetchone()
+
+    @api.model
+    @tools.ormcache("self.get_applicability_version()")
+    def get_applicability_index(self) -> MotorProductApplicabilityIndex:
+        return MotorProductApplicabilityIndex(self.sudo().search([]))
 
     @api.model
     def get_template_tags_list(self) -> list[str]:
@@ -65,40 +164,61 @@ class MotorProductTemplate(models.Model):
 
         return template_tags
 
+    @tools.ormcache("self.id", "self.write_date")
+    def get_compiled_description(self) -> tuple[tuple[str, bool], ...]:
+        """Split the description into (text, is_tag) parts, so rendering needs no regex or repeated replaces."""
+        parts = re.split(r"{(.*?)}", self.website_description or "")
+        return tuple((part, bool(index % 2)) for index, part in enumerate(parts) if part or index % 2)
+
     def get_templated_description(self, motor: "odoo.model.motor") -> str:
         if not self.website_description:
             return ""
+        return self.render_descriptions([(self, motor)])[0]
 
-        used_tags = re.findall(r"{(.*?)}", self.website_description)
+    @api.model
+    def render_descriptions(
+        self, templates_and_motors: list[tuple["odoo.model.motor_product_template", "odoo.model.motor"]]
+    ) -> list[str]:
         template_tags = self.get_template_tags()
-        values = {}
-
-        for tag in used_tags:
-            tag = tag.lower()
-            if tag not in template_tags:
-                continue
-            tag_value = template_tags.get(tag, tag)
-
-            if tag_value.startswith("tests."):
-                test_index = int(tag_value.split(".")[1])
-                test = motor.tests.filtered(lambda t: t.template.id == test_index)[0]
-                if test.selection_result:
-                    value = test.selection_result.display_value
+        motors = self.env["motor"].union(*(motor for _, motor in templates_and_motors))
+        test_by_motor_and_template = {(test.motor.id, test.template.id): test for test in reversed(motors.tests)}
+        values: dict[tuple[int, str], str] = {}
+
+        def tag_value(motor: "odoo.model.motor", tag: str) -> str:
+            key = (motor.id, tag)
+            if key not in values:
+                source = template_tags[tag]
+                if source.startswith("tests."):
+                    test = test_by_motor_and_template.get((motor.id, int(source.split(".")[1])))
+                    if not test:
+                        value = ""
+                    elif test.selection_result:
+                        value = test.selection_result.display_value
+                    else:
+                        value = test.computed_result
                 else:
-                    value = test.computed_result
-            else:
-                value = motor
-                for field in tag_value.split("."):
-                    value = getattr(value, field, "")
-
-            if isinstance(value, list):
-                value = ", ".join(v for v in value)
-            values[tag] = str(value)
-
-        description = self.website_description
-        for tag, value in values.items():
-            description = description.replace(f"{{{tag}}}", value)
-        return description
+                    value = motor
+                    for field in source.split("."):
+                        value = getattr(value, field, "")
+
+                if isinstance(value, list):
+                    value = ", ".join(v for v in value)
+                values[key] = str(value)
+            return values[key]
+
+        descriptions = []
+        for template, motor in templates_and_motors:
+            description_parts = []
+            for part, is_tag in template.get_compiled_description():
+                # Only tags written in lowercase are substituted, anything else is left as written
+                if is_tag and part == part.lower() and part in template_tags:
+                    description_parts.append(tag_value(motor, part))
+                elif is_tag:
+                    description_parts.append(f"{{{part}}}")
+                else:
+                    description_parts.append(part)
+            descriptions.append("".join(description_parts))
+        return descriptions
 
 
 class MotorProductImage(models.Model):
@@ -149,8 +269,13 @@ class MotorProduct(models.Model):
     @api.model_create_multi
     def create(self, vals_list: list["odoo.values.motor_product"]) -> Self:
         motor_products = super().create(vals_list)
-        for product in motor_products:
-            product.website_description = product.template.get_templated_description(product.motor)
+        products_with_template = motor_products.filtered(lambda p: p.template.website_description)
+        descriptions = self.env["motor.product.template"].render_descriptions(
+            [(product.template, product.motor) for product in products_with_template]
+        )
+        for product, description in zip(products_with_template, descriptions):
+            product.website_description = description
+        (motor_products - products_with_template).website_description = ""
 
         return motor_products
 
@@ -190,15 +315,15 @@ class MotorProduct(models.Model):
 
     @api.depends("mpn")
     def _compute_reference_product(self) -> None:
-        for motor_product in self:
-            if not motor_product.mpn:
-                motor_product.reference_product = False
-                continue
-            products = self.env["product.template"].search([("mpn", "!=", False)])
-            product_mpns = motor_product.get_list_of_mpns()
-            matching_products = products.filtered(lambda p: any(mpn.lower() in p.mpn.lower() for mpn in product_mpns))
-            latest_product = max(matching_products, key=lambda p: p.create_date, default=None)
-            motor_product.reference_product = latest_product
+        product_mpn_model = self.env["product.mpn"]
+        tokens_by_product = {motor_product: product_mpn_model.get_tokens(motor_product.mpn) for motor_product in self}
+        templates_by_token = product_mpn_model.find_templates_containing_tokens(
+            set().union(*tokens_by_product.values())
+        )
+        for motor_product, tokens in tokens_by_product.items():
+            matching_templates = [template for token in tokens for template in templates_by_token.get(token, [])]
+            latest_template = max(matching_templates, default=None)
+            motor_product.reference_product = latest_template[1] if latest_template else False
 
     @api.depends("template_name", "dismantle_notes")
     def _compute_template_name_with_dismantle_notes(self) -> None:
@@ -1,13 +1,21 @@
 import logging
 import re
+from collections import deque
 from datetime import timedelta
 from typing import Any
 
-from odoo import api, fields, models, _
+import odoo
+from odoo import api, fields, models, tools, _
 from odoo.exceptions import ValidationError, UserError
+from odoo.tools.query import Query
+from odoo.tools import SQL
 
 _logger = logging.getLogger(__name__)
 
+SKU_SEQUENCE_CODE = "product.template.default_code"
+SKU_POOL_CACHE_KEY = "product_sku_pool"
+QTY_WEIGHTED_FIELDS = {"list_price", "standard_price"}
+
 
 class ProductType(models.Model):
     _name = "product.type"
@@ -23,6 +31,14 @@ class ProductType(models.Model):
     products_import = fields.One2many("product.import", "part_type")
     motor_products = fields.One2many("motor.product", "part_type")
 
+    def write(self, vals: dict[str, Any]) -> bool:
+        self.env["shopify.sync"].clear_lookup_cache()
+        return super().write(vals)
+
+    def unlink(self) -> bool:
+        self.env["shopify.sync"].clear_lookup_cache()
+        return super().unlink()
+
 
 class ProductCondition(models.Model):
     _name = "product.condition"
@@ -37,6 +53,67 @@ class ProductCondition(models.Model):
     products_import = fields.One2many("product.import", "condition")
     motor_products = fields.One2many("motor.product", "condition")
 
+    def write(self, vals: dict[str, Any]) -> bool:
+        self.env["shopify.sync"].clear_lookup_cache()
+        return super().write(vals)
+
+    def unlink(self) -> bool:
+        self.env["shopify.sync"].clear_lookup_cache()
+        return super().unlink()
+
+
+class ProductDefaultCode(models.Model):
+    _name = "product.default.code"
+    _description = "Product SKU"
+    _auto = False
+
+    SOURCE_MODELS = ("motor.product", "product.template", "product.import")
+
+    default_code = fields.Char("SKU", readonly=True)
+    res_model = fields.Char(readonly=True)
+    res_id = fields.Integer(readonly=True)
+
+    def init(self) -> None:
+        self.create_view()
+
+    @api.model
+    def create_view(self) -> None:
+        # init() runs in model registration order, so on install the source tables may not exist yet.
+        # Every source model calls this from its own init(), and the last one to exist builds the view.
+        source_tables = [self.env[model_name]._table for model_name in self.SOURCE_MODELS]
+        self.env.cr.execute(
+            "SELECT bool_and(to_regclass(table_name) IS NOT NULL) FROM unnest(%s::varchar[]) AS table_name",
+            (source_tables,),
+        )
+        if not self.env.cr.fetchone()[0]:
+            return
+
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        # The id is built from each row's own columns, with no window function, so filters on the view reach
+        # the default_code index of every source table
+        branches = " UNION ALL ".join(
+            f"SELECT id * {len(self.SOURCE_MODELS)} + {offset} AS id, default_code, '{model_name}' AS res_model, "
+            f"id AS res_id FROM {self.env[model_name]._table}"
+            for offset, model_name in enumerate(self.SOURCE_MODELS)
+        )
+        self.env.cr.execute(f"CREATE VIEW {self._table} AS ({branches})")
+
+    @api.model
+    def get_used_skus(self, skus: list[str]) -> set[str]:
+        """Return the SKUs already used by any source model, checking each table's default_code index directly."""
+        self.flush_source_models()
+        branches = " UNION ALL ".join(
+            f"SELECT default_code FROM {self.env[model_name]._table} WHERE default_code = ANY(%(skus)s)"
+            for model_name in self.SOURCE_MODELS
+        )
+        self.env.cr.execute(branches, {"skus": list(skus)})
+        return {row[0] for row in self.env.cr.fetchall()}
+
+    @api.model
+    def flush_source_models(self) -> None:
+        for model_name in self.SOURCE_MODELS:
+            self.env[model_name].flush_model(["default_code"])
+
 
 class ProductBase(models.AbstractModel):
     _name = "product.base"
@@ -82,6 +159,26 @@ class ProductBase(models.AbstractModel):
     has_recent_messages = fields.Boolean(compute="_compute_has_recent_messages", store=True)
     is_listable = fields.Boolean(default=False)
 
+    def init(self) -> None:
+        super().init()
+        self.env["product.default.code"].create_view()
+
+    @api.model_create_multi
+    def create(self, vals_list: list[dict[str, Any]]) -> "odoo.model.product_base":
+        products = super().create(vals_list)
+        self.env["product.mpn"].update_product_tokens(products)
+        return products
+
+    def write(self, vals: dict[str, Any]) -> bool:
+        result = super().write(vals)
+        if "mpn" in vals:
+            self.env["product.mpn"].update_product_tokens(self)
+        return result
+
+    def unlink(self) -> bool:
+        self.env["product.mpn"].remove_product_tokens(self)
+        return super().unlink()
+
     # noinspection PyShadowingNames
     @api.model
     def read_group(
@@ -95,20 +192,34 @@ class ProductBase(models.AbstractModel):
         lazy: bool = True,
     ) -> list[dict[str, Any]]:
         groups = super().read_group(domain, fields, groupby, offset=offset, limit=limit, orderby=orderby, lazy=lazy)
-        fields_to_sum_with_qty = {"list_price", "standard_price"}
-        if not fields_to_sum_with_qty.intersection(fields):
+        # With a stored quantity the weighted sums already come from _read_group_select
+        if self._fields["qty_available"].store:
             return groups
+        if not QTY_WEIGHTED_FIELDS.intersection(field.split(":")[0] for field in fields):
+            return groups
+
+        products = self.search(domain)
         for group in groups:
             if "__domain" in group:
-                group["list_price"] = sum(
-                    product["list_price"] * product["qty_available"] for product in self.search(group["__domain"])
-                )
+                group_products = products.filtered_domain(group["__domain"])
+                group["list_price"] = sum(product.list_price * product.qty_available for product in group_products)
                 group["standard_price"] = sum(
-                    product["standard_price"] * product["qty_available"] for product in self.search(group["__domain"])
+                    product.standard_price * product.qty_available for product in group_products
                 )
 
         return groups
 
+    @api.model
+    def _read_group_select(self, aggregate_spec: str, query: Query) -> SQL:
+        field_name, _, aggregate = aggregate_spec.partition(":")
+        if aggregate == "sum" and field_name in QTY_WEIGHTED_FIELDS and self._fields["qty_available"].store:
+            return SQL(
+                "SUM(%s * %s)",
+                self._field_to_sql(self._table, field_name, query),
+                self._field_to_sql(self._table, "qty_available", query),
+            )
+        return super()._read_group_select(aggregate_spec, query)
+
     @api.constrains("default_code")
     def _check_sku(self) -> None:
         for product in self:
@@ -118,17 +229,45 @@ class ProductBase(models.AbstractModel):
                 raise ValidationError(_("SKU must be 4-8 digits."))
 
     def get_next_sku(self) -> str:
-        sequence = self.env["ir.sequence"].search([("code", "=", "product.template.default_code")])
-        padding = sequence.padding
-        max_sku = "9" * padding
-        while (new_sku := self.env["ir.sequence"].next_by_code("product.template.default_code")) <= max_sku:
-            if not (
-                self.env["motor.product"].search_count([("default_code", "=", new_sku)])
-                or self.env["product.template"].search_count([("default_code", "=", new_sku)])
-                or self.env["product.import"].search_count([("default_code", "=", new_sku)])
-            ):
-                return new_sku
-        raise ValidationError("SKU limit reached.")
+        sku_pool = self.env.cr.cache.setdefault(SKU_POOL_CACHE_KEY, deque())
+        if not sku_pool:
+            sku_pool.extend(self.allocate_skus(1))
+        return sku_pool.popleft()
+
+    @api.model
+    def reserve_skus(self, count: int) -> None:
+        """Fill the transaction's SKU pool so that creating ``count`` products pays for one allocation."""
+        sku_pool = self.env.cr.cache.setdefault(SKU_POOL_CACHE_KEY, deque())
+        if len(sku_pool) < count:
+            sku_pool.extend(self.allocate_skus(count - len(sku_pool)))
+
+    @api.model
+    def allocate_skus(self, count: int) -> list[str]:
+        sequence = self.env["ir.sequence"].sudo().search([("code", "=", SKU_SEQUENCE_CODE)], limit=1)
+        max_sku = "9" * sequence.padding
+        skus = []
+        while len(skus) < count:
+            candidate_skus = [sku for sku in self.next_sequence_skus(sequence, count - len(skus)) if sku <= max_sku]
+            if not candidate_skus:
+                raise ValidationError("SKU limit reached.")
+            used_skus = self.get_used_skus(candidate_skus)
+            skus += [sku for sku in candidate_skus if sku not in used_skus]
+        return skus
+
+    @api.model
+    def next_sequence_skus(self, sequence: "odoo.model.ir_sequence", count: int) -> list[str]:
+        if sequence.implementation != "standard":
+            return [sequence.next_by_id() for _ in range(count)]
+        # nextval is never rolled back, so concurrent workers always get disjoint blocks
+        self.env.cr.execute(
+            "SELECT nextval(%s) FROM generate_series(1, %s)",
+            (f"ir_sequence_{sequence.id:03d}", count),
+        )
+        return [sequence.get_next_char(row[0]) for row in self.env.cr.fetchall()]
+
+    @api.model
+    def get_used_skus(self, skus: list[str]) -> set[str]:
+        return self.env["product.default.code"].get_used_skus(skus)
 
     @api.constrains("length", "width", "height")
     def _check_dimension_values(self) -> None:
@@ -190,41 +329,26 @@ class ProductBase(models.AbstractModel):
         for product in self.filtered(lambda p: p.bin and p.bin.upper() != p.bin):
             product.bin = product.bin.upper()
 
-    def _products_from_existing_products(self, field_name: str, field_value: str) -> list[dict[str, str]]:
-        is_new_product = isinstance(self.id, models.NewId)
-        if is_new_product:
-            product_imports = self.search([(field_name, "=", field_value)])
-        else:
-            product_imports = self.search(
-                [
-                    (field_name, "=", field_value),
-                    ("id", "!=", self.id),
-                ]
-            )
-        product_templates = self.env["product.template"].search([(field_name, "=", field_value)])
+    def _products_from_existing_mpn(self, mpn: str) -> list[dict[str, str]]:
+        product_mpn_model = self.env["product.mpn"]
+        tokens = product_mpn_model.get_tokens(mpn)
+        same_model_products = self.browse(product_mpn_model.find_res_ids_by_token(self._name, tokens)) - self._origin
+        product_templates = self.env["product.template"].browse(
+            product_mpn_model.find_res_ids_by_token("product.template", tokens)
+        )
 
         existing_products = {}
-        for product in product_imports:
-            product_to_add = {
-                "default_code": product.default_code,
-                "bin": product.bin,
-                "condition": product.condition.id,
-            }
-            existing_products[product.default_code] = product_to_add
-
-        for product in product_templates:
-            product_to_add = {
+        for product in same_model_products + product_templates:
+            existing_products[product.default_code] = {
                 "default_code": product.default_code,
                 "bin": product.bin,
-                "condition": product.condition.id,
+                "condition": product.condition.code,
             }
-            existing_products[product.default_code] = product_to_add
-
         return list(existing_products.values())
 
     def products_from_mpn_condition_new(self) -> list[dict[str, str]] | None:
         if self.mpn and self.condition.code == "new":
-            existing_products = self._products_from_existing_products("mpn", self.first_mpn)
+            existing_products = self._products_from_existing_mpn(self.first_mpn)
             existing_new_products = [product for product in existing_products if product["condition"] == "new"]
             if existing_new_products:
                 return existing_new_products
@@ -291,29 +415,82 @@ class ProductBase(models.AbstractModel):
         if self._name in ["product.template", "product.product"]:
             raise UserError("This method is not available for Odoo base products.")
 
-        product_not_ready = self.filtered(lambda p: self._check_fields_and_images(p))
+        results = self.import_to_products_batch()
+        duplicate_results = [result for result in results if result["status"].startswith("duplicate")]
+        if duplicate_results and not any(result["status"] == "imported" for result in results):
+            raise UserError("\n".join(result["message"] for result in duplicate_results))
+
+        for result in duplicate_results:
+            self.browse(result["id"]).message_post(
+                body=result["message"],
+                subject="Import Error",
+                subtype_id=self.env.ref("mail.mt_note").id,
+                partner_ids=[self.env.user.partner_id.id],
+            )
 
+    def import_to_products_batch(self) -> list[dict[str, Any]]:
+        """Promote the ready records to products in one pass, reporting a status per record instead of raising.
+
+        Statuses are imported, missing_data, duplicate_mpn and duplicate_sku. Duplicates are checked with grouped
+        queries against existing products and within the batch, where the first record with a SKU or new-condition
+        MPN wins, before anything is created.
+        """
+        if self._name in ["product.template", "product.product"]:
+            raise UserError("This method is not available for Odoo base products.")
+
+        product_not_ready = self.filtered(lambda p: self._check_fields_and_images(p))
         if product_not_ready:
             self._post_missing_data_message(product_not_ready)
+        results = {
+            product.id: {
+                "id": product.id,
+                "default_code": product.default_code,
+                "status": "missing_data",
+                "message": f"Product {product.default_code} is missing data",
+            }
+            for product in product_not_ready
+        }
+
+        products = self - product_not_ready
+        duplicate_mpn_messages = products.find_duplicate_new_mpns()
+        existing_skus = set(
+            self.env["product.product"]
+            .search([("default_code", "in", products.mapped("default_code"))])
+            .mapped("default_code")
+        )
 
-        for product in self - product_not_ready:
-            existing_products_with_mpn = product.products_from_mpn_condition_new()
-            if existing_products_with_mpn:
-                existing_products_display = [
-                    f"{product['default_code']} - {product['bin']}" for product in existing_products_with_mpn
-                ]
-                raise UserError(
-                    f"A product with the same MPN already exists.  Its SKU is/are {existing_products_display}"
-                )
-            existing_product = self.env["product.product"].search(
-                [("default_code", "=", product.default_code)], limit=1
+        product_mpn_model = self.env["product.mpn"]
+        accepted_skus_by_mpn_token: dict[str, str] = {}
+
+        products_to_create = self.browse()
+        for product in products:
+            result = {"id": product.id, "default_code": product.default_code}
+            mpn_tokens = product_mpn_model.get_tokens(product.first_mpn) if product.condition.code == "new" else set()
+            batch_duplicate_skus = sorted(
+                {accepted_skus_by_mpn_token[token] for token in mpn_tokens & accepted_skus_by_mpn_token.keys()}
             )
-            if existing_product:
-                raise UserError(
-                    f"A product with the same SKU already exists.  Its SKU is {existing_product.default_code}"
+            if product.id in duplicate_mpn_messages:
+                result.update(status="duplicate_mpn", message=duplicate_mpn_messages[product.id])
+            elif product.default_code in existing_skus:
+                result.update(
+                    status="duplicate_sku",
+                    message=f"A product with the same SKU already exists.  Its SKU is {product.default_code}",
+                )
+            elif batch_duplicate_skus:
+                result.update(
+                    status="duplicate_mpn",
+                    message=(
+                        f"A product with the same MPN is imported in this batch.  Its SKU is/are {batch_duplicate_skus}"
+                    ),
                 )
+            else:
+                existing_skus.add(product.default_code)
+                accepted_skus_by_mpn_token.update(dict.fromkeys(mpn_tokens, product.default_code))
+                products_to_create |= product
+            results[product.id] = result
 
-            new_product = self.env["product.product"].create(
+        new_products = self.env["product.product"].create(
+            [
                 {
                     "default_code": product.default_code,
                     "mpn": product.mpn,
@@ -336,24 +513,69 @@ class ProductBase(models.AbstractModel):
                     "width": product.width,
                     "height": product.height,
                 }
-            )
-            new_product.update_quantity(product.qty_available)
-
-            sorted_images = product.images.sorted(key=lambda r: r.index)
-
-            for image in sorted_images:
-                if not image.image_1920:
-                    continue
+                for product in products_to_create
+            ]
+        )
+        self.env["product.product"].update_quantities(
+            {new_product.id: product.qty_available for product, new_product in zip(products_to_create, new_products)}
+        )
 
-                self.env["product.image"].create(
-                    {
-                        "image_1920": image.image_1920,
-                        "product_tmpl_id": new_product.product_tmpl_id.id,
-                        "name": image.index,
-                    }
+        image_vals_list = []
+        images_to_transfer = self.env[self._fields["images"].comodel_name]
+        for product, new_product in zip(products_to_create, new_products):
+            images = product.images.filtered(lambda i: i.attachment or i.image_1920).sorted(key=lambda r: r.index)
+            images_to_transfer |= images
+            image_vals_list += [
+                {"product_tmpl_id": new_product.product_tmpl_id.id, "name": image.index} for image in images
+            ]
+            results[product.id].update(
+                status="imported",
+                message=f"Imported as {new_product.default_code}",
+                product_id=new_product.id,
+            )
+        images_to_transfer.transfer_images("product.image", image_vals_list)
+        images_to_transfer.unlink()
+        products_to_create.unlink()
+
+        return [results[product.id] for product in self]
+
+    def find_duplicate_new_mpns(self) -> dict[int, str]:
+        """Map the new-condition records whose first MPN is already used by a new product to an error message.
+
+        Other records in self are not reported, so the caller can accept the first of them and reject the rest.
+        """
+        product_mpn_model = self.env["product.mpn"]
+        products = self.filtered(lambda p: p.mpn and p.condition.code == "new")
+        tokens_by_product = {product: product_mpn_model.get_tokens(product.first_mpn) for product in products}
+        all_tokens = set().union(*tokens_by_product.values())
+        if not all_tokens:
+            return {}
+
+        same_model_ids_by_token = product_mpn_model.find_res_ids_by_tokens(self._name, all_tokens)
+        template_ids_by_token = product_mpn_model.find_res_ids_by_tokens("product.template", all_tokens)
+        existing_same_model = self.browse(set().union(*same_model_ids_by_token.values()))
+        existing_templates = self.env["product.template"].browse(set().union(*template_ids_by_token.values()))
+        new_same_model_ids = set(existing_same_model.filtered(lambda p: p.condition.code == "new").ids)
+        new_template_ids = set(existing_templates.filtered(lambda p: p.condition.code == "new").ids)
+
+        messages = {}
+        for product, tokens in tokens_by_product.items():
+            same_model_ids = (
+                set().union(*(same_model_ids_by_token.get(token, set()) for token in tokens)) & new_same_model_ids
+            )
+            same_model_ids.difference_update(self.ids)
+            template_ids = (
+                set().union(*(template_ids_by_token.get(token, set()) for token in tokens)) & new_template_ids
+            )
+            existing_products = self.browse(same_model_ids) + self.env["product.template"].browse(template_ids)
+            if existing_products:
+                existing_products_display = sorted(
+                    {f"{existing.default_code} - {existing.bin}" for existing in existing_products}
+                )
+                messages[product.id] = (
+                    f"A product with the same MPN already exists.  Its SKU is/are {existing_products_display}"
                 )
-                image.unlink()
-            product.unlink()
+        return messages
 
     def print_bin_labels(self) -> None:
         unique_bins = [
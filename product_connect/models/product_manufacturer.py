@@ -1,4 +1,5 @@
 import re
+from typing import Any
 
 from odoo import api, fields, models
 
@@ -29,5 +30,13 @@ class ProductManufacturer(models.Model):
     def normalize_name(name: str) -> str:
         return re.sub(r"\W+", "", name).lower() if name else ""
 
+    def write(self, vals: dict[str, Any]) -> bool:
+        self.env["shopify.sync"].clear_lookup_cache()
+        return super().write(vals)
+
+    def unlink(self) -> bool:
+        self.env["shopify.sync"].clear_lookup_cache()
+        return super().unlink()
+
     def __str__(self) -> str:
         return self.name if self.name else ""
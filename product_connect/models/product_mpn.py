@@ -0,0 +1,96 @@
+import re
+from datetime import datetime
+
+import odoo
+from odoo import api, fields, models
+from odoo.tools.sql import create_index
+
+
+class ProductMpn(models.Model):
+    _name = "product.mpn"
+    _description = "Product MPN Token"
+
+    SOURCE_MODELS = ("motor.product", "product.template", "product.import")
+
+    res_model = fields.Char(required=True, index=True)
+    res_id = fields.Integer(required=True, index=True)
+    token = fields.Char(required=True, index="trigram")
+
+    def init(self) -> None:
+        # The trigram index serves substring matches, this one exact token lookups
+        create_index(self.env.cr, "product_mpn_token_res_model_index", self._table, ["token", "res_model"])
+
+    @staticmethod
+    def normalize_mpn(mpn: str) -> str:
+        return re.sub(r"[^a-z0-9]", "", mpn.lower())
+
+    @api.model
+    def get_tokens(self, mpn: str | None) -> set[str]:
+        if not mpn:
+            return set()
+        return {token for part in re.split(r"[, ]", mpn) if (token := self.normalize_mpn(part))}
+
+    @api.model
+    def update_product_tokens(self, products: "odoo.model.product_base") -> None:
+        self.remove_product_tokens(products)
+        self.create(
+            [
+                {"res_model": products._name, "res_id": product.id, "token": token}
+                for product in products
+                for token in self.get_tokens(product.mpn)
+            ]
+        )
+
+    @api.model
+    def remove_product_tokens(self, products: "odoo.model.product_base") -> None:
+        self.search([("res_model", "=", products._name), ("res_id", "in", products.ids)]).unlink()
+
+    @api.model
+    def rebuild(self) -> None:
+        self.search([]).unlink()
+        for model_name in self.SOURCE_MODELS:
+            products = self.env[model_name].with_context(active_test=False).search([("mpn", "!=", False)])
+            self.update_product_tokens(products)
+
+    @api.model
+    def find_res_ids_by_token(self, res_model: str, tokens: set[str]) -> set[int]:
+        return set().union(*self.find_res_ids_by_tokens(res_model, tokens).values())
+
+    @api.model
+    def find_res_ids_by_tokens(self, res_model: str, tokens: set[str]) -> dict[str, set[int]]:
+        if not tokens:
+            return {}
+        self.flush_model()
+        self.env.cr.execute(
+            "SELECT DISTINCT token, res_id FROM product_mpn WHERE token IN %s AND res_model = %s",
+            (tuple(tokens), res_model),
+        )
+        res_ids_by_token: dict[str, set[int]] = {}
+        for token, res_id in self.env.cr.fetchall():
+            res_ids_by_token.setdefault(token, set()).add(res_id)
+        return res_ids_by_token
+
+    @api.model
+    def find_templates_containing_tokens(self, tokens: set[str]) -> dict[str, list[tuple[datetime, int]]]:
+        """Map each token to the active templates with an MPN token containing it, as (create_date, id) pairs."""
+        if not tokens:
+            return {}
+        self.flush_model()
+        self.env["product.template"].flush_model(["active", "create_date"])
+        # Tokens are alphanumeric only, so they need no LIKE escaping
+        self.env.cr.execute(
+            """
+            SELECT DISTINCT query.token, template.create_date, template.id
+              FROM unnest(%s::varchar[]) AS query (token)
+              JOIN product_mpn mpn
+                ON mpn.res_model = 'product.template'
+               AND mpn.token LIKE '%%' || query.token || '%%'
+              JOIN product_template template ON template.id = mpn.res_id
+             WHERE template.active
+            """,
+            (list(tokens),),
+        )
+        templates_by_token: dict[str, list[tuple[datetime, int]]] = {}
+        for token, create_date, template_id in self.env.cr.fetchall():
+            templates_by_token.setdefault(token, []).append((create_date, template_id))
+        return templates_by_token
@@ -1,4 +1,7 @@
-from odoo import fields, models
+from collections import defaultdict
+
+from odoo import api, fields, models
+from odoo.tools.sql import create_index
 
 
 class ProductProduct(models.Model):
@@ -11,27 +14,57 @@ class ProductProduct(models.Model):
     shopify_ebay_category_id = fields.Char(copy=False)
     shopify_last_exported = fields.Datetime(string="Last Exported Time")
     shopify_next_export = fields.Boolean(string="Export Next Sync?")
+    shopify_export_fingerprint = fields.Char(copy=False, help="Hash of the content last exported to Shopify")
     shopify_created_at = fields.Datetime()
 
+    def init(self) -> None:
+        super().init()
+        # Keeps the Shopify export change detection cheap when nothing changed
+        create_index(
+            self.env.cr,
+            "product_product_shopify_export_dirty_index",
+            self._table,
+            ["id"],
+            where="active AND (shopify_next_export OR shopify_last_exported IS NULL "
+            "OR write_date > shopify_last_exported)",
+        )
+
     def update_quantity(self, quantity: float) -> None:
+        self.update_quantities({product.id: quantity for product in self})
+
+    @api.model
+    def update_quantities(self, quantities_by_product_id: dict[int, float]) -> None:
+        if not quantities_by_product_id:
+            return
         stock_location_ref = "stock.stock_location_stock"
         if not self.env.ref(stock_location_ref, raise_if_not_found=False):
-            self.product_tmpl_id.notify_channel_on_error("Stock Location Not Found", stock_location_ref)
+            self.env["product.template"].notify_channel_on_error("Stock Location Not Found", stock_location_ref)
         stock_location = self.env.ref(stock_location_ref)
         if not stock_location.id:
             return
 
-        for product in self:
+        quant_model = self.env["stock.quant"]
+        quants = quant_model.search(
+            [
+                ("product_id", "in", list(quantities_by_product_id)),
+                ("location_id", "=", stock_location.id),
+            ]
+        )
+        quants_by_product_id = {}
+        for quant in quants:
+            quants_by_product_id.setdefault(quant.product_id.id, quant)
 
-            quant = self.env["stock.quant"].search(
-                [
-                    ("product_id", "=", product.id),
-                    ("location_id", "=", stock_location.id),
-                ],
-                limit=1,
+        missing_product_ids = [
+            product_id for product_id in quantities_by_product_id if product_id not in quants_by_product_id
+        ]
+        if missing_product_ids:
+            new_quants = quant_model.create(
+                [{"product_id": product_id, "location_id": stock_location.id} for product_id in missing_product_ids]
             )
+            quants_by_product_id.update({quant.product_id.id: quant for quant in new_quants})
 
-            if not quant:
-                quant = self.env["stock.quant"].create({"product_id": product.id, "location_id": stock_location.id})
-
-            quant.with_context(inventory_mode=True).write({"quantity": float(quantity)})
+        quant_ids_by_quantity = defaultdict(list)
+        for product_id, quantity in quantities_by_product_id.items():
+            quant_ids_by_quantity[float(quantity)].append(quants_by_product_id[product_id].id)
+        for quantity, quant_ids in quant_ids_by_quantity.items():
+            quant_model.browse(quant_ids).with_context(inventory_mode=True).write({"quantity": quantity})
@@ -0,0 +1,54 @@
+from array import array
+from datetime import datetime
+from typing import Iterable
+
+from odoo import api, fields, models
+from odoo.tools import split_every
+
+
+class ShopifyProductSale(models.Model):
+    _name = "shopify.product.sale"
+    _description = "Shopify Product Last Sale"
+    _sql_constraints = [
+        ("shopify_product_id_uniq", "unique (shopify_product_id)", "Shopify product already has a last sale !"),
+    ]
+
+    shopify_product_id = fields.Char(required=True, index=True)
+    last_sold_at = fields.Datetime(required=True, index=True)
+
+    @api.model
+    def record_sales(self, sales: Iterable[tuple[int, datetime]]) -> None:
+        for sales_chunk in split_every(1000, sales):
+            self.env.cr.execute(
+                """
+                INSERT INTO shopify_product_sale
+                    (shopify_product_id, last_sold_at, create_uid, create_date, write_uid, write_date)
+                SELECT sale.shopify_product_id, max(sale.last_sold_at), %(uid)s,
+                       now() AT TIME ZONE 'UTC', %(uid)s, now() AT TIME ZONE 'UTC'
+                  FROM unnest(%(shopify_product_ids)s::varchar[], %(last_sold_ats)s::timestamp[])
+                       AS sale (shopify_product_id, last_sold_at)
+                 GROUP BY sale.shopify_product_id
+                ON CONFLICT (shopify_product_id) DO UPDATE
+                   SET last_sold_at = GREATEST(shopify_product_sale.last_sold_at, EXCLUDED.last_sold_at),
+                       write_date = EXCLUDED.write_date
+                """,
+                {
+                    "uid": self.env.uid,
+                    "shopify_product_ids": [str(shopify_product_id) for shopify_product_id, _ in sales_chunk],
+                    "last_sold_ats": [last_sold_at.replace(tzinfo=None) for _, last_sold_at in sales_chunk],
+                },
+            )
+        self.invalidate_model()
+
+    @api.model
+    def get_sold_product_ids(self, sold_since: datetime) -> array:
+        self.env.cr.execute(
+            """
+            SELECT shopify_product_id::bigint AS shopify_product_id
+              FROM shopify_product_sale
+             WHERE last_sold_at >= %s
+             ORDER BY 1
+            """,
+            (sold_since.replace(tzinfo=None),),
+        )
+        return array("q", (row[0] for row in self.env.cr.fetchall()))
@@ -0,0 +1,243 @@
+# type: ignore
+import json
+import logging
+import threading
+import time
+from typing import Any
+from urllib.error import HTTPError
+
+import odoo
+import shopify
+from odoo import api, fields, models
+
+MAX_RETRIES = 5
+MAX_RETRY_DELAY = 60
+DEFAULT_QUERY_COST = 100.0
+DEFAULT_MAXIMUM_AVAILABLE = 1000.0
+DEFAULT_RESTORE_RATE = 50.0
+_logger = logging.getLogger(__name__)
+
+
+class ShopifyThrottledError(Exception):
+    pass
+
+
+class ShopifyCostBudget:
+    """Leaky bucket mirroring Shopify's GraphQL cost throttle, shared by every worker through one database row.
+
+    Each call reserves its predicted cost before it is sent and waits until the bucket can cover it, so requests are
+    spaced out instead of being throttled. The real cost and bucket state from each response are written back.
+    """
+
+    def __init__(self, dbname: str, name: str) -> None:
+        self.dbname = dbname
+        self.name = name
+        self.lock = threading.Lock()
+        self.requested_costs: dict[str, float] = {}
+        self.ensure_budget_row()
+
+    def cursor(self) -> "odoo.sql_db.Cursor":
+        # A separate short transaction, so other workers see reservations immediately
+        return odoo.sql_db.db_connect(self.dbname).cursor()
+
+    def ensure_budget_row(self) -> None:
+        with self.cursor() as cr:
+            cr.execute(
+                """
+                INSERT INTO shopify_rate_budget
+                    (name, available, maximum_available, restore_rate, last_refill_at,
+                     request_count, throttle_count, sleep_seconds, create_date, write_date)
+                VALUES (%s, %s, %s, %s, now() AT TIME ZONE 'UTC', 0, 0, 0,
+                        now() AT TIME ZONE 'UTC', now() AT TIME ZONE 'UTC')
+                ON CONFLICT (name) DO NOTHING
+                """,
+                (self.name, DEFAULT_MAXIMUM_AVAILABLE, DEFAULT_MAXIMUM_AVAILABLE, DEFAULT_RESTORE_RATE),
+            )
+
+    def predict_cost(self, operation_name: str | None) -> float:
+        with self.lock:
+            return self.requested_costs.get(operation_name or "", DEFAULT_QUERY_COST)
+
+    def reserve(self, operation_name: str | None) -> float:
+        cost = self.predict_cost(operation_name)
+        with self.cursor() as cr:
+            cr.execute(
+                """
+                UPDATE shopify_rate_budget
+                   SET available = LEAST(
+                           maximum_available,
+                           available + restore_rate * EXTRACT(
+                               EPOCH FROM (statement_timestamp() AT TIME ZONE 'UTC') - last_refill_at
+                           )
+                       ) - %(cost)s,
+                       last_refill_at = statement_timestamp() AT TIME ZONE 'UTC'
+                 WHERE name = %(name)s
+             RETURNING available + %(cost)s, restore_rate
+                """,
+                {"cost": cost, "name": self.name},
+            )
+            available_before, restore_rate = cr.fetchone()
+            sleep_time = max(0.0, (cost - available_before) / (restore_rate or DEFAULT_RESTORE_RATE))
+            if sleep_time:
+                self.add_metrics(cr, sleep_seconds=sleep_time)
+
+        if sleep_time:
+            _logger.debug("Waiting %.2f seconds for %s Shopify cost points", sleep_time, cost)
+            time.sleep(sleep_time)
+        return cost
+
+    def reconcile(self, operation_name: str | None, reserved_cost: float, cost: dict[str, Any]) -> None:
+        throttle_status = cost.get("throttleStatus") or {}
+        requested_cost = cost.get("requestedQueryCost")
+        actual_cost = cost.get("actualQueryCost")
+        if requested_cost is not None:
+            with self.lock:
+                self.requested_costs[operation_name or ""] = float(requested_cost)
+
+        # Shopify holds the requested cost while the query runs and refunds the unused part afterwards
+        refund = reserved_cost - float(actual_cost if actual_cost is not None else requested_cost or reserved_cost)
+        with self.cursor() as cr:
+            cr.execute(
+                """
+                UPDATE shopify_rate_budget
+                   SET maximum_available = COALESCE(%(maximum_available)s, maximum_available),
+                       restore_rate = COALESCE(%(restore_rate)s, restore_rate),
+                       available = LEAST(
+                           COALESCE(%(currently_available)s, maximum_available),
+                           COALESCE(%(maximum_available)s, maximum_available),
+                           available + %(refund)s + restore_rate * EXTRACT(
+                               EPOCH FROM (statement_timestamp() AT TIME ZONE 'UTC') - last_refill_at
+                           )
+                       ),
+                       last_refill_at = statement_timestamp() AT TIME ZONE 'UTC',
+                       request_count = request_count + 1
+                 WHERE name = %(name)s
+                """,
+                {
+                    "maximum_available": throttle_status.get("maximumAvailable"),
+                    "restore_rate": throttle_status.get("restoreRate"),
+                    "currently_available": throttle_status.get("currentlyAvailable"),
+                    "refund": refund,
+                    "name": self.name,
+                },
+            )
+
+    def record_throttle(self, sleep_time: float) -> None:
+        with self.cursor() as cr:
+            self.add_metrics(cr, throttle_count=1, sleep_seconds=sleep_time)
+
+    def add_metrics(self, cr: "odoo.sql_db.Cursor", throttle_count: int = 0, sleep_seconds: float = 0.0) -> None:
+        cr.execute(
+            """
+            UPDATE shopify_rate_budget
+               SET throttle_count = throttle_count + %s,
+                   sleep_seconds = sleep_seconds + %s
+             WHERE name = %s
+            """,
+            (throttle_count, sleep_seconds, self.name),
+        )
+
+
+class RateLimitedGraphQL(shopify.GraphQL):
+    def __init__(
+        self, cost_budget: ShopifyCostBudget, endpoint: str | None = None, headers: dict[str, str] | None = None
+    ) -> None:
+        # An explicit endpoint and headers let threads without the active Shopify session build their own client
+        if endpoint is None:
+            super().__init__()
+        else:
+            self.endpoint = endpoint
+            self.headers = headers or {}
+        self.cost_budget = cost_budget
+
+    def execute(self, query: str, variables: dict | None = None, operation_name: str | None = None) -> str:
+        for attempt in range(MAX_RETRIES):
+            reserved_cost = self.cost_budget.reserve(operation_name)
+            try:
+                response = super().execute(query, variables=variables, operation_name=operation_name)
+            except HTTPError as error:
+                retry_after = max(float(error.headers.get("Retry-After", 4)), min(attempt * 2, MAX_RETRY_DELAY))
+                if error.code == 429:
+                    self.wait_after_throttle(retry_after)
+                else:
+                    _logger.debug(
+                        "Shopify request failed with HTTP %s. Retrying in %s seconds", error.code, retry_after
+                    )
+                    time.sleep(retry_after)
+                continue
+
+            response_json = json.loads(response)
+            cost = response_json.get("extensions", {}).get("cost") or {}
+            self.cost_budget.reconcile(operation_name, reserved_cost, cost)
+            try:
+                self.raise_on_errors(response_json)
+            except ShopifyThrottledError:
+                throttle_status = cost.get("throttleStatus") or {}
+                missing_points = float(cost.get("requestedQueryCost") or reserved_cost) - float(
+                    throttle_status.get("currentlyAvailable") or 0
+                )
+                restore_rate = float(throttle_status.get("restoreRate") or DEFAULT_RESTORE_RATE)
+                self.wait_after_throttle(min(max(missing_points / restore_rate, 2**attempt), MAX_RETRY_DELAY))
+                continue
+            return response
+
+        raise RuntimeError(f"Failed after {MAX_RETRIES} attempts")
+
+    def wait_after_throttle(self, sleep_time: float) -> None:
+        _logger.info("Throttled by Shopify. Retrying in %.2f seconds", sleep_time)
+        self.cost_budget.record_throttle(sleep_time)
+        time.sleep(sleep_time)
+
+    @staticmethod
+    def raise_on_errors(response_json: dict[str, Any]) -> None:
+        for error_data in response_json.get("errors") or []:
+            if not isinstance(error_data, dict):
+                continue
+            error_code = error_data.get("extensions", {}).get("code")
+            error_message = error_data.get("message", "Unknown error")
+            if error_code == "THROTTLED":
+                _logger.debug("Throttled by Shopify: %s", error_message)
+                raise ShopifyThrottledError("Throttled by Shopify")
+            _logger.error("Error from Shopify: %s", error_message)
+            raise Exception("Error from Shopify")
+
+
+class ShopifyRateBudget(models.Model):
+    _name = "shopify.rate.budget"
+    _description = "Shopify API Cost Budget"
+    _sql_constraints = [
+        ("name_uniq", "unique (name)", "Shopify API cost budget already exists !"),
+    ]
+
+    name = fields.Char(required=True, index=True)
+    available = fields.Float(readonly=True)
+    maximum_available = fields.Float(readonly=True)
+    restore_rate = fields.Float(readonly=True)
+    last_refill_at = fields.Datetime(readonly=True)
+    request_count = fields.Integer(readonly=True)
+    throttle_count = fields.Integer(readonly=True)
+    sleep_seconds = fields.Float(readonly=True)
+
+    _cost_budgets: dict[tuple[str, str], ShopifyCostBudget] = {}
+    _cost_budgets_lock = threading.Lock()
+
+    @api.model
+    def get_cost_budget(self) -> ShopifyCostBudget:
+        shop_url = self.env["ir.config_parameter"].sudo().get_param("shopify.shop_url") or "default"
+        key = (self.env.cr.dbname, shop_url)
+        with self._cost_budgets_lock:
+            if key not in self._cost_budgets:
+                self._cost_budgets[key] = ShopifyCostBudget(*key)
+            return self._cost_budgets[key]
+
+    @api.model
+    def get_metrics(self) -> dict[str, dict[str, float]]:
+        return {
+            budget.name: {
+                "requests": budget.request_count,
+                "throttled": budget.throttle_count,
+                "sleep_seconds": budget.sleep_seconds,
+                "available": budget.available,
+            }
+            for budget in self.search([])
+        }
@@ -1,13 +1,17 @@
 # type: ignore
 import base64
+import hashlib
 import json
 import logging
 import re
+import threading
 import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Generator, Self
-from urllib.error import HTTPError
+from typing import Any, ContextManager, Generator, Iterable, Self
+from urllib.parse import urlparse
 from zoneinfo import ZoneInfo
 
 import odoo
@@ -15,90 +19,171 @@ import requests
 import shopify
 from dateutil.parser import parse
 from odoo import api, fields, models
+from odoo.tools import SQL, split_every
+from psycopg2.errors import UniqueViolation
 from requests.exceptions import RequestException
 
-shopify_original_execute_function = shopify.GraphQL.execute
+from ..utils.log_buffer import LogBuffer, RingBufferLogHandler
+from .shopify_rate_limiter import RateLimitedGraphQL, ShopifyCostBudget
+from .shopify_sync_job import ShopifyJobPostponed
+
 MAX_RETRIES = 5
-MIN_SHOPIFY_REMAINING_API_POINTS = 500
 MIN_RETRY_DELAY = 5
 MAX_RETRY_DELAY = 60
+IMAGE_DOWNLOAD_WORKERS = 8
+IMAGE_DOWNLOADS_PER_HOST = 4
 _logger = logging.getLogger(__name__)
 
 
-class MemoryHandler(logging.Handler):
-    def __init__(self) -> None:
-        super().__init__()
-        self.logs: list[str] = []
+memory_handler = RingBufferLogHandler()
+logging.getLogger().addHandler(memory_handler)
 
-    def emit(self, record: logging.LogRecord) -> None:
-        self.logs.append(self.format(record))
 
+UTC = ZoneInfo("UTC")
 
-memory_handler = MemoryHandler()
-logging.getLogger().addHandler(memory_handler)
 
+class ConcurrentImageDownloader:
+    """Download images on a bounded thread pool, limiting concurrent requests per host."""
 
-def apply_rate_limit_patch_to_shopify_execute() -> None:
-    class ThrottledError(Exception):
-        pass
+    def __init__(self, max_workers: int = IMAGE_DOWNLOAD_WORKERS, max_per_host: int = IMAGE_DOWNLOADS_PER_HOST) -> None:
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.host_semaphores: dict[str, threading.Semaphore] = {}
+        self.lock = threading.Lock()
+        self.thread_local = threading.local()
 
-    def parse_and_raise_error(error_data: dict[str, Any]) -> None:
-        error_code = error_data.get("extensions", {}).get("code")
-        error_message = error_data.get("message", "Unknown error")
-        if error_code == "THROTTLED":
-            _logger.debug("Throttled by Shopify: %s", error_message)
-            raise ThrottledError("Throttled by Shopify")
-        else:
-            _logger.error("Error from Shopify: %s", error_message)
-            raise Exception("Error from Shopify")
-
-    def delay_if_near_rate_limit(response_json: dict[str, Any]) -> None:
-        throttle_status = response_json.get("extensions", {}).get("cost", {}).get("throttleStatus", {})
-        currently_available = throttle_status.get("currentlyAvailable")
-        restore_rate = throttle_status.get("restoreRate")
-
-        if currently_available < MIN_SHOPIFY_REMAINING_API_POINTS:
-            sleep_time = (MIN_SHOPIFY_REMAINING_API_POINTS - currently_available) / restore_rate
-            time.sleep(sleep_time)
-
-    def handle_and_retry_on_error(error: HTTPError, attempt: int) -> None:
-        if isinstance(error, ThrottledError):
-            retry_after = min(2**attempt, MAX_RETRY_DELAY)
-        elif isinstance(error, HTTPError):
-            retry_after = max(
-                float(error.headers.get("Retry-After", 4)),
-                min(attempt * 2, MAX_RETRY_DELAY),
-            )
-        else:
-            raise RuntimeError(f"Unexpected error: {error}")
+    def get_session(self) -> requests.Session:
+        # requests.Session is not thread safe, so every pool thread keeps its own
+        if not hasattr(self.thread_local, "session"):
+            self.thread_local.session = requests.Session()
+        return self.thread_local.session
 
-        _logger.debug("Exceeded Shopify API limit. Retrying in %s seconds", retry_after)
-        time.sleep(retry_after)
+    def get_host_semaphore(self, url: str) -> threading.Semaphore:
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.host_semaphores:
+                self.host_semaphores[host] = threading.Semaphore(self.max_per_host)
+            return self.host_semaphores[host]
 
-    def rate_limited_execute(self, *args, **kwargs) -> str:
+    def download(self, url: str) -> bytes | None:
         for attempt in range(MAX_RETRIES):
             try:
-                response = shopify_original_execute_function(self, *args, **kwargs)
-                response_json = json.loads(response)
+                with self.get_host_semaphore(url):
+                    response = self.get_session().get(url, timeout=10)
+                    response.raise_for_status()
+                return response.content
+            except RequestException as error:
+                _logger.warning(
+                    "Failed to fetch image from Shopify. Attempt %s/%s. Reason: %s",
+                    attempt + 1,
+                    MAX_RETRIES,
+                    error,
+                )
+                if attempt + 1 < MAX_RETRIES:
+                    time.sleep(min(MIN_RETRY_DELAY * 2**attempt, MAX_RETRY_DELAY))
 
-                if "errors" in response_json:
-                    for error in response_json.get("errors", []):
-                        parse_and_raise_error(error)
+        _logger.error("Failed to fetch image from Shopify after %s attempts: %s", MAX_RETRIES, url)
+        return None
 
-                delay_if_near_rate_limit(response_json)
+    def download_all(self, urls: Iterable[str]) -> dict[str, bytes | None]:
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        if not unique_urls:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique_urls))) as executor:
+            return dict(zip(unique_urls, executor.map(self.download, unique_urls)))
 
-                return response
 
-            except HTTPError as error:
-                handle_and_retry_on_error(error, attempt)
-        raise RuntimeError(f"Failed after {MAX_RETRIES} attempts")
+class ShopifyProductIdScan:
+    """Collect the IDs of in-stock Shopify products created before a date, on a thread of its own.
 
-    shopify.GraphQL.execute = rate_limited_execute
+    It is given plain settings and builds its own client, so it shares no environment, cursor or client with the
+    thread that started it. Its logs are captured separately and handed back for that thread's capture.
+    """
 
+    def __init__(
+        self,
+        endpoint: str,
+        headers: dict[str, str],
+        cost_budget: ShopifyCostBudget,
+        graphql_document: str,
+        page_size: int,
+    ) -> None:
+        self.endpoint = endpoint
+        self.headers = headers
+        self.cost_budget = cost_budget
+        self.graphql_document = graphql_document
+        self.page_size = page_size
+
+    def run(self, date_filter_iso: str) -> tuple[array, LogBuffer]:
+        with memory_handler.capture() as log_buffer:
+            _logger.debug("Fetching all products created before %s", date_filter_iso)
+            graphql_client = RateLimitedGraphQL(self.cost_budget, self.endpoint, self.headers)
+            product_ids, cursor = array("q"), None
+            while True:
+                result = json.loads(
+                    graphql_client.execute(
+                        query=self.graphql_document,
+                        variables={
+                            "query": f"inventory_total:>0 created_at:<{date_filter_iso}",
+                            "cursor": cursor,
+                            "limit": self.page_size,
+                        },
+                        operation_name="GetProductIds",
+                    )
+                )
+                if result.get("errors"):
+                    raise ValueError(f"Shopify product ID scan failed: {result['errors']}")
+                product_edges = result.get("data", {}).get("products", {}).get("edges", [])
+                for product_edge in product_edges:
+                    product_id = int(product_edge.get("node", {}).get("id", "0").split("/")[-1])
+                    if product_id:
+                        product_ids.append(product_id)
+                cursor = product_edges[-1].get("cursor") if product_edges else None
+                if not cursor:
+                    break
+        return array("q", sorted(product_ids)), log_buffer
+
+
+class ShopifyImportBatch:
+    """Per-page state shared by the products of one Shopify import page."""
+
+    def __init__(self, odoo_products: "odoo.model.product_product") -> None:
+        self.empty_product = odoo_products.browse()
+        self.products_by_shopify_id: dict[str, "odoo.model.product_product"] = {}
+        self.products_by_sku: dict[str, "odoo.model.product_product"] = {}
+        self.image_urls_by_template_id: dict[int, list[str]] = {}
+        self.quantities_by_product_id: dict[int, float] = {}
+        self.images_by_url: dict[str, bytes | None] = {}
+        for odoo_product in odoo_products:
+            self.add_product(odoo_product)
+
+    def add_product(self, odoo_product: "odoo.model.product_product") -> None:
+        if odoo_product.shopify_product_id:
+            self.products_by_shopify_id.setdefault(odoo_product.shopify_product_id, odoo_product)
+        if odoo_product.default_code:
+            self.products_by_sku.setdefault(odoo_product.default_code, odoo_product)
+
+    def find_product(self, shopify_product_id: int, sku: str) -> "odoo.model.product_product":
+        return (
+            self.products_by_shopify_id.get(str(shopify_product_id))
+            or self.products_by_sku.get(sku)
+            or self.empty_product
+        )
 
-apply_rate_limit_patch_to_shopify_execute()
 
-UTC = ZoneInfo("UTC")
+class ShopifyLookupCache:
+    def __init__(self, env: "odoo.api.Environment") -> None:
+        self.manufacturer_ids = {
+            manufacturer.name: manufacturer.id
+            for manufacturer in env["product.manufacturer"].search_fetch([], ["name"])
+        }
+        self.part_type_ids = {
+            (part_type.name, part_type.ebay_category_id): part_type.id
+            for part_type in env["product.type"].search_fetch([], ["name", "ebay_category_id"])
+        }
+        self.condition_ids = {
+            condition.code: condition.id for condition in env["product.condition"].search_fetch([], ["code"])
+        }
 
 
 def parse_to_utc(date_str: str) -> datetime:
@@ -115,7 +200,21 @@ class ShopifySync(models.AbstractModel):
     _inherit = "notification.manager.mixin"
 
     MAX_SHOPIFY_PRODUCTS_PER_FETCH = 250
+    MAX_SHOPIFY_ORDERS_PER_FETCH = 25
+    MAX_SHOPIFY_LINE_ITEMS_PER_FETCH = 25
+    LOOKUP_CACHE_KEY = "shopify_lookup_cache"
     COMMIT_AFTER = 1000
+    # A chunk only takes the bulk path when most of it changed, so a chunk of a few edits exports one by one
+    EXPORT_CHUNK_SIZE = 1000
+    BULK_EXPORT_THRESHOLD = 500
+    EXPORTABLE_TEMPLATE_DOMAIN = [
+        ("sale_ok", "=", True),
+        ("website_description", "!=", False),
+        ("website_description", "!=", ""),
+    ]
+    BULK_OPERATION_POLL_INTERVAL = 10
+    BULK_OPERATION_TIMEOUT = 60 * 60
+    BULK_OPERATION_LOCK_ID = 7317
     DEFAULT_DATETIME = datetime(2000, 1, 1, tzinfo=UTC)
     ONLINE_STORE_ID = 19453116480
     POINT_OF_SALE_ID = 42683596853
@@ -132,17 +231,51 @@ class ShopifySync(models.AbstractModel):
 
     @api.model
     def sync_with_shopify(self) -> None:
-        try:
-            self.initialize_shopify_session()
-            self.import_from_shopify()
-            self.export_to_shopify()
-        except Exception as error:
-            self.notify_channel_on_error(
-                "Shopify sync failed",
-                str(error),
-                logs=memory_handler.logs,
-            )
-            raise error
+        with self.capture_sync_logs():
+            try:
+                self.initialize_shopify_session()
+                self.import_from_shopify()
+                self.export_to_shopify()
+            except Exception as error:
+                self.notify_channel_on_error(
+                    "Shopify sync failed",
+                    str(error),
+                    logs=memory_handler.logs,
+                )
+                raise error
+
+    def capture_sync_logs(self) -> ContextManager[LogBuffer]:
+        config_parameter = self.env["ir.config_parameter"].sudo()
+        return memory_handler.capture(
+            max_records=int(config_parameter.get_param("shopify.sync_log_max_records", 0)) or None,
+            max_bytes=int(config_parameter.get_param("shopify.sync_log_max_bytes", 0)) or None,
+        )
+
+    @api.model
+    def enqueue_sync_with_shopify(self) -> None:
+        """Queue the import pages and export chunks as jobs for the sync workers instead of running them here."""
+        sync_job_model = self.env["shopify.sync.job"]
+        if not sync_job_model.has_active_jobs(["import_page", "finish_import"]):
+            last_import_time_str, current_import_start_time, _ = self.fetch_import_timestamps()
+            sync_run = self.env["shopify.sync.run"].start_import(last_import_time_str, current_import_start_time)
+            failed_jobs = sync_job_model.search([("sync_run", "=", sync_run.id), ("state", "=", "failed")])
+            if failed_jobs:
+                failed_jobs.write({"state": "pending", "attempts": 0, "available_at": fields.Datetime.now()})
+            else:
+                sync_job_model.enqueue(
+                    "import_page",
+                    {"cursor": sync_run.cursor or None, "page_number": sync_run.page_number + 1},
+                    sync_run,
+                    key=f"import_page:{sync_run.id}:{sync_run.page_number + 1}",
+                )
+                sync_job_model.enqueue("finish_import", {}, sync_run, key=f"finish_import:{sync_run.id}")
+
+        if not sync_job_model.has_active_jobs(["export_chunk"]):
+            for chunk_ids in split_every(self.EXPORT_CHUNK_SIZE, self.fetch_products_to_export_ids()):
+                sync_job_model.enqueue("export_chunk", {"product_ids": list(chunk_ids)})
+
+        self.env.cr.commit()
+        sync_job_model.trigger_workers()
 
     @api.model
     def initialize_shopify_session(self) -> None:
@@ -240,22 +373,59 @@ class ShopifySync(models.AbstractModel):
         bin_location = sku_bin[1] if len(sku_bin) > 1 else ""
         return sku, bin_location
 
-    def import_or_update_shopify_product(self, shopify_product: dict, last_import_time: datetime) -> str:
-        shopify_updated_at = parse_to_utc(shopify_product.get("updatedAt", ""))
-        shopify_sku, _ = self.extract_sku_bin_from_shopify_product(shopify_product)
+    def build_import_batch(self, shopify_products: list[dict[str, Any]]) -> ShopifyImportBatch:
+        shopify_product_ids, skus = set(), set()
+        for shopify_product in shopify_products:
+            shopify_product_ids.add(str(self.extract_id_from_gid(shopify_product["id"])))
+            sku, _ = self.extract_sku_bin_from_shopify_product(shopify_product)
+            if sku:
+                skus.add(sku)
 
-        odoo_product_product = self.env["product.product"].search(
+        odoo_products = self.env["product.product"].search(
             [
                 "|",
-                (
-                    "shopify_product_id",
-                    "=",
-                    self.extract_id_from_gid(shopify_product["id"]),
-                ),
-                ("default_code", "=", shopify_sku),
-            ],
-            limit=1,
+                ("shopify_product_id", "in", list(shopify_product_ids)),
+                ("default_code", "in", list(skus)),
+            ]
         )
+        return ShopifyImportBatch(odoo_products)
+
+    def prepare_import_page(
+        self, shopify_products: list[dict[str, Any]], last_import_time: datetime
+    ) -> ShopifyImportBatch:
+        """Look up the page's products and download the images they will need, before anything is written."""
+        import_batch = self.build_import_batch(shopify_products)
+        image_urls = []
+        for shopify_product in shopify_products:
+            shopify_sku, _ = self.extract_sku_bin_from_shopify_product(shopify_product)
+            odoo_product = import_batch.find_product(self.extract_id_from_gid(shopify_product["id"]), shopify_sku)
+            if odoo_product:
+                shopify_updated_at = parse_to_utc(shopify_product.get("updatedAt", ""))
+                latest_write_date = self.determine_latest_product_modification_time(odoo_product, last_import_time)
+                if shopify_updated_at <= latest_write_date:
+                    continue
+                if odoo_product.product_tmpl_id.with_context(bin_size=True).image_1920:
+                    continue
+            image_urls += self.get_shopify_image_urls(shopify_product)
+
+        # The network time is spent here, while the transaction holds no product row locks
+        import_batch.images_by_url = ConcurrentImageDownloader().download_all(image_urls)
+        return import_batch
+
+    @staticmethod
+    def get_shopify_image_urls(shopify_product: dict[str, Any]) -> list[str]:
+        shopify_image_edges = shopify_product.get("images", {}).get("edges", [])
+        return [shopify_image_edge.get("node", {}).get("url", "") for shopify_image_edge in shopify_image_edges]
+
+    def import_or_update_shopify_product(
+        self, shopify_product: dict, last_import_time: datetime, import_batch: ShopifyImportBatch | None = None
+    ) -> str:
+        shopify_updated_at = parse_to_utc(shopify_product.get("updatedAt", ""))
+        shopify_sku, _ = self.extract_sku_bin_from_shopify_product(shopify_product)
+
+        if import_batch is None:
+            import_batch = self.build_import_batch([shopify_product])
+        odoo_product_product = import_batch.find_product(self.extract_id_from_gid(shopify_product["id"]), shopify_sku)
         status = "unchanged"
         try:
             if odoo_product_product:
@@ -263,9 +433,11 @@ class ShopifySync(models.AbstractModel):
                     odoo_product_product, last_import_time
                 )
                 if shopify_updated_at > latest_write_date:
-                    status = self.create_or_update_odoo_product(shopify_product, existing_product=odoo_product_product)
+                    status = self.create_or_update_odoo_product(
+                        shopify_product, existing_product=odoo_product_product, import_batch=import_batch
+                    )
             elif not odoo_product_product:
-                status = self.create_or_update_odoo_product(shopify_product)
+                status = self.create_or_update_odoo_product(shopify_product, import_batch=import_batch)
         except ValueError as error:
             self.notify_channel_on_error(
                 "Import from Shopify failed",
@@ -305,42 +477,40 @@ class ShopifySync(models.AbstractModel):
         ]
         return max(filter(None, dates))
 
-    def finalize_import_and_commit_changes(self, current_import_start_time: datetime) -> None:
+    def finalize_import_and_commit_changes(self, current_import_start_time: datetime, sync_run=None) -> None:
         # This function finalizes the import process Added commits to ensure that the import is not rolled back if export fails
         self.env.cr.commit()
         last_import_time = current_import_start_time.isoformat(timespec="seconds").replace("+00:00", "Z")
         self.env["ir.config_parameter"].sudo().set_param("shopify.last_import_time", last_import_time)
+        if sync_run:
+            sync_run.finish()
         self.env.cr.commit()
 
     @api.model
     def import_from_shopify(self) -> None:
         _logger.debug("Starting import from Shopify.")
 
-        last_import_time_str, current_import_start_time, last_import_time = self.fetch_import_timestamps()
+        last_import_time_str, current_import_start_time, _ = self.fetch_import_timestamps()
+        # Resumes an import that did not finish from its last checkpoint instead of starting over
+        sync_run = self.env["shopify.sync.run"].start_import(last_import_time_str, current_import_start_time)
+        last_import_time_str = sync_run.last_import_time
+        last_import_time = parse_to_utc(last_import_time_str)
+        current_import_start_time = sync_run.start_time.replace(tzinfo=UTC)
         graphql_client, graphql_document, _, _ = self.setup_sync_environment()
+        self.warm_lookup_cache()
 
-        updated_count, total_count, cursor, has_more_data = 0, 0, None, True
+        updated_count, total_count = sync_run.updated_count, sync_run.total_count
+        page_count, cursor, has_more_data = sync_run.page_number, sync_run.cursor or None, True
         while has_more_data:
             shopify_products = self.fetch_shopify_product_edges(
                 cursor, last_import_time_str, graphql_client, graphql_document
             )
-
-            for shopify_product_node in shopify_products:
-                shopify_product = shopify_product_node.get("node", {})
-                total_count += 1
-                status = self.import_or_update_shopify_product(shopify_product, last_import_time)
-                if status in ["created", "updated"]:
-                    updated_count += 1
-                _logger.debug(
-                    "Imported %s products from Shopify so far. Last product ID: %s has status: %s and was updated at %s start time: %s",
-                    total_count,
-                    self.extract_id_from_gid(shopify_product["id"]),
-                    shopify_product.get("status"),
-                    shopify_product.get("updatedAt"),
-                    last_import_time_str,
-                )
-                if total_count % self.COMMIT_AFTER == 0:
-                    self.env.cr.commit()
+            page_count += 1
+            page_total_count, page_updated_count = self.import_shopify_product_page(
+                shopify_products, last_import_time, last_import_time_str, page_count
+            )
+            total_count += page_total_count
+            updated_count += page_updated_count
 
             if shopify_products:
                 cursor = shopify_products[-1].get("cursor")
@@ -348,9 +518,172 @@ class ShopifySync(models.AbstractModel):
             else:
                 has_more_data = False
 
-        self.finalize_import_and_commit_changes(current_import_start_time)
+            # Committed every page, so the next page's image downloads run with no product writes open
+            sync_run.checkpoint(cursor, page_count, total_count, updated_count)
+            self.env.cr.commit()
+
+        sync_run.checkpoint(cursor, page_count, total_count, updated_count)
+        self.finalize_import_and_commit_changes(current_import_start_time, sync_run)
+        message = f"Shopify imported {updated_count} out of {total_count} items successfully at {self.now_in_localtime_formatted()}"
+        self.notify_channel("Shopify sync", message, "shopify_sync")
+
+    def import_shopify_product_page(
+        self,
+        shopify_products: list[dict[str, Any]],
+        last_import_time: datetime,
+        last_import_time_str: str,
+        page_number: int,
+        import_batch: ShopifyImportBatch | None = None,
+    ) -> tuple[int, int]:
+        if import_batch is None:
+            import_batch = self.prepare_import_page(
+                [edge.get("node", {}) for edge in shopify_products], last_import_time
+            )
+        page_query_count_start = self.env.cr.sql_log_count
+
+        total_count, updated_count = 0, 0
+        for shopify_product_node in shopify_products:
+            shopify_product = shopify_product_node.get("node", {})
+            total_count += 1
+            status = self.import_or_update_shopify_product(shopify_product, last_import_time, import_batch)
+            if status in ["created", "updated"]:
+                updated_count += 1
+            _logger.debug(
+                "Imported %s products from Shopify page %s so far. Last product ID: %s has status: %s and was updated at %s start time: %s",
+                total_count,
+                page_number,
+                self.extract_id_from_gid(shopify_product["id"]),
+                shopify_product.get("status"),
+                shopify_product.get("updatedAt"),
+                last_import_time_str,
+            )
+
+        self.store_product_images_from_shopify(import_batch.image_urls_by_template_id, import_batch.images_by_url)
+        self.env["product.product"].update_quantities(import_batch.quantities_by_product_id)
+        # A batch can be reused across pages, each page stores only what it collected itself
+        import_batch.image_urls_by_template_id.clear()
+        import_batch.quantities_by_product_id.clear()
+        _logger.info(
+            "Shopify import page %s: %s products, %s queries",
+            page_number,
+            len(shopify_products),
+            self.env.cr.sql_log_count - page_query_count_start,
+        )
+        return total_count, updated_count
+
+    def run_import_page_job(self, sync_job: "odoo.model.shopify_sync_job") -> dict[str, Any]:
+        sync_run = sync_job.sync_run
+        page_number = sync_job.payload["page_number"]
+        last_import_time_str = sync_run.last_import_time
+        graphql_client, graphql_document, _, _ = self.setup_sync_environment()
+        self.warm_lookup_cache()
+        shopify_products = self.fetch_shopify_product_edges(
+            sync_job.payload.get("cursor"), last_import_time_str, graphql_client, graphql_document
+        )
+
+        cursor = shopify_products[-1].get("cursor") if shopify_products else None
+        if cursor:
+            # Queued before this page is processed so the next page is fetched while this one imports
+            self.env["shopify.sync.job"].enqueue_in_new_transaction(
+                "import_page",
+                {"cursor": cursor, "page_number": page_number + 1},
+                sync_run,
+                key=f"import_page:{sync_run.id}:{page_number + 1}",
+            )
+
+        total_count, updated_count = self.import_shopify_product_page(
+            shopify_products, parse_to_utc(last_import_time_str), last_import_time_str, page_number
+        )
+        return {"cursor": cursor, "total_count": total_count, "updated_count": updated_count}
+
+    def run_finish_import_job(self, sync_job: "odoo.model.shopify_sync_job") -> dict[str, Any]:
+        sync_run = sync_job.sync_run
+        page_jobs = self.env["shopify.sync.job"].search(
+            [("sync_run", "=", sync_run.id), ("job_type", "=", "import_page")], order="id"
+        )
+        if any(page_job.state in ["pending", "running"] for page_job in page_jobs):
+            raise ShopifyJobPostponed(30)
+        failed_page_jobs = page_jobs.filtered(lambda page_job: page_job.state == "failed")
+        if failed_page_jobs:
+            raise ValueError(f"{len(failed_page_jobs)} Shopify import pages failed")
+
+        done_page_jobs = page_jobs.filtered(lambda page_job: page_job.state == "done")
+        total_count = sync_run.total_count + sum(
+            (page_job.result or {}).get("total_count", 0) for page_job in done_page_jobs
+        )
+        updated_count = sync_run.updated_count + sum(
+            (page_job.result or {}).get("updated_count", 0) for page_job in done_page_jobs
+        )
+        last_page_job = done_page_jobs[-1:] or page_jobs[-1:]
+        sync_run.checkpoint(
+            (last_page_job.payload or {}).get("cursor"),
+            (last_page_job.payload or {}).get("page_number", sync_run.page_number),
+            total_count,
+            updated_count,
+        )
+
+        last_import_time = sync_run.start_time.replace(tzinfo=UTC).isoformat(timespec="seconds").replace("+00:00", "Z")
+        self.env["ir.config_parameter"].sudo().set_param("shopify.last_import_time", last_import_time)
+        sync_run.finish()
         message = f"Shopify imported {updated_count} out of {total_count} items successfully at {self.now_in_localtime_formatted()}"
         self.notify_channel("Shopify sync", message, "shopify_sync")
+        return {"total_count": total_count, "updated_count": updated_count}
+
+    def fetch_product_ids_for_inventory_items(
+        self, inventory_item_ids: Iterable[str], graphql_client: shopify.GraphQL, graphql_document: str
+    ) -> set[str]:
+        return set(
+            self.fetch_product_ids_by_inventory_item(inventory_item_ids, graphql_client, graphql_document).values()
+        )
+
+    def fetch_product_ids_by_inventory_item(
+        self, inventory_item_ids: Iterable[str], graphql_client: shopify.GraphQL, graphql_document: str
+    ) -> dict[str, str]:
+        product_ids = {}
+        for chunk_ids in split_every(self.MAX_SHOPIFY_PRODUCTS_PER_FETCH, sorted(inventory_item_ids)):
+            result = graphql_client.execute(
+                query=graphql_document,
+                variables={"ids": [self.convert_to_shopify_gid("InventoryItem", item_id) for item_id in chunk_ids]},
+                operation_name="GetInventoryItemProductIds",
+            )
+            for inventory_item in self.parse_and_validate_shopify_response(result).get("data", {}).get("nodes", []):
+                product = ((inventory_item or {}).get("variant") or {}).get("product")
+                if product:
+                    inventory_item_id = str(self.extract_id_from_gid(inventory_item["id"]))
+                    product_ids[inventory_item_id] = str(self.extract_id_from_gid(product["id"]))
+        return product_ids
+
+    def import_shopify_products_by_ids(
+        self, shopify_product_ids: Iterable[str], graphql_client: shopify.GraphQL, graphql_document: str
+    ) -> tuple[int, int]:
+        last_import_time_str = str(self.env["ir.config_parameter"].sudo().get_param("shopify.last_import_time"))
+        last_import_time = parse_to_utc(last_import_time_str)
+        self.warm_lookup_cache()
+
+        # Everything is fetched and downloaded before the first write
+        shopify_products = self.fetch_shopify_products_by_ids(shopify_product_ids, graphql_client, graphql_document)
+        import_batch = self.prepare_import_page(shopify_products, last_import_time)
+        return self.import_shopify_product_page(
+            [{"node": shopify_product} for shopify_product in shopify_products],
+            last_import_time,
+            last_import_time_str,
+            1,
+            import_batch,
+        )
+
+    def fetch_shopify_products_by_ids(
+        self, shopify_product_ids: Iterable[str], graphql_client: shopify.GraphQL, graphql_document: str
+    ) -> list[dict[str, Any]]:
+        shopify_products = []
+        for chunk_ids in split_every(self.MAX_SHOPIFY_PRODUCTS_PER_FETCH, sorted(shopify_product_ids)):
+            result = graphql_client.execute(
+                query=graphql_document,
+                variables={"ids": [self.convert_to_shopify_gid("Product", product_id) for product_id in chunk_ids]},
+                operation_name="GetProductsByIds",
+            )
+            shopify_product_nodes = self.parse_and_validate_shopify_response(result).get("data", {}).get("nodes", [])
+            shopify_products += [shopify_product for shopify_product in shopify_product_nodes if shopify_product]
+        return shopify_products
 
     def parse_shopify_product_data(self, product) -> dict[str, Any]:
         product_variant = product.get("variants", {}).get("edges", [])[0].get("node", {})
@@ -425,32 +758,42 @@ class ShopifySync(models.AbstractModel):
                 if part_type:
                     odoo_product_data["part_type"] = part_type.id
 
-        if shopify_condition and (
-            odoo_condition := self.env["product.condition"].search([("code", "=", shopify_condition)], limit=1)
-        ):
-            odoo_product_data["condition"] = odoo_condition.id
+        if shopify_condition and (odoo_condition_id := self.find_condition_id(shopify_condition)):
+            odoo_product_data["condition"] = odoo_condition_id
         elif odoo_product:
             odoo_product_data["condition"] = odoo_product.condition.code
         return odoo_product_data
 
-    def import_product_images_from_shopify(self, shopify_product, odoo_product) -> None:
-        odoo_product_template = self.env["product.template"].search(
-            [("id", "=", odoo_product.product_tmpl_id.id)], limit=1
-        )
+    def import_product_images_from_shopify(
+        self, shopify_product, odoo_product, import_batch: ShopifyImportBatch | None = None
+    ) -> None:
+        odoo_product_template = odoo_product.product_tmpl_id
+        if odoo_product_template.image_1920:
+            return
 
-        if not odoo_product_template.image_1920:
-            shopify_image_edges = shopify_product.get("images", {}).get("edges", [])
-            for index, shopify_image_edge in enumerate(shopify_image_edges):
-                shopify_image = shopify_image_edge.get("node", {})
-                self.fetch_and_store_product_image(index, shopify_image.get("url", ""), odoo_product_template)
+        image_urls = self.get_shopify_image_urls(shopify_product)
+        if import_batch is None:
+            self.store_product_images_from_shopify({odoo_product_template.id: image_urls})
+        else:
+            # Downloaded for the whole page in prepare_import_page and stored in import_shopify_product_page
+            import_batch.image_urls_by_template_id[odoo_product_template.id] = image_urls
 
     @staticmethod
-    def update_product_stock_in_odoo(shopify_quantity: int, odoo_product) -> None:
-        if shopify_quantity is not None:
+    def update_product_stock_in_odoo(
+        shopify_quantity: int, odoo_product, import_batch: ShopifyImportBatch | None = None
+    ) -> None:
+        if shopify_quantity is None:
+            return
+        if import_batch is None:
             odoo_product.update_quantity(shopify_quantity)
+        else:
+            # Applied for the whole page at once in import_shopify_product_page
+            import_batch.quantities_by_product_id[odoo_product.id] = shopify_quantity
 
     @api.model
-    def create_or_update_odoo_product(self, shopify_product, existing_product=None) -> str:
+    def create_or_update_odoo_product(
+        self, shopify_product, existing_product=None, import_batch: ShopifyImportBatch | None = None
+    ) -> str:
 
         shopify_product_data = self.parse_shopify_product_data(shopify_product)
 
@@ -471,18 +814,44 @@ class ShopifySync(models.AbstractModel):
         else:
             existing_product = self.env["product.product"].create(odoo_product_data)
             status = "created"
+            if import_batch:
+                import_batch.add_product(existing_product)
 
-        self.import_product_images_from_shopify(shopify_product, existing_product)
-        self.update_product_stock_in_odoo(shopify_product_data["qty_available"], existing_product)
+        self.import_product_images_from_shopify(shopify_product, existing_product, import_batch)
+        self.update_product_stock_in_odoo(shopify_product_data["qty_available"], existing_product, import_batch)
         return status
 
+    @api.model
+    def get_lookup_cache(self) -> ShopifyLookupCache:
+        lookup_cache = self.env.cr.cache.get(self.LOOKUP_CACHE_KEY)
+        return lookup_cache if lookup_cache is not None else self.warm_lookup_cache()
+
+    @api.model
+    def warm_lookup_cache(self) -> ShopifyLookupCache:
+        lookup_cache = ShopifyLookupCache(self.env)
+        self.env.cr.cache[self.LOOKUP_CACHE_KEY] = lookup_cache
+        return lookup_cache
+
+    @api.model
+    def clear_lookup_cache(self) -> None:
+        self.env.cr.cache.pop(self.LOOKUP_CACHE_KEY, None)
+
     @api.model
     def find_or_add_manufacturer(self, manufacturer_name: str):
-        manufacturer = self.env["product.manufacturer"].search([("name", "=", manufacturer_name)], limit=1)
+        lookup_cache = self.get_lookup_cache()
+        manufacturer_model = self.env["product.manufacturer"]
+        if manufacturer_name in lookup_cache.manufacturer_ids:
+            return manufacturer_model.browse(lookup_cache.manufacturer_ids[manufacturer_name])
 
+        manufacturer = manufacturer_model.search([("name", "=", manufacturer_name)], limit=1)
         if not manufacturer:
-            manufacturer = self.env["product.manufacturer"].create({"name": manufacturer_name})
+            manufacturer = self.create_unique(
+                manufacturer_model,
+                {"name": manufacturer_name},
+                [("name_normalized", "=", manufacturer_model.normalize_name(manufacturer_name))],
+            )
 
+        lookup_cache.manufacturer_ids[manufacturer_name] = manufacturer.id
         return manufacturer
 
     @api.model
@@ -492,7 +861,13 @@ class ShopifySync(models.AbstractModel):
                 return None
         except ValueError:
             return None
-        part_type = self.env["product.type"].search(
+        lookup_cache = self.get_lookup_cache()
+        part_type_model = self.env["product.type"]
+        lookup_key = (part_type_name, int(ebay_category_id))
+        if lookup_key in lookup_cache.part_type_ids:
+            return part_type_model.browse(lookup_cache.part_type_ids[lookup_key])
+
+        part_type = part_type_model.search(
             [
                 ("name", "=", part_type_name),
                 ("ebay_category_id", "=", ebay_category_id),
@@ -501,43 +876,75 @@ class ShopifySync(models.AbstractModel):
         )
 
         if not part_type:
-            part_type = self.env["product.type"].create({"name": part_type_name, "ebay_category_id": ebay_category_id})
+            part_type = self.create_unique(
+                part_type_model,
+                {"name": part_type_name, "ebay_category_id": ebay_category_id},
+                [("name", "=", part_type_name)],
+            )
 
+        lookup_cache.part_type_ids[lookup_key] = part_type.id
         return part_type
 
+    @api.model
+    def create_unique(
+        self, model: models.BaseModel, vals: dict[str, Any], unique_domain: list[tuple[str, str, Any]]
+    ) -> models.BaseModel:
+        """Create a record whose unique constraint a parallel import job may be filling at the same time.
+
+        When the other record is not visible yet, a sync job is postponed and any other caller gets the violation.
+        """
+        try:
+            with self.env.cr.savepoint():
+                return model.create(vals)
+        except UniqueViolation:
+            existing_record = model.search(unique_domain, limit=1)
+            if existing_record:
+                return existing_record
+            if not self.env.context.get("shopify_sync_job_id"):
+                raise
+            # Committed by another job after this transaction's snapshot, so only a later attempt can read it
+            _logger.info("%s %s was created by another Shopify import job, postponing", model._name, vals)
+            raise ShopifyJobPostponed(30)
+
+    @api.model
+    def find_condition_id(self, condition_code: str) -> int | None:
+        lookup_cache = self.get_lookup_cache()
+        if condition_code not in lookup_cache.condition_ids:
+            condition = self.env["product.condition"].search([("code", "=", condition_code)], limit=1)
+            if not condition:
+                return None
+            lookup_cache.condition_ids[condition_code] = condition.id
+        return lookup_cache.condition_ids[condition_code]
+
     @api.model
     def update_product_quantity_in_odoo(self, shopify_quantity, odoo_product) -> None:
         if shopify_quantity:
             odoo_product.update_quantity(shopify_quantity)
 
     @api.model
-    def fetch_and_store_product_image(self, index, shopify_image_url, odoo_product_template) -> None:
-        retries = 0
-        while retries < MAX_RETRIES:
-            try:
-                response = self.session.get(shopify_image_url, timeout=10)
-                response.raise_for_status()
-
-                image_base64 = base64.b64encode(response.content)
-                self.env["product.image"].create(
-                    {
-                        "product_tmpl_id": odoo_product_template.id,
-                        "name": index,
-                        "image_1920": image_base64,
-                    }
-                )
-                return
-            except RequestException as error:
-                _logger.warning(
-                    "Failed to fetch image from Shopify. Attempt %s/%s. Reason: %s",
-                    retries + 1,
-                    MAX_RETRIES,
-                    error,
-                )
-                retries += 1
-                time.sleep(MIN_RETRY_DELAY * (2**retries))
-
-        _logger.error("Failed to fetch image from Shopify after %s attempts.", MAX_RETRIES)
+    def store_product_images_from_shopify(
+        self, image_urls_by_template_id: dict[int, list[str]], images_by_url: dict[str, bytes | None] | None = None
+    ) -> None:
+        image_urls = [url for urls in image_urls_by_template_id.values() for url in urls]
+        if not image_urls:
+            return
+
+        images_by_url = dict(images_by_url or {})
+        missing_urls = [url for url in image_urls if url not in images_by_url]
+        if missing_urls:
+            images_by_url.update(ConcurrentImageDownloader().download_all(missing_urls))
+        image_vals_list = [
+            {
+                "product_tmpl_id": template_id,
+                "name": index,
+                "image_1920": base64.b64encode(images_by_url[url]),
+            }
+            for template_id, urls in image_urls_by_template_id.items()
+            for index, url in enumerate(urls)
+            if images_by_url.get(url)
+        ]
+        if image_vals_list:
+            self.env["product.image"].create(image_vals_list)
 
     @staticmethod
     def convert_to_shopify_gid(resource_type, numeric_id) -> str:
@@ -554,14 +961,15 @@ class ShopifySync(models.AbstractModel):
     def prepare_odoo_product_image_data_for_export(base_url, odoo_product) -> list[dict[str, str]]:
         """Construct image data for each Odoo product."""
         media_list = []
-        for odoo_image in sorted(
-            odoo_product.product_tmpl_id.product_template_image_ids,
-            key=lambda image: image.name,
-        ):
+        odoo_images = odoo_product.product_tmpl_id.product_template_image_ids
+        # Prefer the WebP derivative, which is smaller for Shopify to fetch and cached by its content hash
+        derivative_urls = odoo_product.env["image.derivative"].get_urls(odoo_images, 1920, "webp")
+        for odoo_image in sorted(odoo_images, key=lambda image: image.name):
+            image_path = derivative_urls.get(odoo_image.id) or f"/web/image/product.image/{odoo_image.id}/image_1920"
             image_data = {
                 "mediaContentType": "IMAGE",
                 "alt": odoo_product.name,
-                "originalSource": base_url + "/web/image/product.image/" + str(odoo_image.id) + "/image_1920",
+                "originalSource": base_url + image_path,
             }
             media_list.append(image_data)
         return media_list
@@ -596,7 +1004,11 @@ class ShopifySync(models.AbstractModel):
 
     def setup_sync_environment(self) -> tuple[shopify.GraphQL, str, str, str]:
         """Set up and return context objects necessary for Shopify synchronization."""
-        graphql_client = shopify.GraphQL()
+        graphql_client = RateLimitedGraphQL(self.env["shopify.rate.budget"].get_cost_budget())
+        # Lets a local stub server stand in for Shopify
+        graphql_endpoint = self.env["ir.config_parameter"].sudo().get_param("shopify.graphql_endpoint")
+        if graphql_endpoint:
+            graphql_client.endpoint = graphql_endpoint
         graphql_query_path = Path(__file__).parent.parent / "graphql" / "shopify_product.graphql"
         graphql_document = graphql_query_path.read_text()
         shopify_location_gid = self.fetch_first_store_location_id(graphql_client, graphql_document)
@@ -612,191 +1024,491 @@ class ShopifySync(models.AbstractModel):
     def export_to_shopify(self) -> None:
         _logger.debug("Starting export to Shopify...")
 
-        odoo_products = self.env["product.product"].search(
-            [("sale_ok", "=", True), ("website_description", "!=", False), ("website_description", "!=", "")]
+        odoo_product_ids = self.fetch_products_to_export_ids()
+        total_count, skipped_count = 0, 0
+        if odoo_product_ids:
+            graphql_client, graphql_document, shopify_location_gid, base_url = self.setup_sync_environment()
+            for odoo_products in self.iter_products_to_export(odoo_product_ids):
+                exported_count, unchanged_count = self.export_shopify_products(
+                    odoo_products, graphql_client, graphql_document, shopify_location_gid, base_url
+                )
+                total_count += exported_count
+                skipped_count += unchanged_count
+                self.env.cr.commit()
+        message = (
+            f"Shopify exported {total_count} items successfully and skipped {skipped_count} unchanged items "
+            f"at {self.now_in_localtime_formatted()}"
         )
+        self.notify_channel("Shopify sync", message, "shopify_sync")
 
-        odoo_products = odoo_products.filtered(
-            lambda p: p.shopify_next_export is True
-            or (
-                p.write_date > (p.shopify_last_exported or datetime.min)
-                or p.product_tmpl_id.write_date > (p.shopify_last_exported or datetime.min)
+    def export_shopify_products(
+        self, odoo_products, graphql_client, graphql_document, shopify_location_gid, base_url
+    ) -> tuple[int, int]:
+        unchanged_products = self.filter_unchanged_products(odoo_products, shopify_location_gid)
+        if unchanged_products:
+            _logger.debug("Skipping %s products unchanged since their last Shopify export", len(unchanged_products))
+            unchanged_products.write({"shopify_last_exported": fields.Datetime.now(), "shopify_next_export": False})
+        odoo_products -= unchanged_products
+
+        if len(odoo_products) >= self.BULK_EXPORT_THRESHOLD and self.lock_bulk_operations():
+            exported_count = self.bulk_export_to_shopify(
+                odoo_products, graphql_client, graphql_document, shopify_location_gid, base_url
             )
-        )
+            return exported_count, len(unchanged_products)
 
-        graphql_client, graphql_document, shopify_location_gid, base_url = self.setup_sync_environment()
         total_count = 0
         for odoo_product in odoo_products:
-            _logger.debug(f"Starting export of Odoo product ID: {odoo_product.default_code} - {odoo_product.name}")
-            if odoo_product.bin:
-                sku_field = f"{odoo_product.default_code} - {odoo_product.bin}"
-            else:
-                sku_field = odoo_product.default_code
-            variant_data = {
-                "price": odoo_product.list_price,
-                "sku": sku_field,
-                "barcode": odoo_product.mpn or "",
-                "inventoryManagement": "SHOPIFY",
-                "weight": odoo_product.weight,
-                "inventoryItem": {
-                    "cost": odoo_product.standard_price,
-                },
-            }
-            if odoo_product.shopify_variant_id:
-                variant_data["id"] = self.convert_to_shopify_gid("ProductVariant", odoo_product.shopify_variant_id)
+            shopify_product_data, shopify_product = self.export_product_to_shopify(
+                odoo_product, graphql_client, graphql_document, shopify_location_gid, base_url
+            )
+            total_count += 1
+            _logger.debug(
+                "Exported %s of %s products from Shopify so far. Last product ID: %s has status: %s and was updated at %s",
+                total_count,
+                len(odoo_products),
+                shopify_product_data.get("id") or odoo_product.id,
+                shopify_product_data["status"],
+                shopify_product.get("updatedAt"),
+            )
+        return total_count, len(unchanged_products)
+
+    def filter_unchanged_products(self, odoo_products, shopify_location_gid: str) -> "odoo.model.product_product":
+        return odoo_products.filtered(
+            lambda odoo_product: odoo_product.shopify_product_id
+            and odoo_product.shopify_export_fingerprint
+            and not odoo_product.shopify_next_export
+            and odoo_product.shopify_export_fingerprint
+            == self.compute_shopify_export_fingerprint(
+                self.build_shopify_product_input(odoo_product, shopify_location_gid)
+            )
+        )
 
-            if not odoo_product.shopify_product_id:
-                variant_data["inventoryQuantities"] = [
-                    {
-                        "availableQuantity": int(odoo_product.qty_available),
-                        "locationId": shopify_location_gid,
-                    }
-                ]
+    @staticmethod
+    def compute_shopify_export_fingerprint(shopify_product_data: dict[str, Any]) -> str:
+        """Hash only the exported content, so the Shopify IDs filled in after the first export do not change it."""
+        canonical_data = {
+            key: shopify_product_data.get(key) for key in ("title", "bodyHtml", "vendor", "productType", "status")
+        }
+        canonical_data["variants"] = [
+            {key: value for key, value in variant.items() if key not in ("id", "inventoryQuantities")}
+            for variant in shopify_product_data.get("variants", [])
+        ]
+        canonical_data["metafields"] = [
+            metafield.get("value") for metafield in shopify_product_data.get("metafields", [])
+        ]
+        canonical_json = json.dumps(canonical_data, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical_json.encode()).hexdigest()
+
+    def run_export_chunk_job(self, sync_job: "odoo.model.shopify_sync_job") -> dict[str, Any]:
+        odoo_products = self.search_products_to_export(sync_job.payload["product_ids"])
+        total_count, skipped_count = 0, 0
+        if odoo_products:
+            graphql_client, graphql_document, shopify_location_gid, base_url = self.setup_sync_environment()
+            total_count, skipped_count = self.export_shopify_products(
+                odoo_products, graphql_client, graphql_document, shopify_location_gid, base_url
+            )
+        _logger.info(
+            "Shopify export job %s exported %s products and skipped %s unchanged products",
+            sync_job.id,
+            total_count,
+            skipped_count,
+        )
+        return {"total_count": total_count, "skipped_count": skipped_count}
 
-            condition_metafield = {"value": odoo_product.condition.code or ""}
-            if odoo_product.shopify_condition_id:
-                condition_metafield["id"] = self.convert_to_shopify_gid("Metafield", odoo_product.shopify_condition_id)
-            else:
-                condition_metafield.update(
-                    {
-                        "key": "condition",
-                        "type": "single_line_text_field",
-                        "namespace": "custom",
-                    }
-                )
+    def fetch_products_to_export_ids(self) -> list[int]:
+        """Return the IDs of exportable products changed since their last export, computed in the database."""
+        self.env["product.product"].flush_model(
+            ["active", "write_date", "shopify_last_exported", "shopify_next_export"]
+        )
+        self.env["product.template"].flush_model(["write_date", "sale_ok", "website_description"])
+        # The same eligibility as search_products_to_export, or products it skips would be queued on every run
+        exportable_templates = self.env["product.template"]._where_calc(self.EXPORTABLE_TEMPLATE_DOMAIN).subselect()
+        # The first branch's product conditions match product_product_shopify_export_dirty_index
+        # noinspection SqlResolve
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT product.id
+                  FROM product_product product
+                 WHERE product.active
+                   AND (product.shopify_next_export
+                        OR product.shopify_last_exported IS NULL
+                        OR product.write_date > product.shopify_last_exported)
+                   AND product.product_tmpl_id IN (%(exportable_templates)s)
+                 UNION
+                SELECT product.id
+                  FROM product_product product
+                  JOIN product_template template ON template.id = product.product_tmpl_id
+                 WHERE product.active
+                   AND template.write_date > product.shopify_last_exported
+                   AND template.id IN (%(exportable_templates)s)
+                 ORDER BY id
+                """,
+                exportable_templates=exportable_templates,
+            )
+        )
+        return [row[0] for row in self.env.cr.fetchall()]
 
-            ebay_category_id_metafield = {"value": str(odoo_product.part_type.ebay_category_id) or ""}
-            if odoo_product.shopify_ebay_category_id:
-                ebay_category_id_metafield["id"] = self.convert_to_shopify_gid(
-                    "Metafield", odoo_product.shopify_ebay_category_id
-                )
-            else:
-                ebay_category_id_metafield.update(
-                    {
-                        "key": "ebay_category_id",
-                        "type": "number_integer",
-                        "namespace": "custom",
-                    }
-                )
+    def iter_products_to_export(
+        self, odoo_product_ids: list[int]
+    ) -> Generator["odoo.model.product_product", Any, None]:
+        for chunk_ids in split_every(self.COMMIT_AFTER, odoo_product_ids):
+            yield self.search_products_to_export(list(chunk_ids))
 
-            try:
-                shopify_product_data = {
-                    "title": odoo_product.name,
-                    "bodyHtml": odoo_product.website_description,
-                    "vendor": (odoo_product.manufacturer.name if odoo_product.manufacturer else None),
-                    "productType": (odoo_product.part_type.name if odoo_product.part_type else None),
-                    "status": "ACTIVE" if odoo_product.qty_available > 0 else "DRAFT",
-                    "variants": [variant_data],
-                    "metafields": [condition_metafield, ebay_category_id_metafield],
+    def search_products_to_export(self, odoo_product_ids: list[int]) -> "odoo.model.product_product":
+        return self.env["product.product"].search([("id", "in", odoo_product_ids), *self.EXPORTABLE_TEMPLATE_DOMAIN])
+
+    def build_shopify_product_input(self, odoo_product, shopify_location_gid: str) -> dict[str, Any]:
+        if odoo_product.bin:
+            sku_field = f"{odoo_product.default_code} - {odoo_product.bin}"
+        else:
+            sku_field = odoo_product.default_code
+        variant_data = {
+            "price": odoo_product.list_price,
+            "sku": sku_field,
+            "barcode": odoo_product.mpn or "",
+            "inventoryManagement": "SHOPIFY",
+            "weight": odoo_product.weight,
+            "inventoryItem": {
+                "cost": odoo_product.standard_price,
+            },
+        }
+        if odoo_product.shopify_variant_id:
+            variant_data["id"] = self.convert_to_shopify_gid("ProductVariant", odoo_product.shopify_variant_id)
+
+        if not odoo_product.shopify_product_id:
+            variant_data["inventoryQuantities"] = [
+                {
+                    "availableQuantity": int(odoo_product.qty_available),
+                    "locationId": shopify_location_gid,
+                }
+            ]
+
+        condition_metafield = {"value": odoo_product.condition.code or ""}
+        if odoo_product.shopify_condition_id:
+            condition_metafield["id"] = self.convert_to_shopify_gid("Metafield", odoo_product.shopify_condition_id)
+        else:
+            condition_metafield.update(
+                {
+                    "key": "condition",
+                    "type": "single_line_text_field",
+                    "namespace": "custom",
+                }
+            )
+
+        ebay_category_id_metafield = {"value": str(odoo_product.part_type.ebay_category_id) or ""}
+        if odoo_product.shopify_ebay_category_id:
+            ebay_category_id_metafield["id"] = self.convert_to_shopify_gid(
+                "Metafield", odoo_product.shopify_ebay_category_id
+            )
+        else:
+            ebay_category_id_metafield.update(
+                {
+                    "key": "ebay_category_id",
+                    "type": "number_integer",
+                    "namespace": "custom",
                 }
+            )
+
+        shopify_product_data = {
+            "title": odoo_product.name,
+            "bodyHtml": odoo_product.website_description,
+            "vendor": (odoo_product.manufacturer.name if odoo_product.manufacturer else None),
+            "productType": (odoo_product.part_type.name if odoo_product.part_type else None),
+            "status": "ACTIVE" if odoo_product.qty_available > 0 else "DRAFT",
+            "variants": [variant_data],
+            "metafields": [condition_metafield, ebay_category_id_metafield],
+        }
+        if odoo_product.shopify_product_id:
+            shopify_product_data["id"] = self.convert_to_shopify_gid("Product", odoo_product.shopify_product_id)
+        return shopify_product_data
+
+    def build_shopify_publications_input(self, shopify_product_gid: str) -> dict[str, Any]:
+        return {
+            "id": shopify_product_gid,
+            "input": [
+                {"publicationId": self.convert_to_shopify_gid("Publication", self.ONLINE_STORE_ID)},
+                {"publicationId": self.convert_to_shopify_gid("Publication", self.POINT_OF_SALE_ID)},
+                {"publicationId": self.convert_to_shopify_gid("Publication", self.GOOGLE_ID)},
+                {"publicationId": self.convert_to_shopify_gid("Publication", self.SHOP_ID)},
+            ],
+        }
+
+    def store_shopify_export_result(
+        self, odoo_product, shopify_product: dict[str, Any], shopify_product_data: dict[str, Any]
+    ) -> None:
+        shopify_metafields = shopify_product.get("metafields", {}).get("edges", [])
+        shopify_ebay_category_id = ""
+        shopify_condition_id = ""
+        for metafield in shopify_metafields:
+            if metafield.get("node", {}).get("key") == "condition":
+                shopify_condition_id = str(self.extract_id_from_gid(metafield.get("node", {}).get("id")))
+            elif metafield.get("node", {}).get("key") == "ebay_category_id":
+                shopify_ebay_category_id = str(self.extract_id_from_gid(metafield.get("node", {}).get("id")))
+
+        odoo_product.write(
+            {
+                "shopify_last_exported": fields.Datetime.now(),
+                "shopify_product_id": self.extract_id_from_gid(shopify_product.get("id")),
+                "shopify_next_export": False,
+                "shopify_ebay_category_id": shopify_ebay_category_id,
+                "shopify_condition_id": shopify_condition_id,
+                "shopify_export_fingerprint": self.compute_shopify_export_fingerprint(shopify_product_data),
+            }
+        )
+
+    def export_product_to_shopify(
+        self, odoo_product, graphql_client, graphql_document, shopify_location_gid, base_url
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        _logger.debug(f"Starting export of Odoo product ID: {odoo_product.default_code} - {odoo_product.name}")
+        try:
+            shopify_product_data = self.build_shopify_product_input(odoo_product, shopify_location_gid)
 
-                if odoo_product.shopify_product_id:
-                    shopify_product_data["id"] = self.convert_to_shopify_gid("Product", odoo_product.shopify_product_id)
-                    result = graphql_client.execute(
+            if odoo_product.shopify_product_id:
+                result = graphql_client.execute(
+                    query=graphql_document,
+                    variables={"input": shopify_product_data},
+                    operation_name="UpdateProduct",
+                )
+            else:
+                result = graphql_client.execute(
+                    query=graphql_document,
+                    variables={"input": shopify_product_data},
+                    operation_name="CreateProduct",
+                )
+                result_dict = self.parse_and_validate_shopify_response(result)
+                shopify_product_id = result_dict.get("data", {}).get("productCreate", {}).get("product", {}).get("id")
+                images = self.prepare_odoo_product_image_data_for_export(base_url, odoo_product)
+                try:
+                    graphql_client.execute(
                         query=graphql_document,
-                        variables={"input": shopify_product_data},
-                        operation_name="UpdateProduct",
+                        variables={
+                            "productId": shopify_product_id,
+                            "media": images,
+                        },
+                        operation_name="createProductMedia",
                     )
-                else:
-                    result = graphql_client.execute(
+                except ValueError as error:
+                    _logger.error("Failed to export images to Shopify: %s", error)
+                    graphql_client.execute(
                         query=graphql_document,
-                        variables={"input": shopify_product_data},
-                        operation_name="CreateProduct",
+                        variables={"input": {"id": shopify_product_id}},
+                        operation_name="DeleteProduct",
                     )
-                    result_dict = self.parse_and_validate_shopify_response(result)
-                    shopify_product_id = (
-                        result_dict.get("data", {}).get("productCreate", {}).get("product", {}).get("id")
-                    )
-                    images = self.prepare_odoo_product_image_data_for_export(base_url, odoo_product)
-                    try:
-                        graphql_client.execute(
-                            query=graphql_document,
-                            variables={
-                                "productId": shopify_product_id,
-                                "media": images,
-                            },
-                            operation_name="createProductMedia",
-                        )
-                    except ValueError as error:
-                        _logger.error("Failed to export images to Shopify: %s", error)
-                        graphql_client.execute(
-                            query=graphql_document,
-                            variables={"input": {"id": shopify_product_id}},
-                            operation_name="DeleteProduct",
-                        )
-                        raise error
-
-                _logger.debug("Shopify export result: %s", shopify_product_data)
-                result_dict = self.parse_and_validate_shopify_response(result)
+                    raise error
 
-            except ValueError as error:
-                self.notify_channel_on_error(
-                    "Export from Shopify failed",
-                    f"{str(error)}",
-                    record=odoo_product,
-                    logs=memory_handler.logs,
-                )
-                raise error
+            _logger.debug("Shopify export result: %s", shopify_product_data)
+            result_dict = self.parse_and_validate_shopify_response(result)
 
-            shopify_product = result_dict.get("data", {}).get("productUpdate", {}).get("product") or result_dict.get(
-                "data", {}
-            ).get("productCreate", {}).get("product")
-            publications_data = {
-                "id": shopify_product.get("id"),
-                "input": [
-                    {"publicationId": self.convert_to_shopify_gid("Publication", self.ONLINE_STORE_ID)},
-                    {"publicationId": self.convert_to_shopify_gid("Publication", self.POINT_OF_SALE_ID)},
-                    {"publicationId": self.convert_to_shopify_gid("Publication", self.GOOGLE_ID)},
-                    {"publicationId": self.convert_to_shopify_gid("Publication", self.SHOP_ID)},
+        except ValueError as error:
+            self.notify_channel_on_error(
+                "Export from Shopify failed",
+                f"{str(error)}",
+                record=odoo_product,
+                logs=memory_handler.logs,
+            )
+            raise error
+
+        shopify_product = result_dict.get("data", {}).get("productUpdate", {}).get("product") or result_dict.get(
+            "data", {}
+        ).get("productCreate", {}).get("product")
+        graphql_client.execute(
+            query=graphql_document,
+            variables=self.build_shopify_publications_input(shopify_product.get("id")),
+            operation_name="UpdatePublications",
+        )
+
+        self.store_shopify_export_result(odoo_product, shopify_product, shopify_product_data)
+        return shopify_product_data, shopify_product
+
+    def bulk_export_to_shopify(
+        self, odoo_products, graphql_client, graphql_document, shopify_location_gid, base_url
+    ) -> int:
+        _logger.debug("Starting bulk export of %s products to Shopify", len(odoo_products))
+        products_to_update = odoo_products.filtered("shopify_product_id")
+        products_to_create = odoo_products - products_to_update
+        shopify_product_inputs = {
+            odoo_product.id: self.build_shopify_product_input(odoo_product, shopify_location_gid)
+            for odoo_product in odoo_products
+        }
+        bulk_exports = [
+            (
+                products_to_update,
+                "product_update.graphql",
+                "productUpdate",
+                [{"input": shopify_product_inputs[odoo_product.id]} for odoo_product in products_to_update],
+            ),
+            (
+                products_to_create,
+                "product_create.graphql",
+                "productCreate",
+                [
+                    {
+                        "input": shopify_product_inputs[odoo_product.id],
+                        "media": self.prepare_odoo_product_image_data_for_export(base_url, odoo_product),
+                    }
+                    for odoo_product in products_to_create
                 ],
-            }
-            graphql_client.execute(
-                query=graphql_document,
-                variables=publications_data,
-                operation_name="UpdatePublications",
+            ),
+        ]
+
+        exported_products: list[tuple["odoo.model.product_product", dict[str, Any]]] = []
+        error_messages = []
+        for products, mutation_file, mutation_key, variables_list in bulk_exports:
+            if not products:
+                continue
+            results = self.run_bulk_mutation(graphql_client, graphql_document, mutation_file, variables_list)
+            for line_number, odoo_product in enumerate(products):
+                mutation_result = results.get(line_number, {}).get("data", {}).get(mutation_key) or {}
+                user_errors = mutation_result.get("userErrors") or results.get(line_number, {}).get("errors") or []
+                shopify_product = mutation_result.get("product")
+                if user_errors or not shopify_product:
+                    error_messages.append(f"{odoo_product.default_code}: {user_errors or 'no result returned'}")
+                    continue
+                exported_products.append((odoo_product, shopify_product))
+
+        if exported_products:
+            self.run_bulk_mutation(
+                graphql_client,
+                graphql_document,
+                "publishable_publish.graphql",
+                [
+                    self.build_shopify_publications_input(shopify_product["id"])
+                    for _, shopify_product in exported_products
+                ],
+            )
+        for odoo_product, shopify_product in exported_products:
+            self.store_shopify_export_result(odoo_product, shopify_product, shopify_product_inputs[odoo_product.id])
+
+        if error_messages:
+            self.notify_channel_on_error(
+                "Bulk export to Shopify failed for some products",
+                "\n".join(error_messages),
+                logs=memory_handler.logs,
             )
+        return len(exported_products)
 
-            shopify_metafields = shopify_product.get("metafields", {}).get("edges", [])
-            shopify_ebay_category_id = ""
-            shopify_condition_id = ""
-            for metafield in shopify_metafields:
-                if metafield.get("node", {}).get("key") == "condition":
-                    shopify_condition_id = str(self.extract_id_from_gid(metafield.get("node", {}).get("id")))
-                elif metafield.get("node", {}).get("key") == "ebay_category_id":
-                    shopify_ebay_category_id = str(self.extract_id_from_gid(metafield.get("node", {}).get("id")))
+    def run_bulk_mutation(
+        self, graphql_client, graphql_document, mutation_file: str, variables_list: list[dict[str, Any]]
+    ) -> dict[int, dict[str, Any]]:
+        """Run one bulk mutation over a JSONL staged upload and return its results keyed by input line number.
 
-            odoo_product.write(
-                {
-                    "shopify_last_exported": fields.Datetime.now(),
-                    "shopify_product_id": self.extract_id_from_gid(shopify_product.get("id")),
-                    "shopify_next_export": False,
-                    "shopify_ebay_category_id": shopify_ebay_category_id,
-                    "shopify_condition_id": shopify_condition_id,
-                }
+        The caller must hold lock_bulk_operations().
+        """
+        mutation = (Path(__file__).parent.parent / "graphql" / "bulk" / mutation_file).read_text()
+        jsonl = "\n".join(json.dumps(variables) for variables in variables_list)
+        staged_upload_path = self.upload_bulk_mutation_variables(graphql_client, graphql_document, jsonl)
+
+        result = graphql_client.execute(
+            query=graphql_document,
+            variables={"mutation": mutation, "stagedUploadPath": staged_upload_path},
+            operation_name="RunBulkMutation",
+        )
+        bulk_operation_result = self.parse_and_validate_shopify_response(result)["data"]["bulkOperationRunMutation"]
+        self.check_for_user_errors(bulk_operation_result)
+
+        bulk_operation = self.wait_for_bulk_operation(
+            graphql_client, graphql_document, bulk_operation_result["bulkOperation"]["id"]
+        )
+        return self.fetch_bulk_operation_results(bulk_operation)
+
+    def lock_bulk_operations(self) -> bool:
+        """Take the lock that lets one bulk mutation run per shop, held until the transaction ends.
+
+        A sync job that cannot get it is postponed. Elsewhere False is returned, so the caller exports one by one.
+        """
+        self.env.cr.execute("SELECT pg_try_advisory_xact_lock(%s)", (self.BULK_OPERATION_LOCK_ID,))
+        if self.env.cr.fetchone()[0]:
+            return True
+        if self.env.context.get("shopify_sync_job_id"):
+            _logger.info("Another Shopify bulk mutation is running, postponing this job")
+            raise ShopifyJobPostponed(self.BULK_OPERATION_POLL_INTERVAL * 6)
+        _logger.info("Another Shopify bulk mutation is running, exporting products one by one")
+        return False
+
+    def upload_bulk_mutation_variables(self, graphql_client, graphql_document, jsonl: str) -> str:
+        result = graphql_client.execute(
+            query=graphql_document,
+            variables={
+                "input": [
+                    {
+                        "resource": "BULK_MUTATION_VARIABLES",
+                        "filename": "bulk_op_vars",
+                        "mimeType": "text/jsonl",
+                        "httpMethod": "POST",
+                    }
+                ]
+            },
+            operation_name="StagedUploadsCreate",
+        )
+        staged_uploads_result = self.parse_and_validate_shopify_response(result)["data"]["stagedUploadsCreate"]
+        self.check_for_user_errors(staged_uploads_result)
+
+        staged_target = staged_uploads_result["stagedTargets"][0]
+        parameters = {parameter["name"]: parameter["value"] for parameter in staged_target["parameters"]}
+        response = self.session.post(
+            staged_target["url"],
+            data=parameters,
+            files={"file": ("bulk_op_vars.jsonl", jsonl.encode(), "text/jsonl")},
+            timeout=MAX_RETRY_DELAY,
+        )
+        response.raise_for_status()
+        return parameters["key"]
+
+    def wait_for_bulk_operation(self, graphql_client, graphql_document, bulk_operation_id: str) -> dict[str, Any]:
+        deadline = time.monotonic() + self.BULK_OPERATION_TIMEOUT
+        while time.monotonic() < deadline:
+            result = graphql_client.execute(
+                query=graphql_document,
+                variables={"id": bulk_operation_id},
+                operation_name="GetBulkOperation",
             )
-            total_count += 1
+            bulk_operation = self.parse_and_validate_shopify_response(result)["data"]["node"]
+            status = bulk_operation.get("status")
             _logger.debug(
-                "Exported %s of %s products from Shopify so far. Last product ID: %s has status: %s and was updated at %s",
-                total_count,
-                len(odoo_products),
-                shopify_product_data.get("id") or odoo_product.id,
-                shopify_product_data["status"],
-                shopify_product.get("updatedAt"),
+                "Bulk operation %s is %s (%s objects)", bulk_operation_id, status, bulk_operation.get("objectCount")
             )
-            if total_count % self.COMMIT_AFTER == 0:
-                self.env.cr.commit()
-        message = f"Shopify exported {total_count} items successfully at {self.now_in_localtime_formatted()}"
-        self.notify_channel("Shopify sync", message, "shopify_sync")
+            if status == "COMPLETED":
+                return bulk_operation
+            if status not in ("CREATED", "RUNNING"):
+                raise ValueError(
+                    f"Shopify bulk operation {bulk_operation_id} {status}: {bulk_operation.get('errorCode')}"
+                )
+            time.sleep(self.BULK_OPERATION_POLL_INTERVAL)
+        raise ValueError(f"Shopify bulk operation {bulk_operation_id} did not finish in time")
+
+    def fetch_bulk_operation_results(self, bulk_operation: dict[str, Any]) -> dict[int, dict[str, Any]]:
+        result_url = bulk_operation.get("url") or bulk_operation.get("partialDataUrl")
+        if not result_url:
+            return {}
+        results = {}
+        with self.session.get(result_url, stream=True, timeout=MAX_RETRY_DELAY) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                result_line = json.loads(line)
+                results[int(result_line.get("__lineNumber", len(results)))] = result_line
+        return results
 
-    def get_orders_since_date(self, last_import_date_str) -> Generator[Any, Any, None]:
-        cursor, has_more_data = None, True
+    @staticmethod
+    def check_for_user_errors(mutation_result: dict[str, Any]) -> None:
+        user_errors = mutation_result.get("userErrors") or []
+        if user_errors:
+            error_messages = [
+                f"(Message: {error.get('message')}) (Field: {error.get('field')})" for error in user_errors
+            ]
+            raise ValueError(f"Shopify GraphQL Errors: {' | '.join(error_messages)}")
 
-        graph_ql_client, graph_ql_document, _, _ = self.setup_sync_environment()
+    def get_orders_since_date(
+        self, order_query: str, graphql_client: shopify.GraphQL | None = None, graphql_document: str | None = None
+    ) -> Generator[Any, Any, None]:
+        if graphql_client is None:
+            graphql_client, graphql_document, _, _ = self.setup_sync_environment()
 
+        cursor, has_more_data = None, True
         while has_more_data:
-            order_edges = self.fetch_shopify_order_edges(
-                cursor, last_import_date_str, graph_ql_client, graph_ql_document
-            )
+            order_edges = self.fetch_shopify_order_edges(cursor, order_query, graphql_client, graphql_document)
 
             for order_edge in order_edges:
                 yield order_edge.get("node")
@@ -808,66 +1520,133 @@ class ShopifySync(models.AbstractModel):
                 has_more_data = False
 
     def fetch_shopify_order_edges(
-        self, cursor, date_filter, graph_ql_client, graph_ql_document, custom_query=None
+        self, cursor: str | None, order_query: str, graphql_client: shopify.GraphQL, graphql_document: str
     ) -> list[dict[str, Any]]:
-        result = self.execute_graphql_query(
-            cursor,
-            date_filter,
-            graph_ql_client,
-            graph_ql_document,
-            "GetOrdersLineItems",
-            custom_query,
+        _logger.debug("Executing GraphQL query: %s", order_query)
+        result = graphql_client.execute(
+            query=graphql_document,
+            variables={
+                "query": order_query,
+                "cursor": cursor,
+                "limit": self.MAX_SHOPIFY_ORDERS_PER_FETCH,
+                "lineItemLimit": self.MAX_SHOPIFY_LINE_ITEMS_PER_FETCH,
+            },
+            operation_name="GetOrdersLineItems",
         )
         shopify_response_data = self.parse_and_validate_shopify_response(result)
         return shopify_response_data.get("data", {}).get("orders", {}).get("edges", [])
 
-    def get_products_with_no_sales(self, date_filter: datetime) -> list[int]:
-        self.initialize_shopify_session()
-        date_filter_iso = date_filter.isoformat(timespec="seconds").replace("+00:00", "Z")
+    def iter_order_line_items(
+        self, order: dict[str, Any], graphql_client: shopify.GraphQL, graphql_document: str
+    ) -> Generator[dict[str, Any], Any, None]:
+        line_items = order.get("lineItems", {})
+        while True:
+            for line_item_edge in line_items.get("edges", []):
+                yield line_item_edge.get("node", {})
 
-        graph_ql_client, graph_ql_document, _, _ = self.setup_sync_environment()
+            page_info = line_items.get("pageInfo", {})
+            if not page_info.get("hasNextPage"):
+                return
+            result = graphql_client.execute(
+                query=graphql_document,
+                variables={
+                    "id": order["id"],
+                    "cursor": page_info.get("endCursor"),
+                    "limit": self.MAX_SHOPIFY_PRODUCTS_PER_FETCH,
+                },
+                operation_name="GetOrderLineItems",
+            )
+            line_items = self.parse_and_validate_shopify_response(result).get("data", {}).get("order", {})
+            line_items = (line_items or {}).get("lineItems", {})
+
+    def iter_product_sales(
+        self, order_query: str, graphql_client: shopify.GraphQL, graphql_document: str
+    ) -> Generator[tuple[int, datetime], Any, None]:
+        for order in self.get_orders_since_date(order_query, graphql_client, graphql_document):
+            order_created_at = parse_to_utc(order.get("createdAt", ""))
+            for line_item in self.iter_order_line_items(order, graphql_client, graphql_document):
+                product = line_item.get("product")
+                if product:
+                    yield self.extract_id_from_gid(product.get("id")), order_created_at
+
+    def refresh_product_sales(
+        self, date_filter: datetime, graphql_client: shopify.GraphQL, graphql_document: str
+    ) -> None:
+        config_parameter = self.env["ir.config_parameter"].sudo()
+        covered_since_str = config_parameter.get_param("shopify.product_sales_covered_since")
+        refreshed_at_str = config_parameter.get_param("shopify.product_sales_refreshed_at")
+        refresh_start_time = current_utc_time()
+
+        # Only orders changed since the last refresh are fetched unless the report reaches further back than the table
+        if covered_since_str and refreshed_at_str and parse_to_utc(covered_since_str) <= date_filter:
+            order_query = self.build_orders_created_since_query(parse_to_utc(refreshed_at_str))
+        else:
+            order_query = self.build_orders_created_since_query(date_filter)
+            covered_since_str = date_filter.isoformat(timespec="seconds").replace("+00:00", "Z")
 
-        _logger.debug("Fetching all orders since %s", date_filter)
-        products_sold = []
+        self.env["shopify.product.sale"].record_sales(
+            self.iter_product_sales(order_query, graphql_client, graphql_document)
+        )
+        config_parameter.set_param("shopify.product_sales_covered_since", covered_since_str)
+        config_parameter.set_param(
+            "shopify.product_sales_refreshed_at",
+            refresh_start_time.isoformat(timespec="seconds").replace("+00:00", "Z"),
+        )
 
-        for order in self.get_orders_since_date(date_filter_iso):
-            for line_item_edge in order.get("lineItems", {}).get("edges", []):
-                product = line_item_edge.get("node", {}).get("product")
-                if product:
-                    product_id = self.extract_id_from_gid(product.get("id"))
-                    products_sold.append(product_id)
+    @staticmethod
+    def build_orders_created_since_query(created_since: datetime) -> str:
+        # A sale counts from the order's creation, in the sales table as well as in the direct order scan
+        return f"created_at:>={created_since.isoformat(timespec='seconds').replace('+00:00', 'Z')}"
 
-        products_sold = list(set(products_sold))
+    @staticmethod
+    def sorted_difference(sorted_ids: array, sorted_ids_to_remove: array) -> list[int]:
+        difference, remove_index = [], 0
+        for item_id in sorted_ids:
+            while remove_index < len(sorted_ids_to_remove) and sorted_ids_to_remove[remove_index] < item_id:
+                remove_index += 1
+            if remove_index == len(sorted_ids_to_remove) or sorted_ids_to_remove[remove_index] != item_id:
+                difference.append(item_id)
+        return difference
+
+    def get_products_with_no_sales(self, date_filter: datetime, use_sales_table: bool = False) -> list[int]:
+        self.initialize_shopify_session()
+        date_filter_iso = date_filter.isoformat(timespec="seconds").replace("+00:00", "Z")
 
-        _logger.debug("Fetching all products created before %s", date_filter)
-        products_with_no_sales, cursor, has_more_data, total_count = [], None, True, 0
-        while has_more_data:
-            shopify_product_edges = self.fetch_shopify_product_edges(
-                cursor,
-                "",
-                graph_ql_client,
-                graph_ql_document,
-                f"inventory_total:>0 created_at:<{date_filter_iso}",
-                "GetProductIds",
-            )
+        graphql_client, graphql_document, _, _ = self.setup_sync_environment()
+        product_id_scan = ShopifyProductIdScan(
+            graphql_client.endpoint,
+            dict(graphql_client.headers),
+            graphql_client.cost_budget,
+            graphql_document,
+            self.MAX_SHOPIFY_PRODUCTS_PER_FETCH * 10,
+        )
 
-            for product_edge in shopify_product_edges:
-                total_count += 1
-                product = product_edge.get("node", {})
-                product_id = self.extract_id_from_gid(product.get("id", ""))
-                if product_id and product_id not in products_sold:
-                    products_with_no_sales.append(product_id)
+        # The product scan only talks to Shopify, so it runs beside the order scan
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            product_ids_future = executor.submit(product_id_scan.run, date_filter_iso)
 
-            if shopify_product_edges:
-                cursor = shopify_product_edges[-1].get("cursor")
-                has_more_data = bool(cursor)
+            _logger.debug("Fetching all orders since %s", date_filter)
+            if use_sales_table:
+                self.refresh_product_sales(date_filter, graphql_client, graphql_document)
+                products_sold = self.env["shopify.product.sale"].get_sold_product_ids(date_filter)
             else:
-                has_more_data = False
+                sold_product_ids = {
+                    product_id
+                    for product_id, _ in self.iter_product_sales(
+                        self.build_orders_created_since_query(date_filter), graphql_client, graphql_document
+                    )
+                }
+                products_sold = array("q", sorted(sold_product_ids))
+                del sold_product_ids
 
+            product_ids, product_id_scan_logs = product_ids_future.result()
+            memory_handler.merge(product_id_scan_logs)
+
+        products_with_no_sales = self.sorted_difference(product_ids, products_sold)
         _logger.debug(
             "Found %s of %s products with no sales since %s",
             len(products_with_no_sales),
-            total_count,
+            len(product_ids),
             date_filter,
         )
         return products_with_no_sales
@@ -0,0 +1,274 @@
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Self
+
+import odoo
+from odoo import api, fields, models
+
+from ..utils.log_buffer import LogBuffer
+
+_logger = logging.getLogger(__name__)
+
+JOB_LOCK_NAMESPACE = 7316
+# Longer than shopify.sync's BULK_OPERATION_TIMEOUT, so a worker can wait out a bulk export it started
+JOB_WORKER_TIME_LIMIT = 70 * 60
+STALE_JOB_GRACE_PERIOD = timedelta(minutes=1)
+MAX_RETRY_DELAY = 60 * 60
+
+
+class ShopifyJobPostponed(Exception):
+    """Raised by a job handler to run the job again later without counting it as a failed attempt."""
+
+    def __init__(self, delay: int) -> None:
+        super().__init__(f"Postponed for {delay} seconds")
+        self.delay = delay
+
+
+class ShopifySyncJob(models.Model):
+    _name = "shopify.sync.job"
+    _description = "Shopify Sync Job"
+    _order = "priority, id"
+    _sql_constraints = [
+        ("key_uniq", "unique (key)", "Shopify sync job already queued !"),
+    ]
+
+    JOB_HANDLERS = {
+        "import_page": "run_import_page_job",
+        "finish_import": "run_finish_import_job",
+        "export_chunk": "run_export_chunk_job",
+    }
+    # No limit above len(WORKER_CRONS), the most jobs that can run at once
+    JOB_CONCURRENCY = {
+        "import_page": 2,
+        "finish_import": 1,
+        "export_chunk": 1,
+    }
+    WORKER_CRONS = [
+        "product_connect.ir_cron_shopify_sync_job_worker_1",
+        "product_connect.ir_cron_shopify_sync_job_worker_2",
+    ]
+
+    job_type = fields.Selection(
+        [
+            ("import_page", "Import Page"),
+            ("finish_import", "Finish Import"),
+            ("export_chunk", "Export Chunk"),
+        ],
+        required=True,
+        index=True,
+    )
+    state = fields.Selection(
+        [
+            ("pending", "Pending"),
+            ("running", "Running"),
+            ("done", "Done"),
+            ("failed", "Failed"),
+        ],
+        default="pending",
+        required=True,
+        index=True,
+    )
+    key = fields.Char(help="Keeps a job from being queued twice when the job enqueuing it is retried")
+    payload = fields.Json(default=dict)
+    result = fields.Json()
+    priority = fields.Integer(default=10)
+    sync_run = fields.Many2one("shopify.sync.run", ondelete="cascade", index=True)
+    attempts = fields.Integer()
+    max_attempts = fields.Integer(default=5)
+    available_at = fields.Datetime(default=fields.Datetime.now, index=True)
+    started_at = fields.Datetime()
+    finished_at = fields.Datetime()
+    worker = fields.Char()
+    error = fields.Text()
+
+    @api.model
+    def enqueue(
+        self,
+        job_type: str,
+        payload: dict[str, Any],
+        sync_run: "odoo.model.shopify_sync_run | None" = None,
+        key: str | None = None,
+    ) -> Self:
+        if key:
+            existing_job = self.search([("key", "=", key)], limit=1)
+            if existing_job:
+                return existing_job
+        return self.create(
+            {
+                "job_type": job_type,
+                "payload": payload,
+                "sync_run": sync_run.id if sync_run else False,
+                "key": key,
+                "priority": 5 if job_type == "import_page" else 10,
+            }
+        )
+
+    @api.model
+    def enqueue_in_new_transaction(
+        self,
+        job_type: str,
+        payload: dict[str, Any],
+        sync_run: "odoo.model.shopify_sync_run | None" = None,
+        key: str | None = None,
+    ) -> None:
+        # Lets other workers pick the job up while the current job's transaction is still open
+        with self.env.registry.cursor() as new_cr:
+            new_env = api.Environment(new_cr, self.env.uid, self.env.context)
+            new_sync_run = new_env["shopify.sync.run"].browse(sync_run.id) if sync_run else None
+            new_env[self._name].enqueue(job_type, payload, new_sync_run, key)
+        self.trigger_workers()
+
+    @api.model
+    def trigger_workers(self) -> None:
+        for cron_xml_id in self.WORKER_CRONS:
+            cron = self.env.ref(cron_xml_id, raise_if_not_found=False)
+            if cron:
+                cron.sudo()._trigger()
+
+    @api.model
+    def has_active_jobs(self, job_types: list[str]) -> bool:
+        return bool(self.search_count([("job_type", "in", job_types), ("state", "in", ["pending", "running"])]))
+
+    @api.model
+    def run_jobs(self) -> None:
+        worker = f"{socket.gethostname()}-{os.getpid()}-{threading.get_ident()}"
+        deadline = time.monotonic() + JOB_WORKER_TIME_LIMIT
+        self.requeue_stale_jobs()
+        self.cleanup()
+        while time.monotonic() < deadline:
+            job = self.claim_next_job(worker)
+            if not job:
+                break
+            job.run()
+
+    @api.model
+    def claim_next_job(self, worker: str) -> Self:
+        with self.env.registry.cursor() as claim_cr:
+            # Serialises claims so concurrency limits hold across workers
+            claim_cr.execute("SELECT pg_advisory_xact_lock(%s, 0)", (JOB_LOCK_NAMESPACE,))
+            claim_cr.execute(
+                "SELECT job_type, count(*) FROM shopify_sync_job WHERE state = 'running' GROUP BY job_type"
+            )
+            running_counts = dict(claim_cr.fetchall())
+            job_types = [
+                job_type
+                for job_type, concurrency in self.JOB_CONCURRENCY.items()
+                if running_counts.get(job_type, 0) < concurrency
+            ]
+            if not job_types:
+                return self.browse()
+
+            claim_cr.execute(
+                """
+                UPDATE shopify_sync_job
+                   SET state = 'running',
+                       attempts = attempts + 1,
+                       started_at = now() AT TIME ZONE 'UTC',
+                       worker = %s
+                 WHERE id = (
+                     SELECT id
+                       FROM shopify_sync_job
+                      WHERE state = 'pending'
+                        AND available_at <= now() AT TIME ZONE 'UTC'
+                        AND job_type IN %s
+                      ORDER BY priority, id
+                      LIMIT 1
+                        FOR UPDATE SKIP LOCKED
+                 )
+             RETURNING id
+                """,
+                (worker, tuple(job_types)),
+            )
+            row = claim_cr.fetchone()
+        return self.browse(row[0]) if row else self.browse()
+
+    @api.model
+    def requeue_stale_jobs(self) -> None:
+        # A running job holds its lock until its transaction ends, so a free lock means its worker died
+        self.env.cr.execute(
+            """
+            SELECT id
+              FROM shopify_sync_job
+             WHERE state = 'running'
+               AND started_at < (now() AT TIME ZONE 'UTC') - %s
+               AND pg_try_advisory_xact_lock(%s, id)
+            """,
+            (STALE_JOB_GRACE_PERIOD, JOB_LOCK_NAMESPACE),
+        )
+        stale_job_ids = [row[0] for row in self.env.cr.fetchall()]
+        if stale_job_ids:
+            _logger.warning("Requeueing %s Shopify sync jobs from crashed workers", len(stale_job_ids))
+            self.browse(stale_job_ids).write({"state": "pending", "available_at": fields.Datetime.now()})
+        self.env.cr.commit()
+
+    def run(self) -> None:
+        self.ensure_one()
+        self.env.cr.execute("SELECT pg_try_advisory_xact_lock(%s, %s)", (JOB_LOCK_NAMESPACE, self.id))
+        if not self.env.cr.fetchone()[0]:
+            # Held for a moment by another worker's stale job check, so hand the claim back unused
+            self.env.cr.execute(
+                """
+                UPDATE shopify_sync_job
+                   SET state = 'pending', attempts = attempts - 1, worker = NULL
+                 WHERE id = %s AND state = 'running'
+                """,
+                (self.id,),
+            )
+            self.env.cr.commit()
+            self.invalidate_recordset()
+            return
+        # Claimed in another transaction, so cached values may predate the claim
+        self.invalidate_recordset()
+
+        # Lets handlers postpone the job, which only the job runner can handle
+        shopify_sync = self.env["shopify.sync"].with_context(shopify_sync_job_id=self.id)
+        with shopify_sync.capture_sync_logs() as log_buffer:
+            self.run_handler(shopify_sync, log_buffer)
+
+    def run_handler(self, shopify_sync: "odoo.model.shopify_sync", log_buffer: LogBuffer) -> None:
+        _logger.debug("Running Shopify sync job %s (%s)", self.id, self.job_type)
+        try:
+            shopify_sync.initialize_shopify_session()
+            result = getattr(shopify_sync, self.JOB_HANDLERS[self.job_type])(self)
+            self.write({"state": "done", "finished_at": fields.Datetime.now(), "result": result, "error": False})
+            self.env.cr.commit()
+        except ShopifyJobPostponed as postponed:
+            self.env.cr.rollback()
+            self.write(
+                {
+                    "state": "pending",
+                    "attempts": self.attempts - 1,
+                    "available_at": fields.Datetime.now() + timedelta(seconds=postponed.delay),
+                }
+            )
+            self.env.cr.commit()
+        except Exception as error:
+            self.env.cr.rollback()
+            _logger.exception("Shopify sync job %s (%s) failed", self.id, self.job_type)
+            if self.attempts < self.max_attempts:
+                retry_delay = min(30 * 2**self.attempts, MAX_RETRY_DELAY)
+                self.write(
+                    {
+                        "state": "pending",
+                        "available_at": fields.Datetime.now() + timedelta(seconds=retry_delay),
+                        "error": str(error),
+                    }
+                )
+            else:
+                self.write({"state": "failed", "finished_at": fields.Datetime.now(), "error": str(error)})
+                shopify_sync.notify_channel_on_error(
+                    f"Shopify sync job {self.job_type} failed",
+                    f"Job {self.id} failed after {self.attempts} attempts: {error}",
+                    logs=log_buffer.format(),
+                )
+            self.env.cr.commit()
+
+    @api.model
+    def cleanup(self) -> None:
+        one_week_ago = fields.Datetime.subtract(fields.Datetime.now(), weeks=1)
+        self.search([("state", "=", "done"), ("finished_at", "<", one_week_ago)]).unlink()
+        self.env.cr.commit()
@@ -0,0 +1,66 @@
+import logging
+from datetime import datetime
+from typing import Self
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+
+class ShopifySyncRun(models.Model):
+    _name = "shopify.sync.run"
+    _description = "Shopify Sync Run"
+    _order = "id desc"
+
+    run_type = fields.Selection([("import", "Import"), ("export", "Export")], required=True, index=True)
+    state = fields.Selection([("running", "Running"), ("done", "Done")], default="running", required=True, index=True)
+    last_import_time = fields.Char(help="The updated_at filter the run pages through")
+    start_time = fields.Datetime(default=fields.Datetime.now)
+    end_time = fields.Datetime()
+    cursor = fields.Char()
+    page_number = fields.Integer()
+    total_count = fields.Integer()
+    updated_count = fields.Integer()
+    checkpoint_time = fields.Datetime()
+
+    @api.model
+    def start_import(self, last_import_time: str, start_time: datetime) -> Self:
+        unfinished_run = self.search([("run_type", "=", "import"), ("state", "=", "running")], limit=1)
+        if unfinished_run:
+            _logger.info(
+                "Resuming Shopify import from page %s (%s products already imported)",
+                unfinished_run.page_number,
+                unfinished_run.total_count,
+            )
+            return unfinished_run
+
+        self.cleanup()
+        sync_run = self.create(
+            {
+                "run_type": "import",
+                "last_import_time": last_import_time,
+                "start_time": start_time.replace(tzinfo=None),
+            }
+        )
+        self.env.cr.commit()
+        return sync_run
+
+    def checkpoint(self, cursor: str | None, page_number: int, total_count: int, updated_count: int) -> None:
+        self.ensure_one()
+        self.write(
+            {
+                "cursor": cursor,
+                "page_number": page_number,
+                "total_count": total_count,
+                "updated_count": updated_count,
+                "checkpoint_time": fields.Datetime.now(),
+            }
+        )
+
+    def finish(self) -> None:
+        self.write({"state": "done", "end_time": fields.Datetime.now()})
+
+    @api.model
+    def cleanup(self) -> None:
+        one_month_ago = fields.Datetime.subtract(fields.Datetime.now(), months=1)
+        self.search([("state", "=", "done"), ("end_time", "<", one_month_ago)]).unlink()
@@ -0,0 +1,229 @@
+import logging
+from datetime import timedelta
+from typing import Any, Self
+
+import odoo
+from odoo import api, fields, models
+
+from .shopify_sync import ShopifyImportBatch, parse_to_utc
+
+_logger = logging.getLogger(__name__)
+
+
+class ShopifyWebhookImport:
+    """Shopify data fetched for a batch of webhooks, so the per-webhook writes need no network calls."""
+
+    def __init__(
+        self,
+        shopify_sync: "odoo.model.shopify_sync",
+        product_ids_by_webhook_id: dict[int, set[str]],
+        shopify_products: list[dict[str, Any]],
+    ) -> None:
+        self.shopify_sync = shopify_sync
+        self.product_ids_by_webhook_id = product_ids_by_webhook_id
+        self.shopify_products_by_id = {
+            str(shopify_sync.extract_id_from_gid(shopify_product["id"])): shopify_product
+            for shopify_product in shopify_products
+        }
+        self.last_import_time_str = str(
+            shopify_sync.env["ir.config_parameter"].sudo().get_param("shopify.last_import_time")
+        )
+        self.last_import_time = parse_to_utc(self.last_import_time_str)
+        self.import_batch: ShopifyImportBatch = shopify_sync.prepare_import_page(
+            shopify_products, self.last_import_time
+        )
+        self.imported_product_ids: set[str] = set()
+
+    def reset_import_batch(self) -> None:
+        # Records created in a rolled back savepoint must not be found again, the downloads stay valid
+        self.shopify_sync.warm_lookup_cache()
+        import_batch = self.shopify_sync.build_import_batch(list(self.shopify_products_by_id.values()))
+        import_batch.images_by_url = self.import_batch.images_by_url
+        self.import_batch = import_batch
+
+
+class ShopifyWebhookInbox(models.Model):
+    _name = "shopify.webhook.inbox"
+    _description = "Shopify Webhook Inbox"
+    _order = "id"
+    _sql_constraints = [
+        ("webhook_id_uniq", "unique (webhook_id)", "Shopify webhook already received !"),
+    ]
+
+    PRODUCT_TOPICS = ("products/create", "products/update")
+    INVENTORY_TOPICS = ("inventory_levels/update",)
+    DRAIN_BATCH_SIZE = 250
+    MAX_ATTEMPTS = 5
+    RETRY_DELAY = 60
+    MAX_RETRY_DELAY = 60 * 60
+
+    webhook_id = fields.Char(required=True, index=True)
+    topic = fields.Char(required=True)
+    shopify_id = fields.Char(
+        required=True, help="Product ID for product topics, inventory item ID for inventory topics"
+    )
+    state = fields.Selection(
+        [("pending", "Pending"), ("done", "Done"), ("failed", "Failed")],
+        default="pending",
+        required=True,
+        index=True,
+    )
+    received_at = fields.Datetime(default=fields.Datetime.now)
+    available_at = fields.Datetime(default=fields.Datetime.now, index=True)
+    attempts = fields.Integer(default=0)
+    processed_at = fields.Datetime()
+    error = fields.Text()
+
+    @api.model
+    def receive(self, webhook_id: str, topic: str, payload: dict[str, Any]) -> bool:
+        shopify_id = payload.get("inventory_item_id") if topic in self.INVENTORY_TOPICS else payload.get("id")
+        if not shopify_id:
+            return False
+
+        # Shopify redelivers a webhook until it is acknowledged, so duplicates are dropped here
+        self.env.cr.execute(
+            """
+            INSERT INTO shopify_webhook_inbox
+                (webhook_id, topic, shopify_id, state, received_at, available_at, attempts,
+                 create_uid, create_date, write_uid, write_date)
+            VALUES (%(webhook_id)s, %(topic)s, %(shopify_id)s, 'pending', now() AT TIME ZONE 'UTC',
+                    now() AT TIME ZONE 'UTC', 0, %(uid)s, now() AT TIME ZONE 'UTC', %(uid)s, now() AT TIME ZONE 'UTC')
+            ON CONFLICT (webhook_id) DO NOTHING
+            """,
+            {"webhook_id": webhook_id, "topic": topic, "shopify_id": str(shopify_id), "uid": self.env.uid},
+        )
+        is_new_webhook = bool(self.env.cr.rowcount)
+        if is_new_webhook:
+            drain_cron = self.env.ref("product_connect.ir_cron_shopify_webhook_drain", raise_if_not_found=False)
+            if drain_cron:
+                drain_cron.sudo()._trigger()
+        return is_new_webhook
+
+    @api.model
+    def drain(self) -> None:
+        self.cleanup()
+        shopify_sync = self.env["shopify.sync"]
+        while True:
+            self.env.cr.execute(
+                """
+                SELECT id
+                  FROM shopify_webhook_inbox
+                 WHERE state = 'pending'
+                   AND (available_at IS NULL OR available_at <= now() AT TIME ZONE 'UTC')
+                 ORDER BY id
+                 LIMIT %s
+                   FOR UPDATE SKIP LOCKED
+                """,
+                (self.DRAIN_BATCH_SIZE,),
+            )
+            webhooks = self.browse([row[0] for row in self.env.cr.fetchall()])
+            if not webhooks:
+                break
+
+            with shopify_sync.capture_sync_logs() as log_buffer:
+                try:
+                    webhook_import = webhooks.prepare_import()
+                except Exception as error:
+                    # Nothing was written yet, so the whole batch is retried later
+                    self.env.cr.rollback()
+                    _logger.exception("Fetching %s Shopify webhooks failed", len(webhooks))
+                    webhooks.register_failure(error)
+                    self.env.cr.commit()
+                    shopify_sync.notify_channel_on_error(
+                        "Shopify webhook import failed", str(error), logs=log_buffer.format()
+                    )
+                    break
+
+                failed_webhooks = self.browse()
+                for webhook in webhooks:
+                    try:
+                        with self.env.cr.savepoint():
+                            webhook.import_from_shopify(webhook_import)
+                            webhook.write({"state": "done", "processed_at": fields.Datetime.now(), "error": False})
+                    except Exception as error:
+                        _logger.exception("Importing Shopify webhook %s failed", webhook.webhook_id)
+                        webhook_import.reset_import_batch()
+                        webhook.register_failure(error)
+                        failed_webhooks |= webhook
+                self.env.cr.commit()
+
+                if failed_webhooks:
+                    shopify_sync.notify_channel_on_error(
+                        "Shopify webhook import failed",
+                        f"{len(failed_webhooks)} of {len(webhooks)} Shopify webhooks failed: {failed_webhooks[0].error}",
+                        logs=log_buffer.format(),
+                    )
+
+    def register_failure(self, error: Exception) -> None:
+        for webhook in self:
+            attempts = webhook.attempts + 1
+            if attempts >= self.MAX_ATTEMPTS:
+                webhook.write(
+                    {
+                        "state": "failed",
+                        "attempts": attempts,
+                        "processed_at": fields.Datetime.now(),
+                        "error": str(error),
+                    }
+                )
+            else:
+                retry_delay = min(self.RETRY_DELAY * 2**webhook.attempts, self.MAX_RETRY_DELAY)
+                webhook.write(
+                    {
+                        "state": "pending",
+                        "attempts": attempts,
+                        "available_at": fields.Datetime.now() + timedelta(seconds=retry_delay),
+                        "error": str(error),
+                    }
+                )
+
+    def prepare_import(self) -> ShopifyWebhookImport:
+        shopify_sync = self.env["shopify.sync"]
+        shopify_sync.initialize_shopify_session()
+        graphql_client, graphql_document, _, _ = shopify_sync.setup_sync_environment()
+        shopify_sync.warm_lookup_cache()
+
+        inventory_item_ids = {webhook.shopify_id for webhook in self if webhook.topic in self.INVENTORY_TOPICS}
+        product_id_by_inventory_item = shopify_sync.fetch_product_ids_by_inventory_item(
+            inventory_item_ids, graphql_client, graphql_document
+        )
+        product_ids_by_webhook_id = {}
+        for webhook in self:
+            if webhook.topic in self.INVENTORY_TOPICS:
+                product_id = product_id_by_inventory_item.get(webhook.shopify_id)
+                product_ids_by_webhook_id[webhook.id] = {product_id} if product_id else set()
+            else:
+                product_ids_by_webhook_id[webhook.id] = {webhook.shopify_id}
+
+        shopify_products = shopify_sync.fetch_shopify_products_by_ids(
+            set().union(*product_ids_by_webhook_id.values()), graphql_client, graphql_document
+        )
+        return ShopifyWebhookImport(shopify_sync, product_ids_by_webhook_id, shopify_products)
+
+    def import_from_shopify(self, webhook_import: ShopifyWebhookImport | None = None) -> Self:
+        self.ensure_one()
+        if webhook_import is None:
+            webhook_import = self.prepare_import()
+
+        product_ids = webhook_import.product_ids_by_webhook_id.get(self.id, set()) - webhook_import.imported_product_ids
+        shopify_products = [
+            {"node": webhook_import.shopify_products_by_id[product_id]}
+            for product_id in sorted(product_ids)
+            if product_id in webhook_import.shopify_products_by_id
+        ]
+        if shopify_products:
+            webhook_import.shopify_sync.import_shopify_product_page(
+                shopify_products,
+                webhook_import.last_import_time,
+                webhook_import.last_import_time_str,
+                1,
+                webhook_import.import_batch,
+            )
+        webhook_import.imported_product_ids |= product_ids
+        return self
+
+    @api.model
+    def cleanup(self) -> None:
+        one_week_ago = fields.Datetime.subtract(fields.Datetime.now(), weeks=1)
+        self.search([("state", "=", "done"), ("processed_at", "<", one_week_ago)]).unlink()
+        self.env.cr.commit()
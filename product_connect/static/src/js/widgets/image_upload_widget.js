@@ -44,6 +44,16 @@ export class ImageUploadWidget extends BinaryField {
         }
     }
 
+    get derivativeUrl() {
+        // Pre-generated WebP of the smallest size covering the preview, served with long cache headers
+        const urls = this.props.record.data.image_derivative_urls || {}
+        const size = Object.keys(urls)
+            .map(Number)
+            .sort((a, b) => a - b)
+            .find((derivativeSize) => derivativeSize >= Number(this.state.size))
+        return size && this.state.image === this.props.record.data.image_1920 ? urls[size] : null
+    }
+
     async onImageUpload() {
         this.fileInputRef.el.click()
     }
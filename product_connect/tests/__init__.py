@@ -0,0 +1,14 @@
+from . import test_image_derivative
+from . import test_image_header
+from . import test_image_mixin
+from . import test_motor_product
+from . import test_product_base
+from . import test_product_product
+from . import test_shopify_export
+from . import test_shopify_bulk_mutation
+from . import test_shopify_import
+from . import test_shopify_sync_job
+from . import test_shopify_webhook
+from . import test_shopify_no_sales
+from . import test_shopify_rate_limiter
+from . import test_zip_stream
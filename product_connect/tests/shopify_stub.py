@@ -0,0 +1,99 @@
+import json
+import threading
+from email import policy
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+import shopify
+from odoo.tests import TransactionCase
+
+
+class ShopifyStubServer:
+    """Local HTTP server answering the Shopify GraphQL operations, staged uploads and bulk result downloads.
+
+    GraphQL responses come from handlers keyed by operation name, and every request is recorded for assertions.
+    """
+
+    def __init__(self) -> None:
+        self.graphql_handlers: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {}
+        self.graphql_requests: list[dict[str, Any]] = []
+        self.uploaded_files: list[bytes] = []
+        self.downloads: dict[str, bytes] = {}
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.build_handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    @property
+    def graphql_url(self) -> str:
+        return f"{self.base_url}/graphql.json"
+
+    def __enter__(self) -> "ShopifyStubServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def requested_operations(self) -> list[str]:
+        return [request["operationName"] for request in self.graphql_requests]
+
+    def build_handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def send_body(self, body: bytes, content_type: str, status: int = 200) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                if self.path not in stub.downloads:
+                    self.send_body(b"", "text/plain", 404)
+                    return
+                self.send_body(stub.downloads[self.path], "text/jsonl")
+
+            def do_POST(self) -> None:
+                if self.path == "/graphql.json":
+                    request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                    stub.graphql_requests.append(request)
+                    response = stub.graphql_handlers[request["operationName"]](request.get("variables") or {})
+                    self.send_body(json.dumps(response).encode(), "application/json")
+                elif self.path == "/upload":
+                    body = self.rfile.read(int(self.headers["Content-Length"]))
+                    form = BytesParser(policy=policy.HTTP).parsebytes(
+                        f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + body
+                    )
+                    for part in form.iter_parts():
+                        if part.get_param("name", header="content-disposition") == "file":
+                            stub.uploaded_files.append(part.get_payload(decode=True))
+                    self.send_body(b"", "text/plain", 201)
+                else:
+                    self.send_body(b"", "text/plain", 404)
+
+        return Handler
+
+
+class ShopifyStubCase(TransactionCase):
+    """Points the Shopify client at a fresh stub server for every test."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.stub = ShopifyStubServer().__enter__()
+        self.addCleanup(self.stub.__exit__, None, None, None)
+        self.env["ir.config_parameter"].sudo().set_param("shopify.graphql_endpoint", self.stub.graphql_url)
+        shopify.ShopifyResource.activate_session(shopify.Session("stub-shop.myshopify.com", "2024-01", "token"))
+        self.addCleanup(shopify.ShopifyResource.clear_session)
+        self.stub.graphql_handlers["GetLocations"] = lambda variables: {
+            "data": {"locations": {"edges": [{"node": {"id": "gid://shopify/Location/1"}}]}}
+        }
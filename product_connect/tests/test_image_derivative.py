@@ -0,0 +1,44 @@
+import base64
+from io import BytesIO
+
+import odoo
+from PIL import Image
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged("post_install", "-at_install")
+class TestImageDerivative(TransactionCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.product_template = cls.env["product.template"].create({"name": "Image Derivative Test"})
+        with BytesIO() as output:
+            Image.new("RGB", (64, 48), "green").save(output, "PNG")
+            cls.image_data = base64.b64encode(output.getvalue())
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.patch(self.env.cr, "commit", lambda: None)
+
+    def get_derivatives(self, image: "odoo.model.product_image") -> "odoo.model.image_derivative":
+        return self.env["image.derivative"].search([("res_model", "=", image._name), ("res_id", "=", image.id)])
+
+    def test_queue_skips_images_without_data(self) -> None:
+        image = self.env["product.image"].create(
+            {"name": "with data", "product_tmpl_id": self.product_template.id, "image_1920": self.image_data}
+        )
+        self.assertTrue(self.get_derivatives(image))
+        self.assertEqual(set(self.get_derivatives(image).mapped("state")), {"pending"})
+
+        image.image_1920 = False
+        self.assertFalse(self.get_derivatives(image))
+
+    def test_decompression_bomb_marks_derivatives_failed(self) -> None:
+        image = self.env["product.image"].create(
+            {"name": "bomb", "product_tmpl_id": self.product_template.id, "image_1920": self.image_data}
+        )
+        self.patch(Image, "MAX_IMAGE_PIXELS", 100)
+
+        self.env["image.derivative"].generate_pending()
+
+        self.assertEqual(set(self.get_derivatives(image).mapped("state")), {"failed"})
@@ -0,0 +1,49 @@
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image
+from odoo.tests import TransactionCase, tagged
+
+from ..utils.image_header import read_image_size
+
+
+@tagged("post_install", "-at_install")
+class TestReadImageSize(TransactionCase):
+    def setUp(self) -> None:
+        super().setUp()
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_path = Path(temp_dir.name)
+
+    def write_file(self, name: str, content: bytes) -> Path:
+        path = self.temp_path / name
+        path.write_bytes(content)
+        return path
+
+    @staticmethod
+    def make_image(image_format: str, **save_options) -> bytes:
+        with BytesIO() as output:
+            Image.new("RGB", (37, 21), "blue").save(output, image_format, **save_options)
+            return output.getvalue()
+
+    def test_reads_full_headers(self) -> None:
+        for image_format, save_options in [("PNG", {}), ("JPEG", {}), ("WEBP", {}), ("WEBP", {"lossless": True})]:
+            with self.subTest(image_format=image_format, **save_options):
+                path = self.write_file("image", self.make_image(image_format, **save_options))
+                self.assertEqual(read_image_size(path), (37, 21))
+
+    def test_truncated_headers_return_none(self) -> None:
+        webp_lossless = b"RIFF\x00\x00\x00\x00WEBPVP8L\x00\x00\x00\x00\x2f"
+        webp_lossy = b"RIFF\x00\x00\x00\x00WEBPVP8 \x00\x00\x00\x00\x00\x00\x00\x9d\x01\x2a\x25"
+        webp_extended = b"RIFF\x00\x00\x00\x00WEBPVP8X\x00\x00\x00\x00\x00\x00\x00\x00\x24\x00"
+        truncated_headers = {
+            "png": self.make_image("PNG")[:20],
+            "jpeg": self.make_image("JPEG")[:40],
+            "webp_lossless": webp_lossless,
+            "webp_lossy": webp_lossy,
+            "webp_extended": webp_extended,
+        }
+        for name, content in truncated_headers.items():
+            with self.subTest(name=name):
+                self.assertIsNone(read_image_size(self.write_file(name, content)))
@@ -0,0 +1,75 @@
+import base64
+from io import BytesIO
+
+import odoo
+from PIL import Image
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged("post_install", "-at_install")
+class TestImageMixinSharing(TransactionCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.product_template = cls.env["product.template"].create({"name": "Image Sharing Test"})
+        # Larger than 1920 px, so the stored image_1920 differs from the uploaded bytes
+        cls.large_image = cls.make_image((2500, 1600), "red")
+
+    @staticmethod
+    def make_image(size: tuple[int, int], color: str) -> bytes:
+        with BytesIO() as output:
+            Image.new("RGB", size, color).save(output, "JPEG")
+            return base64.b64encode(output.getvalue())
+
+    def get_image_attachments(self, record) -> dict[str, "odoo.model.ir_attachment"]:
+        attachments = self.env["ir.attachment"].search(
+            [
+                ("res_model", "=", record._name),
+                ("res_id", "=", record.id),
+                ("res_field", "in", record.IMAGE_FIELDS),
+            ]
+        )
+        return {attachment.res_field: attachment for attachment in attachments}
+
+    def test_large_image_shares_stored_attachments(self) -> None:
+        first_image = self.env["product.image"].create(
+            {"name": "first", "product_tmpl_id": self.product_template.id, "image_1920": self.large_image}
+        )
+        second_image = self.env["product.image"].create(
+            {"name": "second", "product_tmpl_id": self.product_template.id, "image_1920": self.large_image}
+        )
+
+        first_attachments = self.get_image_attachments(first_image)
+        second_attachments = self.get_image_attachments(second_image)
+        self.assertEqual(set(second_attachments), set(first_attachments))
+        for field_name, attachment in first_attachments.items():
+            self.assertEqual(second_attachments[field_name].store_fname, attachment.store_fname)
+            self.assertNotEqual(second_attachments[field_name], attachment)
+        self.assertEqual(second_image.image_1024, first_image.image_1024)
+        self.assertEqual(second_image.attachment, second_attachments["image_1920"])
+
+    def test_other_image_models_are_unchanged(self) -> None:
+        vals_list = [{"image_1920": self.large_image}]
+        self.assertEqual(self.env["product.template"].pop_shared_image_attachments(vals_list), [None])
+        self.assertEqual(vals_list, [{"image_1920": self.large_image}])
+
+        first_template = self.env["product.template"].create({"name": "First", "image_1920": self.large_image})
+        second_template = self.env["product.template"].create({"name": "Second", "image_1920": self.large_image})
+        self.assertTrue(second_template.image_128)
+        self.assertEqual(second_template.image_1920, first_template.image_1920)
+        self.assertEqual(
+            set(self.get_image_attachments(second_template)), set(self.get_image_attachments(first_template))
+        )
+
+    def test_unlinking_source_keeps_shared_image(self) -> None:
+        first_image = self.env["product.image"].create(
+            {"name": "first", "product_tmpl_id": self.product_template.id, "image_1920": self.large_image}
+        )
+        second_image = self.env["product.image"].create(
+            {"name": "second", "product_tmpl_id": self.product_template.id, "image_1920": self.large_image}
+        )
+        stored_image = first_image.image_1920
+        first_image.unlink()
+
+        second_image.invalidate_recordset()
+        self.assertEqual(second_image.image_1920, stored_image)
@@ -0,0 +1,55 @@
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged("post_install", "-at_install")
+class TestMotorProductApplicability(TransactionCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.two_stroke = cls.env["motor.stroke"].create({"name": "Test Two Stroke", "code": "test_two_stroke"})
+        cls.four_stroke = cls.env["motor.stroke"].create({"name": "Test Four Stroke", "code": "test_four_stroke"})
+        cls.part_template = cls.env["motor.part.template"].create({"name": "Test Lower Unit"})
+        cls.template_model = cls.env["motor.product.template"]
+        cls.any_template = cls.template_model.create({"name": "Test Any Motor"})
+        cls.two_stroke_template = cls.template_model.create(
+            {"name": "Test Two Stroke Only", "stroke": [(6, 0, cls.two_stroke.ids)]}
+        )
+        cls.part_template_dependent = cls.template_model.create(
+            {"name": "Test Needs Lower Unit", "excluded_parts": [(6, 0, cls.part_template.ids)]}
+        )
+
+    def applicable_template_ids(self, stroke_id: int, part_template_ids: frozenset[int] = frozenset()) -> set[int]:
+        test_templates = self.any_template + self.two_stroke_template + self.part_template_dependent
+        applicable_ids = self.template_model.get_applicability_index().applicable_template_ids(
+            stroke_id, None, None, part_template_ids, frozenset()
+        )
+        return set(applicable_ids) & set(test_templates.ids)
+
+    def test_templates_match_the_motor_attributes(self) -> None:
+        self.assertEqual(
+            self.applicable_template_ids(self.two_stroke.id),
+            {self.any_template.id, self.two_stroke_template.id, self.part_template_dependent.id},
+        )
+        self.assertEqual(
+            self.applicable_template_ids(self.four_stroke.id, frozenset(self.part_template.ids)),
+            {self.any_template.id},
+        )
+
+    def test_index_is_rebuilt_only_when_an_indexed_field_changes(self) -> None:
+        applicability_index = self.template_model.get_applicability_index()
+        self.assertIs(self.template_model.get_applicability_index(), applicability_index)
+
+        self.any_template.write({"name": "Test Any Motor Renamed", "bin": "B1"})
+        self.assertIs(self.template_model.get_applicability_index(), applicability_index)
+
+        self.any_template.write({"stroke": [(6, 0, self.four_stroke.ids)]})
+        rebuilt_index = self.template_model.get_applicability_index()
+        self.assertIsNot(rebuilt_index, applicability_index)
+        self.assertNotIn(self.any_template.id, self.applicable_template_ids(self.two_stroke.id))
+
+        new_template = self.template_model.create({"name": "Test New Template"})
+        self.assertIsNot(self.template_model.get_applicability_index(), rebuilt_index)
+        self.assertIn(new_template.id, self.template_model.get_applicability_index().template_ids)
+
+        new_template.unlink()
+        self.assertNotIn(new_template.id, self.template_model.get_applicability_index().template_ids)
@@ -0,0 +1,97 @@
+import odoo
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged("post_install", "-at_install")
+class TestDuplicateNewMpns(TransactionCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.condition_new = cls.env.ref("product_connect.product_condition_new")
+        cls.condition_used = cls.env.ref("product_connect.product_condition_used")
+
+    def create_import(self, mpn: str, condition: "odoo.model.product_condition") -> "odoo.model.product_import":
+        return self.env["product.import"].create({"name": f"Import {mpn}", "mpn": mpn, "condition": condition.id})
+
+    def test_new_records_are_checked_against_their_own_model(self) -> None:
+        existing_import = self.create_import("ABC-123", self.condition_new)
+        duplicate_import = self.create_import("abc123, XYZ-9", self.condition_new)
+        unique_import = self.create_import("DEF-456", self.condition_new)
+
+        messages = (duplicate_import + unique_import).find_duplicate_new_mpns()
+        self.assertEqual(set(messages), {duplicate_import.id})
+        self.assertIn(existing_import.default_code, messages[duplicate_import.id])
+
+        existing_products = duplicate_import.products_from_mpn_condition_new()
+        self.assertEqual([product["default_code"] for product in existing_products], [existing_import.default_code])
+
+    def test_only_new_condition_products_count_as_duplicates(self) -> None:
+        self.create_import("ABC-123", self.condition_used)
+        used_import = self.create_import("ABC-123", self.condition_used)
+        new_import = self.create_import("ABC-123", self.condition_new)
+
+        self.assertEqual((used_import + new_import).find_duplicate_new_mpns(), {})
+        self.assertIsNone(new_import.products_from_mpn_condition_new())
+
+    def test_records_in_the_same_batch_are_left_to_the_caller(self) -> None:
+        first_import = self.create_import("ABC-123", self.condition_new)
+        second_import = self.create_import("ABC-123", self.condition_new)
+
+        self.assertEqual((first_import + second_import).find_duplicate_new_mpns(), {})
+        self.assertEqual(set(second_import.find_duplicate_new_mpns()), {second_import.id})
+
+
+@tagged("post_install", "-at_install")
+class TestSkuAllocation(TransactionCase):
+    def test_used_skus_cover_every_source_model(self) -> None:
+        product_import = self.env["product.import"].create({"name": "Import SKU"})
+        product_template = self.env["product.template"].create({"name": "Template SKU"})
+        unused_sku = self.env["product.import"].allocate_skus(1)[0]
+
+        used_skus = self.env["product.import"].get_used_skus(
+            [product_import.default_code, product_template.default_code, unused_sku]
+        )
+        self.assertEqual(used_skus, {product_import.default_code, product_template.default_code})
+
+        sku_rows = self.env["product.default.code"].search([("default_code", "=", product_import.default_code)])
+        self.assertEqual(sku_rows.mapped("res_model"), ["product.import"])
+        self.assertEqual(sku_rows.res_id, product_import.id)
+
+    def test_allocated_skus_skip_used_ones(self) -> None:
+        skus = self.env["product.import"].allocate_skus(3)
+        self.assertEqual(len(set(skus)), 3)
+        self.assertFalse(self.env["product.import"].get_used_skus(skus))
+
+
+@tagged("post_install", "-at_install")
+class TestQtyWeightedTotals(TransactionCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.env["product.import"].create(
+            [
+                {"name": "Weighted A1", "bin": "WEIGHTED-A", "list_price": 10, "standard_price": 4, "qty_available": 3},
+                {"name": "Weighted A2", "bin": "WEIGHTED-A", "list_price": 5, "standard_price": 1, "qty_available": 2},
+                {"name": "Weighted B", "bin": "WEIGHTED-B", "list_price": 7, "standard_price": 2, "qty_available": 0},
+                {"name": "Weighted C", "bin": "WEIGHTED-C", "list_price": 1, "standard_price": 1, "qty_available": 1},
+            ]
+        )
+
+    def read_totals(self, bins: list[str]) -> list[dict]:
+        self.env.flush_all()
+        return self.env["product.import"].read_group(
+            [("bin", "in", bins)], ["list_price:sum", "standard_price:sum"], ["bin"], orderby="bin"
+        )
+
+    def test_price_sums_are_weighted_by_quantity(self) -> None:
+        groups = self.read_totals(["WEIGHTED-A", "WEIGHTED-B"])
+        self.assertEqual(
+            [(group["bin"], group["list_price"], group["standard_price"]) for group in groups],
+            [("WEIGHTED-A", 40.0, 14.0), ("WEIGHTED-B", 0.0, 0.0)],
+        )
+
+    def test_weighted_sums_take_one_query_for_any_number_of_groups(self) -> None:
+        with self.assertQueryCount(1):
+            self.read_totals(["WEIGHTED-A"])
+        with self.assertQueryCount(1):
+            self.read_totals(["WEIGHTED-A", "WEIGHTED-B", "WEIGHTED-C"])
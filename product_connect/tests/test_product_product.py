@@ -0,0 +1,43 @@
+import odoo
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged("post_install", "-at_install")
+class TestUpdateQuantities(TransactionCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.stock_location = cls.env.ref("stock.stock_location_stock")
+
+    def create_products(self, count: int) -> "odoo.model.product_product":
+        return self.env["product.product"].create(
+            [{"name": f"Quantity {index}", "detailed_type": "product"} for index in range(count)]
+        )
+
+    def get_quantities(self, products: "odoo.model.product_product") -> dict[int, float]:
+        quants = self.env["stock.quant"].search(
+            [("product_id", "in", products.ids), ("location_id", "=", self.stock_location.id)]
+        )
+        return {quant.product_id.id: quant.quantity for quant in quants}
+
+    def count_update_queries(self, products: "odoo.model.product_product") -> int:
+        self.env.flush_all()
+        self.env.invalidate_all()
+        query_count_start = self.env.cr.sql_log_count
+        self.env["product.product"].update_quantities(
+            {product.id: 5 if index % 2 else 2 for index, product in enumerate(products)}
+        )
+        self.env.flush_all()
+        return self.env.cr.sql_log_count - query_count_start
+
+    def test_missing_quants_are_created(self) -> None:
+        products = self.create_products(3)
+        self.env["product.product"].update_quantities(dict(zip(products.ids, [1, 4, 4])))
+        self.assertEqual(self.get_quantities(products), dict(zip(products.ids, [1.0, 4.0, 4.0])))
+
+    def test_update_queries_do_not_grow_with_the_products(self) -> None:
+        few_products, many_products = self.create_products(3), self.create_products(9)
+        self.env["product.product"].update_quantities({product.id: 1 for product in few_products + many_products})
+
+        self.assertEqual(self.count_update_queries(few_products), self.count_update_queries(many_products))
+        self.assertEqual(set(self.get_quantities(many_products).values()), {2.0, 5.0})
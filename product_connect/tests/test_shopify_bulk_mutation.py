@@ -0,0 +1,110 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import odoo
+from odoo.tests import tagged
+
+from ..models.shopify_sync_job import ShopifyJobPostponed
+from .shopify_stub import ShopifyStubCase
+
+BULK_OPERATION_ID = "gid://shopify/BulkOperation/1"
+
+
+@tagged("post_install", "-at_install")
+class TestShopifyBulkMutation(ShopifyStubCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.shopify_sync = self.env["shopify.sync"]
+        self.patch(type(self.shopify_sync), "BULK_OPERATION_POLL_INTERVAL", 0)
+        self.bulk_operation_statuses = ["RUNNING", "COMPLETED"]
+        self.stub.graphql_handlers.update(
+            {
+                "StagedUploadsCreate": lambda variables: {
+                    "data": {
+                        "stagedUploadsCreate": {
+                            "stagedTargets": [
+                                {
+                                    "url": f"{self.stub.base_url}/upload",
+                                    "resourceUrl": None,
+                                    "parameters": [{"name": "key", "value": "tmp/bulk_op_vars"}],
+                                }
+                            ],
+                            "userErrors": [],
+                        }
+                    }
+                },
+                "RunBulkMutation": lambda variables: {
+                    "data": {
+                        "bulkOperationRunMutation": {
+                            "bulkOperation": {"id": BULK_OPERATION_ID, "status": "CREATED"},
+                            "userErrors": [],
+                        }
+                    }
+                },
+                "GetBulkOperation": self.get_bulk_operation,
+            }
+        )
+        self.graphql_client, self.graphql_document, _, _ = self.shopify_sync.setup_sync_environment()
+
+    def get_bulk_operation(self, variables: dict[str, Any]) -> dict[str, Any]:
+        status = self.bulk_operation_statuses.pop(0)
+        return {
+            "data": {
+                "node": {
+                    "id": variables["id"],
+                    "status": status,
+                    "errorCode": "INTERNAL_SERVER_ERROR" if status == "FAILED" else None,
+                    "objectCount": "2",
+                    "url": f"{self.stub.base_url}/results.jsonl" if status == "COMPLETED" else None,
+                    "partialDataUrl": None,
+                }
+            }
+        }
+
+    def run_bulk_mutation(self, variables_list: list[dict[str, Any]]) -> dict[int, dict[str, Any]]:
+        self.assertTrue(self.shopify_sync.lock_bulk_operations())
+        return self.shopify_sync.run_bulk_mutation(
+            self.graphql_client, self.graphql_document, "product_update.graphql", variables_list
+        )
+
+    def test_bulk_mutation_uploads_polls_and_parses_results(self) -> None:
+        variables_list = [{"input": {"id": "gid://shopify/Product/1"}}, {"input": {"id": "gid://shopify/Product/2"}}]
+        result_lines = [
+            {"data": {"productUpdate": {"product": {"id": "gid://shopify/Product/2"}}}, "__lineNumber": 1},
+            {"data": {"productUpdate": {"product": {"id": "gid://shopify/Product/1"}}}, "__lineNumber": 0},
+        ]
+        self.stub.downloads["/results.jsonl"] = "\n".join(json.dumps(line) for line in result_lines).encode() + b"\n"
+
+        results = self.run_bulk_mutation(variables_list)
+
+        self.assertEqual(
+            [json.loads(line) for line in self.stub.uploaded_files[0].decode().splitlines()], variables_list
+        )
+        run_request = next(r for r in self.stub.graphql_requests if r["operationName"] == "RunBulkMutation")
+        mutation_path = Path(__file__).parent.parent / "graphql" / "bulk" / "product_update.graphql"
+        self.assertEqual(
+            run_request["variables"], {"mutation": mutation_path.read_text(), "stagedUploadPath": "tmp/bulk_op_vars"}
+        )
+        self.assertEqual(self.stub.requested_operations().count("GetBulkOperation"), 2)
+        self.assertEqual(set(results), {0, 1})
+        self.assertEqual(results[0]["data"]["productUpdate"]["product"]["id"], variables_list[0]["input"]["id"])
+
+    def test_failed_bulk_operation_raises(self) -> None:
+        self.bulk_operation_statuses = ["FAILED"]
+        with self.assertRaisesRegex(ValueError, "FAILED: INTERNAL_SERVER_ERROR"):
+            self.run_bulk_mutation([{"input": {"id": "gid://shopify/Product/1"}}])
+
+    def test_completed_bulk_operation_without_results(self) -> None:
+        self.bulk_operation_statuses = ["COMPLETED"]
+        self.stub.downloads["/results.jsonl"] = b""
+        self.assertEqual(self.run_bulk_mutation([{"input": {"id": "gid://shopify/Product/1"}}]), {})
+
+    def test_bulk_lock_held_elsewhere(self) -> None:
+        with odoo.sql_db.db_connect(self.env.cr.dbname).cursor() as other_cr:
+            other_cr.execute("SELECT pg_advisory_xact_lock(%s)", (self.shopify_sync.BULK_OPERATION_LOCK_ID,))
+
+            self.assertFalse(self.shopify_sync.lock_bulk_operations())
+            with self.assertRaises(ShopifyJobPostponed):
+                self.shopify_sync.with_context(shopify_sync_job_id=1).lock_bulk_operations()
+            self.assertNotIn("RunBulkMutation", self.stub.requested_operations())
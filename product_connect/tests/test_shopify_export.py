@@ -0,0 +1,113 @@
+from typing import Any
+
+import odoo
+from odoo.tests import TransactionCase, tagged
+
+from .shopify_stub import ShopifyStubCase
+
+
+@tagged("post_install", "-at_install")
+class TestShopifyExportSelection(TransactionCase):
+    def create_product(self, **vals) -> "odoo.model.product_product":
+        return self.env["product.product"].create(
+            {"name": "Export Test", "sale_ok": True, "website_description": "<p>Description</p>", **vals}
+        )
+
+    def test_only_exportable_products_are_dirty(self) -> None:
+        exportable_product = self.create_product()
+        unsaleable_product = self.create_product(sale_ok=False)
+        undescribed_product = self.create_product(website_description=False)
+
+        dirty_ids = set(self.env["shopify.sync"].fetch_products_to_export_ids())
+        self.assertIn(exportable_product.id, dirty_ids)
+        self.assertNotIn(unsaleable_product.id, dirty_ids)
+        self.assertNotIn(undescribed_product.id, dirty_ids)
+
+    def test_exported_products_are_dirty_again_after_a_template_change(self) -> None:
+        product = self.create_product()
+        self.env.cr.execute(
+            "UPDATE product_product SET shopify_last_exported = write_date + interval '1 minute' WHERE id = %s",
+            (product.id,),
+        )
+        product.invalidate_recordset()
+        self.assertNotIn(product.id, self.env["shopify.sync"].fetch_products_to_export_ids())
+
+        self.env.cr.execute(
+            "UPDATE product_template SET write_date = write_date + interval '2 minutes' WHERE id = %s",
+            (product.product_tmpl_id.id,),
+        )
+        self.assertIn(product.id, self.env["shopify.sync"].fetch_products_to_export_ids())
+
+
+@tagged("post_install", "-at_install")
+class TestShopifyExportFingerprint(ShopifyStubCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.stub.graphql_handlers.update(
+            {"UpdateProduct": self.update_product, "UpdatePublications": lambda variables: {"data": {}}}
+        )
+
+    @staticmethod
+    def update_product(variables: dict[str, Any]) -> dict[str, Any]:
+        shopify_product = {"id": variables["input"]["id"], "metafields": {"edges": []}}
+        return {"data": {"productUpdate": {"product": shopify_product, "userErrors": []}}}
+
+    def create_exported_product(self, shopify_product_id: str) -> "odoo.model.product_product":
+        product = self.env["product.product"].create(
+            {
+                "name": f"Fingerprint {shopify_product_id}",
+                "sale_ok": True,
+                "website_description": "<p>Description</p>",
+                "shopify_product_id": shopify_product_id,
+                "shopify_variant_id": shopify_product_id,
+            }
+        )
+        shopify_sync = self.env["shopify.sync"]
+        product.shopify_export_fingerprint = shopify_sync.compute_shopify_export_fingerprint(
+            shopify_sync.build_shopify_product_input(product, "gid://shopify/Location/1")
+        )
+        return product
+
+    def test_fingerprint_ignores_shopify_ids(self) -> None:
+        shopify_sync = self.env["shopify.sync"]
+        product = self.create_exported_product("930001")
+        exported_input = shopify_sync.build_shopify_product_input(product, "gid://shopify/Location/1")
+        product.write({"shopify_product_id": False, "shopify_variant_id": False})
+        new_input = shopify_sync.build_shopify_product_input(product, "gid://shopify/Location/1")
+
+        self.assertNotEqual(exported_input, new_input)
+        self.assertEqual(
+            shopify_sync.compute_shopify_export_fingerprint(exported_input),
+            shopify_sync.compute_shopify_export_fingerprint(new_input),
+        )
+        new_input["title"] = "Renamed"
+        self.assertNotEqual(
+            shopify_sync.compute_shopify_export_fingerprint(exported_input),
+            shopify_sync.compute_shopify_export_fingerprint(new_input),
+        )
+
+    def test_unchanged_products_are_not_sent(self) -> None:
+        unchanged_product = self.create_exported_product("930002")
+        changed_product = self.create_exported_product("930003")
+        changed_product.name = "Fingerprint renamed"
+
+        shopify_sync = self.env["shopify.sync"]
+        graphql_client, graphql_document, shopify_location_gid, base_url = shopify_sync.setup_sync_environment()
+        exported_count, unchanged_count = shopify_sync.export_shopify_products(
+            unchanged_product + changed_product, graphql_client, graphql_document, shopify_location_gid, base_url
+        )
+
+        self.assertEqual((exported_count, unchanged_count), (1, 1))
+        updated_ids = [
+            request["variables"]["input"]["id"]
+            for request in self.stub.graphql_requests
+            if request["operationName"] == "UpdateProduct"
+        ]
+        self.assertEqual(updated_ids, ["gid://shopify/Product/930003"])
+        self.assertTrue(unchanged_product.shopify_last_exported)
+        self.assertEqual(
+            changed_product.shopify_export_fingerprint,
+            shopify_sync.compute_shopify_export_fingerprint(
+                shopify_sync.build_shopify_product_input(changed_product, shopify_location_gid)
+            ),
+        )
@@ -0,0 +1,129 @@
+from datetime import datetime
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import odoo
+from odoo.tests import TransactionCase, tagged
+
+from .shopify_stub import ShopifyStubCase
+
+LAST_IMPORT_TIME_STR = "2024-01-01T00:00:00Z"
+LAST_IMPORT_TIME = datetime(2024, 1, 1, tzinfo=ZoneInfo("UTC"))
+
+
+def build_shopify_product_edge(shopify_product_id: str, sku: str, updated_at: str) -> dict[str, Any]:
+    return {
+        "cursor": f"product-{shopify_product_id}",
+        "node": {
+            "id": f"gid://shopify/Product/{shopify_product_id}",
+            "title": f"Shopify {sku}",
+            "updatedAt": updated_at,
+            "variants": {"edges": [{"node": {"id": f"gid://shopify/ProductVariant/{shopify_product_id}", "sku": sku}}]},
+            "images": {"edges": []},
+        },
+    }
+
+
+@tagged("post_install", "-at_install")
+class TestShopifyImportPage(TransactionCase):
+    def create_products(self, count: int) -> "odoo.model.product_product":
+        return self.env["product.product"].create(
+            [{"name": f"Import Page {index}", "shopify_product_id": str(900000 + index)} for index in range(count)]
+        )
+
+    def count_page_queries(self, products: "odoo.model.product_product") -> int:
+        # Older than the products' write dates, so every product is looked up and left unchanged
+        shopify_products = [
+            build_shopify_product_edge(product.shopify_product_id, product.default_code, "2001-06-01T00:00:00Z")
+            for product in products
+        ]
+        self.env.flush_all()
+        self.env.invalidate_all()
+        query_count_start = self.env.cr.sql_log_count
+        total_count, updated_count = self.env["shopify.sync"].import_shopify_product_page(
+            shopify_products, LAST_IMPORT_TIME, LAST_IMPORT_TIME_STR, 1
+        )
+        self.assertEqual((total_count, updated_count), (len(products), 0))
+        return self.env.cr.sql_log_count - query_count_start
+
+    def test_page_queries_do_not_grow_with_the_page(self) -> None:
+        self.assertEqual(
+            self.count_page_queries(self.create_products(2)), self.count_page_queries(self.create_products(8))
+        )
+
+
+@tagged("post_install", "-at_install")
+class TestShopifyImportResume(ShopifyStubCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.patch(self.env.cr, "commit", lambda: None)
+        self.product = self.env["product.product"].create({"name": "Resumed Import", "shopify_product_id": "910001"})
+        self.stub.graphql_handlers["GetProducts"] = self.get_products
+
+    def get_products(self, variables: dict[str, Any]) -> dict[str, Any]:
+        edges = []
+        if variables["cursor"] == "product-1":
+            edges = [build_shopify_product_edge("910001", self.product.default_code, "2001-06-01T00:00:00Z")]
+            edges[0]["cursor"] = "product-2"
+        return {"data": {"products": {"edges": edges}}}
+
+    def test_unfinished_run_resumes_from_its_checkpoint(self) -> None:
+        self.env["ir.config_parameter"].sudo().set_param("shopify.last_import_time", "2025-01-01T00:00:00Z")
+        sync_run = self.env["shopify.sync.run"].create(
+            {
+                "run_type": "import",
+                "last_import_time": LAST_IMPORT_TIME_STR,
+                "start_time": datetime(2024, 6, 1),
+                "cursor": "product-1",
+                "page_number": 1,
+                "total_count": 1,
+            }
+        )
+
+        self.env["shopify.sync"].import_from_shopify()
+
+        product_requests = [
+            request["variables"] for request in self.stub.graphql_requests if request["operationName"] == "GetProducts"
+        ]
+        self.assertEqual([variables["cursor"] for variables in product_requests], ["product-1", "product-2"])
+        self.assertEqual(
+            {variables["query"] for variables in product_requests}, {f"updated_at:>{LAST_IMPORT_TIME_STR}"}
+        )
+        self.assertRecordValues(sync_run, [{"state": "done", "page_number": 3, "total_count": 2, "updated_count": 0}])
+        self.assertEqual(
+            self.env["ir.config_parameter"].sudo().get_param("shopify.last_import_time"), "2024-06-01T00:00:00Z"
+        )
+        self.assertEqual(self.env["shopify.sync.run"].search([("run_type", "=", "import")], limit=1), sync_run)
+
+
+@tagged("post_install", "-at_install")
+class TestShopifyLookupCache(TransactionCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.manufacturer = cls.env["product.manufacturer"].create({"name": "Lookup Cache Maker"})
+
+    def test_known_names_are_resolved_without_queries(self) -> None:
+        shopify_sync = self.env["shopify.sync"]
+        condition_new = self.env.ref("product_connect.product_condition_new")
+        shopify_sync.warm_lookup_cache()
+        with self.assertQueryCount(0):
+            self.assertEqual(shopify_sync.find_or_add_manufacturer("Lookup Cache Maker"), self.manufacturer)
+            self.assertEqual(shopify_sync.find_condition_id("new"), condition_new.id)
+
+    def test_new_names_are_created_once(self) -> None:
+        shopify_sync = self.env["shopify.sync"]
+        shopify_sync.warm_lookup_cache()
+        new_manufacturer = shopify_sync.find_or_add_manufacturer("Lookup Cache Newcomer")
+        self.assertTrue(new_manufacturer)
+        with self.assertQueryCount(0):
+            self.assertEqual(shopify_sync.find_or_add_manufacturer("Lookup Cache Newcomer"), new_manufacturer)
+
+    def test_renaming_a_manufacturer_clears_the_cache(self) -> None:
+        shopify_sync = self.env["shopify.sync"]
+        shopify_sync.warm_lookup_cache()
+        self.manufacturer.name = "Lookup Cache Renamed"
+        self.assertNotIn(shopify_sync.LOOKUP_CACHE_KEY, self.env.cr.cache)
+
+        self.assertEqual(shopify_sync.find_or_add_manufacturer("Lookup Cache Renamed"), self.manufacturer)
+        self.assertEqual(self.env["product.manufacturer"].search_count([("name", "like", "Lookup Cache")]), 1)
@@ -0,0 +1,67 @@
+import logging
+from datetime import datetime
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from odoo.tests import tagged
+
+from ..models.shopify_sync import memory_handler
+from .shopify_stub import ShopifyStubCase
+
+DATE_FILTER = datetime(2024, 1, 1, tzinfo=ZoneInfo("UTC"))
+
+
+@tagged("post_install", "-at_install")
+class TestShopifyProductsWithNoSales(ShopifyStubCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.stub.graphql_handlers.update(
+            {"GetProductIds": self.get_product_ids, "GetOrdersLineItems": self.get_orders_line_items}
+        )
+
+    @staticmethod
+    def get_product_ids(variables: dict[str, Any]) -> dict[str, Any]:
+        product_ids = [] if variables["cursor"] else [3, 1, 2]
+        edges = [{"cursor": f"product-{i}", "node": {"id": f"gid://shopify/Product/{i}"}} for i in product_ids]
+        return {"data": {"products": {"pageInfo": {"hasNextPage": False}, "edges": edges}}}
+
+    @staticmethod
+    def get_orders_line_items(variables: dict[str, Any]) -> dict[str, Any]:
+        orders = [] if variables["cursor"] else [{"id": "gid://shopify/Order/1", "createdAt": "2024-02-01T00:00:00Z"}]
+        edges = [
+            {
+                "cursor": "order-1",
+                "node": {
+                    **order,
+                    "lineItems": {
+                        "pageInfo": {"hasNextPage": False, "endCursor": None},
+                        "edges": [{"node": {"product": {"id": "gid://shopify/Product/2"}}}],
+                    },
+                },
+            }
+            for order in orders
+        ]
+        return {"data": {"orders": {"edges": edges}}}
+
+    def requested_queries(self, operation_name: str) -> set[str]:
+        return {
+            request["variables"]["query"]
+            for request in self.stub.graphql_requests
+            if request["operationName"] == operation_name
+        }
+
+    def test_direct_and_table_modes_agree(self) -> None:
+        shopify_sync = self.env["shopify.sync"]
+        self.assertEqual(shopify_sync.get_products_with_no_sales(DATE_FILTER, use_sales_table=True), [1, 3])
+        self.assertEqual(shopify_sync.get_products_with_no_sales(DATE_FILTER), [1, 3])
+        self.assertEqual(self.requested_queries("GetOrdersLineItems"), {"created_at:>=2024-01-01T00:00:00Z"})
+        self.assertEqual(
+            self.requested_queries("GetProductIds"), {"inventory_total:>0 created_at:<2024-01-01T00:00:00Z"}
+        )
+
+    def test_product_scan_logs_reach_the_capture(self) -> None:
+        logging.getLogger("odoo.addons.product_connect.models.shopify_sync").setLevel(logging.DEBUG)
+        self.addCleanup(logging.getLogger("odoo.addons.product_connect.models.shopify_sync").setLevel, logging.NOTSET)
+        with memory_handler.capture() as log_buffer:
+            self.env["shopify.sync"].get_products_with_no_sales(DATE_FILTER)
+        self.assertTrue(any("Fetching all products created before" in line for line in log_buffer.format()))
@@ -0,0 +1,65 @@
+import time
+import uuid
+
+from odoo.tests import TransactionCase, tagged
+
+from ..models.shopify_rate_limiter import DEFAULT_QUERY_COST, ShopifyCostBudget
+
+
+@tagged("post_install", "-at_install")
+class TestShopifyCostBudget(TransactionCase):
+    def setUp(self) -> None:
+        super().setUp()
+        # The budget commits through its own cursor, so each test uses a row of its own and removes it afterwards
+        self.cost_budget = ShopifyCostBudget(self.env.cr.dbname, f"test-{uuid.uuid4().hex}")
+        self.addCleanup(self.execute_on_budget, "DELETE FROM shopify_rate_budget WHERE name = %s")
+        self.sleeps: list[float] = []
+        self.patch(time, "sleep", self.sleeps.append)
+
+    def execute_on_budget(self, query: str, *params) -> tuple | None:
+        with self.cost_budget.cursor() as cr:
+            cr.execute(query, (*params, self.cost_budget.name))
+            return cr.fetchone() if cr.description else None
+
+    def read_budget(self) -> tuple:
+        return self.execute_on_budget(
+            "SELECT available, maximum_available, restore_rate, request_count, sleep_seconds "
+            "FROM shopify_rate_budget WHERE name = %s"
+        )
+
+    def test_reserve_spends_the_predicted_cost(self) -> None:
+        self.assertEqual(self.cost_budget.reserve("GetProducts"), DEFAULT_QUERY_COST)
+        available, maximum_available, *_ = self.read_budget()
+        self.assertAlmostEqual(available, maximum_available - DEFAULT_QUERY_COST, delta=1)
+        self.assertEqual(self.sleeps, [])
+
+    def test_reconcile_learns_the_cost_and_refunds_the_unused_part(self) -> None:
+        reserved_cost = self.cost_budget.reserve("GetProducts")
+        self.cost_budget.reconcile(
+            "GetProducts",
+            reserved_cost,
+            {
+                "requestedQueryCost": 252,
+                "actualQueryCost": 52,
+                "throttleStatus": {"maximumAvailable": 2000, "currentlyAvailable": 1900, "restoreRate": 100},
+            },
+        )
+
+        self.assertEqual(self.cost_budget.predict_cost("GetProducts"), 252)
+        self.assertEqual(self.cost_budget.predict_cost("GetOrders"), DEFAULT_QUERY_COST)
+        available, maximum_available, restore_rate, request_count, _ = self.read_budget()
+        self.assertEqual((maximum_available, restore_rate, request_count), (2000, 100, 1))
+        # 1000 - 100 reserved + 48 refunded, below the 1900 Shopify reports, so the local balance is kept
+        self.assertAlmostEqual(available, 948, delta=1)
+
+    def test_reserve_waits_for_the_bucket_to_refill(self) -> None:
+        self.execute_on_budget(
+            "UPDATE shopify_rate_budget SET available = 0, restore_rate = 50, last_refill_at = now() AT TIME ZONE 'UTC' "
+            "WHERE name = %s"
+        )
+
+        self.cost_budget.reserve("GetProducts")
+
+        self.assertEqual(len(self.sleeps), 1)
+        self.assertAlmostEqual(self.sleeps[0], DEFAULT_QUERY_COST / 50, delta=0.1)
+        self.assertAlmostEqual(self.read_budget()[4], self.sleeps[0])
@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+import odoo
+from odoo import fields
+from odoo.tests import TransactionCase, tagged
+
+from ..models.shopify_sync_job import JOB_LOCK_NAMESPACE
+
+
+@tagged("post_install", "-at_install")
+class TestShopifySyncJob(TransactionCase):
+    def setUp(self) -> None:
+        super().setUp()
+        # The job runner commits after every step, which the test cursor does not allow
+        self.patch(self.env.cr, "commit", lambda: None)
+        self.sync_job_model = self.env["shopify.sync.job"]
+
+    def test_claim_is_handed_back_when_the_job_lock_is_taken(self) -> None:
+        job = self.sync_job_model.enqueue("export_chunk", {"product_ids": []})
+        job.write({"state": "running", "attempts": 1, "worker": "test"})
+
+        with odoo.sql_db.db_connect(self.env.cr.dbname).cursor() as other_cr:
+            other_cr.execute("SELECT pg_advisory_xact_lock(%s, %s)", (JOB_LOCK_NAMESPACE, job.id))
+            job.run()
+
+        self.assertRecordValues(job, [{"state": "pending", "attempts": 0, "worker": False}])
+
+    def test_cleanup_removes_old_done_jobs_only(self) -> None:
+        two_weeks_ago = fields.Datetime.now() - timedelta(weeks=2)
+        old_done_job = self.sync_job_model.enqueue("export_chunk", {"product_ids": []})
+        old_failed_job = self.sync_job_model.enqueue("export_chunk", {"product_ids": []})
+        recent_done_job = self.sync_job_model.enqueue("export_chunk", {"product_ids": []})
+        old_done_job.write({"state": "done", "finished_at": two_weeks_ago})
+        old_failed_job.write({"state": "failed", "finished_at": two_weeks_ago})
+        recent_done_job.write({"state": "done", "finished_at": fields.Datetime.now()})
+
+        self.sync_job_model.cleanup()
+
+        self.assertFalse(old_done_job.exists())
+        self.assertEqual((old_failed_job + recent_done_job).exists(), old_failed_job + recent_done_job)
@@ -0,0 +1,44 @@
+import base64
+import hashlib
+import hmac
+import json
+
+from odoo.tests import HttpCase, tagged
+
+WEBHOOK_SECRET = "test-secret"
+
+
+@tagged("post_install", "-at_install")
+class TestShopifyWebhookController(HttpCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.env["ir.config_parameter"].sudo().set_param("shopify.webhook_secret", WEBHOOK_SECRET)
+
+    def post_webhook(self, webhook_id: str, body: bytes) -> int:
+        digest = hmac.new(WEBHOOK_SECRET.encode(), body, hashlib.sha256).digest()
+        response = self.url_open(
+            "/shopify/webhook",
+            data=body,
+            headers={
+                "Content-Type": "application/json",
+                "X-Shopify-Hmac-Sha256": base64.b64encode(digest).decode(),
+                "X-Shopify-Topic": "products/update",
+                "X-Shopify-Webhook-Id": webhook_id,
+            },
+        )
+        return response.status_code
+
+    def test_signed_webhook_is_queued_once(self) -> None:
+        body = json.dumps({"id": 1234}).encode()
+        self.assertEqual(self.post_webhook("webhook-valid", body), 200)
+        self.assertEqual(self.post_webhook("webhook-valid", body), 200)
+
+        webhooks = self.env["shopify.webhook.inbox"].search([("webhook_id", "=", "webhook-valid")])
+        self.assertRecordValues(webhooks, [{"shopify_id": "1234", "state": "pending"}])
+
+    def test_signed_malformed_payload_is_rejected(self) -> None:
+        self.assertEqual(self.post_webhook("webhook-malformed", b"{not json"), 400)
+        self.assertEqual(self.post_webhook("webhook-list", b"[1, 2]"), 400)
+        self.assertFalse(
+            self.env["shopify.webhook.inbox"].search([("webhook_id", "in", ["webhook-malformed", "webhook-list"])])
+        )
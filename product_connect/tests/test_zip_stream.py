@@ -0,0 +1,30 @@
+import tempfile
+import zipfile
+from io import BytesIO
+from pathlib import Path
+
+from odoo.tests import TransactionCase, tagged
+
+from ..utils.zip_stream import READ_CHUNK_SIZE, stream_zip
+
+
+@tagged("post_install", "-at_install")
+class TestStreamZip(TransactionCase):
+    def test_streamed_archive_holds_every_file_in_bounded_chunks(self) -> None:
+        large_content = bytes(range(256)) * (READ_CHUNK_SIZE // 64)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            large_path = Path(temp_dir) / "large.jpg"
+            large_path.write_bytes(large_content)
+
+            chunks = list(stream_zip([("motor/large.jpg", large_path), ("motor/small.txt", b"small")]))
+
+        self.assertLessEqual(max(len(chunk) for chunk in chunks), READ_CHUNK_SIZE + 1024)
+        with zipfile.ZipFile(BytesIO(b"".join(chunks))) as zip_file:
+            self.assertIsNone(zip_file.testzip())
+            self.assertEqual(zip_file.namelist(), ["motor/large.jpg", "motor/small.txt"])
+            self.assertEqual(zip_file.read("motor/large.jpg"), large_content)
+            self.assertEqual(zip_file.read("motor/small.txt"), b"small")
+
+    def test_empty_archive_is_valid(self) -> None:
+        with zipfile.ZipFile(BytesIO(b"".join(stream_zip([])))) as zip_file:
+            self.assertEqual(zip_file.namelist(), [])
@@ -0,0 +1,69 @@
+import struct
+from pathlib import Path
+from typing import BinaryIO
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Start of frame markers carry the dimensions; C4, C8 and CC are table and extension markers
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+JPEG_STANDALONE_MARKERS = {0x01, *range(0xD0, 0xD8)}
+
+
+def read_image_size(path: Path | str) -> tuple[int, int] | None:
+    """Read (width, height) from a JPEG, PNG or WebP header, or None for any other or malformed format."""
+    with open(path, "rb") as image_file:
+        header = image_file.read(32)
+        if header.startswith(PNG_SIGNATURE):
+            return _png_size(header)
+        if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+            return _webp_size(header)
+        if header[:2] == b"\xff\xd8":
+            image_file.seek(2)
+            return _jpeg_size(image_file)
+    return None
+
+
+def _png_size(header: bytes) -> tuple[int, int] | None:
+    if len(header) < 24 or header[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", header[16:24])
+
+
+def _webp_size(header: bytes) -> tuple[int, int] | None:
+    chunk_type = header[12:16]
+    if chunk_type == b"VP8 " and len(header) >= 30 and header[23:26] == b"\x9d\x01\x2a":
+        width, height = struct.unpack("<HH", header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk_type == b"VP8L" and len(header) >= 25 and header[20] == 0x2F:
+        bits = int.from_bytes(header[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk_type == b"VP8X" and len(header) >= 30:
+        return int.from_bytes(header[24:27], "little") + 1, int.from_bytes(header[27:30], "little") + 1
+    return None
+
+
+def _jpeg_size(image_file: BinaryIO) -> tuple[int, int] | None:
+    while True:
+        byte = image_file.read(1)
+        while byte and byte != b"\xff":
+            byte = image_file.read(1)
+        while byte == b"\xff":
+            byte = image_file.read(1)
+        if not byte:
+            return None
+
+        marker = byte[0]
+        if marker in JPEG_STANDALONE_MARKERS:
+            continue
+        if marker == 0xD9:
+            return None
+        segment_header = image_file.read(2)
+        if len(segment_header) < 2:
+            return None
+        (segment_length,) = struct.unpack(">H", segment_header)
+        if marker in JPEG_SOF_MARKERS:
+            frame_header = image_file.read(5)
+            if len(frame_header) < 5:
+                return None
+            height, width = struct.unpack(">xHH", frame_header)
+            return width, height
+        image_file.seek(segment_length - 2, 1)
@@ -0,0 +1,80 @@
+import copy
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Generator
+
+DEFAULT_MAX_RECORDS = 500
+DEFAULT_MAX_BYTES = 256 * 1024
+
+
+class LogBuffer:
+    def __init__(self, formatter: logging.Formatter, max_records: int, max_bytes: int) -> None:
+        self.formatter = formatter
+        self.max_bytes = max_bytes
+        self.records: deque[tuple[logging.LogRecord, int]] = deque(maxlen=max_records)
+        self.size = 0
+
+    def append(self, record: logging.LogRecord) -> None:
+        # Freezes the message and traceback so the buffer holds no references to args or stack frames
+        frozen_record = copy.copy(record)
+        frozen_record.msg = record.getMessage()
+        frozen_record.args = None
+        if record.exc_info:
+            frozen_record.exc_text = record.exc_text or self.formatter.formatException(record.exc_info)
+            frozen_record.exc_info = None
+        record_size = len(frozen_record.msg) + len(frozen_record.exc_text or "")
+
+        if len(self.records) == self.records.maxlen:
+            self.size -= self.records[0][1]
+        self.records.append((frozen_record, record_size))
+        self.size += record_size
+        while self.size > self.max_bytes and len(self.records) > 1:
+            _, evicted_size = self.records.popleft()
+            self.size -= evicted_size
+
+    def format(self) -> list[str]:
+        return [self.formatter.format(record) for record, _ in self.records]
+
+
+class RingBufferLogHandler(logging.Handler):
+    """Keeps the latest log records of the current thread's capture, so error reports only carry the relevant tail."""
+
+    def __init__(self, max_records: int = DEFAULT_MAX_RECORDS, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        super().__init__()
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.local = threading.local()
+        self.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    @contextmanager
+    def capture(self, max_records: int | None = None, max_bytes: int | None = None) -> Generator[LogBuffer, None, None]:
+        previous_buffer = getattr(self.local, "buffer", None)
+        self.local.buffer = LogBuffer(self.formatter, max_records or self.max_records, max_bytes or self.max_bytes)
+        try:
+            yield self.local.buffer
+        finally:
+            self.local.buffer = previous_buffer
+
+    def merge(self, log_buffer: LogBuffer) -> None:
+        """Add the records another thread captured to the current thread's capture."""
+        current_buffer = getattr(self.local, "buffer", None)
+        if current_buffer is None:
+            return
+        for record, _ in log_buffer.records:
+            current_buffer.append(record)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        log_buffer = getattr(self.local, "buffer", None)
+        if log_buffer is None:
+            return
+        try:
+            log_buffer.append(record)
+        except Exception:
+            self.handleError(record)
+
+    @property
+    def logs(self) -> list[str]:
+        log_buffer = getattr(self.local, "buffer", None)
+        return log_buffer.format() if log_buffer else []
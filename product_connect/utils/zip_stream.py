@@ -0,0 +1,44 @@
+import zipfile
+from pathlib import Path
+from typing import Generator, Iterable
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class ChunkBuffer:
+    """Write-only file object collecting the bytes zipfile writes until the stream takes them."""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self.data += data
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data = bytes(self.data)
+        self.data.clear()
+        return data
+
+
+def stream_zip(files: Iterable[tuple[str, Path | bytes]]) -> Generator[bytes, None, None]:
+    """Yield a ZIP archive of (archive name, file path or content) entries chunk by chunk, holding one chunk at a time.
+
+    The buffer is not seekable, so zipfile writes sizes and CRCs in data descriptors after each entry.
+    """
+    buffer = ChunkBuffer()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as zip_file:
+        for archive_name, source in files:
+            with zip_file.open(archive_name, "w") as entry:
+                if isinstance(source, bytes):
+                    entry.write(source)
+                else:
+                    with open(source, "rb") as source_file:
+                        while chunk := source_file.read(READ_CHUNK_SIZE):
+                            entry.write(chunk)
+                            yield buffer.take()
+            yield buffer.take()
+    yield buffer.take()